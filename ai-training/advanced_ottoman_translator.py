@@ -8,17 +8,221 @@ Karakter bazlı çeviri ve kelime bölme algoritması
 import re
 import json
 import os
+import sys
+import hashlib
+import unicodedata
+from functools import cached_property
 from typing import Dict, List, Tuple, Optional
 
+from corpus_io import read_pairs
+from profiling import profiled
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# process_oe_tr_data.py'nin ürettiği Türkçe karakter n-gram istatistikleri
+DEFAULT_CORPUS_STATS = os.path.join(_MODULE_DIR, 'data', 'training', 'corpus_stats_turkish.npz')
+
+# Işın araması için Türkçe kelime trigram modeli (beam_decoder.WordNgramModel)
+DEFAULT_WORD_LM = os.path.join(_MODULE_DIR, 'data', 'training', 'word_lm_turkish.npz')
+
+# Kelime eşleştirme dosyaları (öncelik sırasıyla)
+MAPPING_FILES = [
+    'merged_mapping.txt',
+    'oe_tr.txt',
+    'ottoman_turkish_mapping.txt'
+]
+
+# Çeviri sonucunu etkileyen kod modülleri (bu dosyaya ek olarak)
+CODE_FILES = [
+    'beam_decoder.py',
+    'corpus_stats.py'
+]
+
+# Çeviri önbelleğinin varsayılan konumu (MIRAS_TRANSLATION_CACHE_DIR ile değiştirilebilir)
+DEFAULT_TRANSLATION_CACHE_DIR = os.path.join(_MODULE_DIR, 'cache')
+DEFAULT_TRANSLATION_CACHE_TTL = 30 * 24 * 3600
+
+# Ek bağlam kuralları (anlam -> destekleyen bağlam kelimeleri, JSON);
+# MIRAS_CONTEXT_RULES ile başka bir dosya verilebilir
+DEFAULT_CONTEXT_RULES_FILE = os.path.join(_MODULE_DIR, 'context_rules.json')
+
+# Çok anlamlı kelimeler için iki yanda bakılan kelime sayısı
+DEFAULT_CONTEXT_WINDOW = 3
+
+# Bağlam kelimeleri bu uzunluktan kısa köklere indirilmez; komşu kelimelerin
+# en fazla MAX_CONTEXT_PREFIX karakterlik önekleri dizinde aranır
+MIN_CONTEXT_STEM = 3
+MAX_CONTEXT_PREFIX = 24
+
+# Işın araması için bulanık adaylar: tek harfli anahtarlar ('و' -> 've') hemen her
+# kelimenin içinde geçtiğinden atlanır; kapsayan/kapsanan eşleşmede benzerlik
+# kısa/uzun uzunluk oranıdır ve bu eşiğin altı aday sayılmaz
+MIN_FUZZY_KEY_LENGTH = 2
+MIN_FUZZY_SIMILARITY = 0.5
+
+
+def context_rules_path() -> str:
+    return os.environ.get('MIRAS_CONTEXT_RULES', DEFAULT_CONTEXT_RULES_FILE)
+
+
+def dictionary_version() -> str:
+    """Çeviri sonuçlarını etkileyen dosyaların sürüm özeti
+
+    Eşleştirme dosyaları, n-gram istatistikleri, kelime dil modeli, bağlam kuralları ve kod içindeki tablolar için
+    bu dosyanın kendisi ile kod çözücü modülleri (yol, boyut, mtime) üzerinden
+    özetlenir; biri değişince çeviri önbelleği geçersiz olur.
+    """
+    digest = hashlib.sha256()
+    paths = [os.path.join(_MODULE_DIR, filename) for filename in MAPPING_FILES + CODE_FILES]
+    for path in paths + [DEFAULT_CORPUS_STATS, DEFAULT_WORD_LM, context_rules_path(), os.path.abspath(__file__)]:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def model_fingerprint(model) -> str:
+    """CorpusStatistics/WordNgramModel dizilerinin içerik özeti (süreçten bağımsız)"""
+    digest = hashlib.sha256()
+    for name in model.ARRAYS:
+        array = getattr(model, name)
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}\n".encode('utf-8'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def build_translation_cache(enabled: bool = True, cache_dir: Optional[str] = None,
+                            max_mb: int = 64, ttl: Optional[float] = DEFAULT_TRANSLATION_CACHE_TTL):
+    """Süreçler arası paylaşılan çeviri önbelleğini oluştur
+
+    MIRAS_TRANSLATION_CACHE=0 önbelleği kapatır, MIRAS_TRANSLATION_CACHE_DIR konumunu değiştirir.
+    """
+    from result_cache import ResultCache
+
+    cache_dir = cache_dir or os.environ.get('MIRAS_TRANSLATION_CACHE_DIR', DEFAULT_TRANSLATION_CACHE_DIR)
+    enabled = enabled and os.environ.get('MIRAS_TRANSLATION_CACHE', '1') != '0'
+    return ResultCache(
+        os.path.join(cache_dir, 'translations.sqlite3'),
+        max_bytes=max_mb * 1024 * 1024,
+        enabled=enabled,
+        ttl=ttl,
+        data_version=dictionary_version() if enabled else None
+    )
+
+
 class AdvancedOttomanTranslator:
     """Gelişmiş Osmanlıca-Türkçe çeviri sistemi"""
     
-    def __init__(self):
-        """Çeviri sistemi başlatıcısı"""
-        self.character_mapping = self._load_character_mapping()
-        self.word_mapping = self._load_word_mapping()
-        self.special_patterns = self._load_special_patterns()
-        self.context_rules = self._load_context_rules()
+    def __init__(self, corpus_stats=None, cache=None, context_window: Optional[int] = None,
+                 context_rules_file: Optional[str] = None, beam_width: int = 0, nbest: int = 3,
+                 beam_candidates: int = 5, word_lm=None):
+        """Çeviri sistemi başlatıcısı
+
+        Tablolar ilk kullanımda oluşturulur (her istek yeni bir süreçte çalışır;
+        kullanılmayan tablonun maliyeti ödenmez).
+
+        corpus_stats: Eşit benzerlikteki adayları sıralamak için CorpusStatistics;
+                      verilmezse DEFAULT_CORPUS_STATS varsa ondan yüklenir
+        cache: Verilirse (ResultCache) normalleştirilmiş metin -> sonuç kalıcı
+               olarak saklanır ve süreçler arasında paylaşılır
+        context_window: Çok anlamlı kelimelerde iki yanda bakılan kelime sayısı
+        context_rules_file: Ek bağlam kuralları (varsayılan: context_rules_path())
+        beam_width: 0'dan büyükse kelime başına en fazla beam_candidates aday
+                    içeren kafes ışın aramasıyla çözülür ve sonuca 'nbest'
+                    eklenir (DEFAULT_WORD_LM yoksa açgözlü çeviriye düşülür)
+        word_lm: Işın araması için WordNgramModel; verilmezse DEFAULT_WORD_LM'den yüklenir
+        """
+        if corpus_stats is not None:
+            self.corpus_stats = corpus_stats
+        if word_lm is not None:
+            self.word_lm = word_lm
+        # Varsayılan dosyalardan yüklenmeyen modeller önbellek anahtarına içerik özetiyle girer
+        self._injected_models = {name: model for name, model in (('stats', corpus_stats), ('lm', word_lm))
+                                 if model is not None}
+        self.cache = cache
+        self.context_window = DEFAULT_CONTEXT_WINDOW if context_window is None else context_window
+        self.context_rules_file = context_rules_file
+        self.beam_width = beam_width
+        self.nbest = nbest
+        self.beam_candidates = beam_candidates
+
+    @cached_property
+    def character_mapping(self) -> Dict[str, str]:
+        return self._load_character_mapping()
+
+    @cached_property
+    def word_mapping(self) -> Dict[str, str]:
+        return self._load_word_mapping()
+
+    @cached_property
+    def word_senses(self) -> Dict[str, List[str]]:
+        """Birden fazla karşılığı olan kelimeler: Osmanlıca -> aday anlamlar (öncelik sırasıyla)"""
+        self.word_mapping  # kelime tablosuyla aynı geçişte oluşturulur
+        return self._word_senses
+
+    @cached_property
+    def context_index(self) -> Dict[str, Dict[str, float]]:
+        return self._build_context_index()
+
+    @cached_property
+    def special_patterns(self) -> Dict[str, str]:
+        return self._load_special_patterns()
+
+    @cached_property
+    def context_rules(self) -> Dict[str, List[str]]:
+        return self._load_context_rules()
+
+    @cached_property
+    def cache_inputs(self) -> str:
+        """Sonucu etkileyen girdilerin imzası: bağlam kuralları dosyası ve verilen modeller
+
+        Varsayılan dosyalar dictionary_version() ile önbelleğin veri sürümüne girer;
+        burada yalnızca bu örneğe özgü seçimler ayırt edilir.
+        """
+        path = os.path.abspath(self.context_rules_file or context_rules_path())
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts = [f"rules={path}:{stat.st_size}:{stat.st_mtime_ns}"]
+        else:
+            parts = [f"rules={path}:-"]
+        for name, model in sorted(self._injected_models.items()):
+            parts.append(f"{name}={model_fingerprint(model)}")
+        return ';'.join(parts)
+
+    @cached_property
+    def corpus_stats(self):
+        return self._load_corpus_stats()
+
+    @cached_property
+    def word_lm(self):
+        return self._load_word_lm()
+
+    @cached_property
+    def beam_decoder(self):
+        from beam_decoder import BeamDecoder
+        return BeamDecoder(self.word_lm, width=self.beam_width)
+
+    def _load_word_lm(self):
+        """Türkçe kelime trigram modelini yükle (dosya yoksa None)"""
+        if not os.path.exists(DEFAULT_WORD_LM):
+            return None
+        try:
+            from beam_decoder import WordNgramModel
+            return WordNgramModel.load(DEFAULT_WORD_LM)
+        except Exception as e:
+            print(f"Kelime dil modeli yüklenirken hata: {e}", file=sys.stderr)
+            return None
+
+    def _load_corpus_stats(self):
+        """Türkçe n-gram istatistiklerini yükle (dosya yoksa None)"""
+        if not os.path.exists(DEFAULT_CORPUS_STATS):
+            return None
+        try:
+            from corpus_stats import CorpusStatistics
+            return CorpusStatistics.load(DEFAULT_CORPUS_STATS)
+        except Exception as e:
+            print(f"N-gram istatistikleri yüklenirken hata: {e}", file=sys.stderr)
+            return None
         
     def _load_character_mapping(self) -> Dict[str, str]:
         """Karakter eşleştirme tablosu - genişletilmiş"""
@@ -150,36 +354,43 @@ class AdvancedOttomanTranslator:
         }
     
     def _load_word_mapping(self) -> Dict[str, str]:
-        """Kelime eşleştirme tablosu"""
+        """Kelime eşleştirme tablosu
+
+        Aynı kelimenin farklı dosyalardaki ya da 'kadın/eş' gibi eğik çizgiyle
+        ayrılmış karşılıkları word_senses'e aday anlam olarak eklenir.
+        """
         mappings = {}
+        senses = {}
         
         # Tüm mapping dosyalarını yükle
-        mapping_files = [
-            'merged_mapping.txt',
-            'oe_tr.txt',
-            'ottoman_turkish_mapping.txt'
-        ]
-        
-        for filename in mapping_files:
+        for filename in MAPPING_FILES:
             mapping_path = os.path.join(os.path.dirname(__file__), filename)
             if os.path.exists(mapping_path):
                 try:
-                    with open(mapping_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and '\t' in line and not line.startswith('#'):
-                                parts = line.split('\t')
-                                if len(parts) >= 2:
-                                    ottoman = parts[0].strip()
-                                    turkish = parts[1].strip()
-                                    if ottoman and turkish:
-                                        # Eğer aynı kelime varsa, merged_mapping.txt'deki öncelikli
-                                        if ottoman not in mappings:
-                                            mappings[ottoman] = turkish
+                    # Kodlama (UTF-8 / UTF-16 ...) dosyadan tespit edilir
+                    pairs, _ = read_pairs(mapping_path)
+                    for ottoman, turkish, _ in pairs:
+                        # Eğer aynı kelime varsa, merged_mapping.txt'deki öncelikli
+                        if ottoman not in mappings:
+                            mappings[ottoman] = turkish
+                        options = senses.setdefault(ottoman, [])
+                        for sense in self._split_senses(turkish):
+                            if sense not in options:
+                                options.append(sense)
                 except Exception as e:
-                    print(f"Mapping dosyası yüklenirken hata: {filename} - {e}")
+                    print(f"Mapping dosyası yüklenirken hata: {filename} - {e}", file=sys.stderr)
         
+        self._word_senses = {ottoman: options for ottoman, options in senses.items() if len(options) > 1}
         return mappings
+
+    @staticmethod
+    def _split_senses(turkish: str) -> List[str]:
+        """'kadın/eş' -> ['kadın', 'eş']; cümleler ve tek karşılıklar bölünmez"""
+        if '/' in turkish and not any(char.isspace() for char in turkish):
+            parts = [part for part in turkish.split('/') if part]
+            if len(parts) > 1:
+                return parts
+        return [turkish]
     
     def _load_special_patterns(self) -> Dict[str, str]:
         """Özel kalıp eşleştirmeleri"""
@@ -218,13 +429,61 @@ class AdvancedOttomanTranslator:
         }
     
     def _load_context_rules(self) -> Dict[str, List[str]]:
-        """Bağlam kuralları"""
-        return {
+        """Bağlam kuralları: anlam -> o anlamı destekleyen komşu kelimeler
+
+        Yerleşik kurallara context_rules.json'daki ({"anlam": ["bağlam", ...]})
+        kurallar eklenir.
+        """
+        rules = {
             'kitap': ['okumak', 'yazmak', 'almak'],
             'sabah': ['namaz', 'kahvaltı', 'kalkmak'],
             'cami': ['namaz', 'gitmek', 'kılmak'],
             'market': ['almak', 'satın', 'fiyat'],
         }
+
+        path = self.context_rules_file or context_rules_path()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for sense, related_words in json.load(f).items():
+                        existing = rules.setdefault(sense, [])
+                        existing.extend(word for word in related_words if word not in existing)
+            except Exception as e:
+                print(f"Bağlam kuralları yüklenirken hata: {path} - {e}", file=sys.stderr)
+        return rules
+
+    @staticmethod
+    def _context_key(word: str) -> str:
+        """Bağlam karşılaştırması için küçük harf (Türkçe I/İ korunarak)"""
+        return word.replace('I', 'ı').replace('İ', 'i').lower()
+
+    def _build_context_index(self) -> Dict[str, Dict[str, float]]:
+        """Ters dizin: bağlam kökü -> {desteklediği anlam: ağırlık}
+
+        Mastar eki (-mak/-mek) atılır; 'okumak' kuralı 'okuyorum' komşusunu
+        önek eşleşmesiyle yakalar. Arama maliyeti kural sayısından bağımsızdır.
+        """
+        index: Dict[str, Dict[str, float]] = {}
+        for sense, related_words in self.context_rules.items():
+            for related in related_words:
+                stem = self._context_key(related)
+                if stem.endswith(('mak', 'mek')) and len(stem) - 3 >= MIN_CONTEXT_STEM:
+                    stem = stem[:-3]
+                if len(stem) < MIN_CONTEXT_STEM:
+                    continue
+                index.setdefault(stem[:MAX_CONTEXT_PREFIX], {})[sense] = 1.0
+        return index
+
+    def _context_support(self, tokens: List[str]) -> Dict[str, float]:
+        """Bir konumdaki kelime(ler)in desteklediği anlamlar (önek başına bir sözlük araması)"""
+        index = self.context_index
+        support: Dict[str, float] = {}
+        for token in tokens:
+            for part in self._context_key(token).split():
+                for length in range(MIN_CONTEXT_STEM, min(len(part), MAX_CONTEXT_PREFIX) + 1):
+                    for sense, weight in index.get(part[:length], {}).items():
+                        support[sense] = support.get(sense, 0.0) + weight
+        return support
     
     def split_ottoman_words(self, text: str) -> List[str]:
         """Osmanlıca metni kelimelere böl"""
@@ -348,6 +607,7 @@ class AdvancedOttomanTranslator:
         # Kısmi eşleşme ara
         best_match = None
         best_score = 0.0
+        tied_matches = []
         
         for ottoman, turkish in self.word_mapping.items():
             # Tam eşleşme
@@ -360,6 +620,13 @@ class AdvancedOttomanTranslator:
                 if similarity > best_score:
                     best_score = similarity
                     best_match = turkish
+                    tied_matches = [turkish]
+                elif similarity == best_score and similarity > 0:
+                    tied_matches.append(turkish)
+        
+        # Eşit benzerlikteki adaylardan Türkçede en olası görüneni seç
+        if len(tied_matches) > 1 and self.corpus_stats is not None:
+            best_match = self.corpus_stats.rank(tied_matches)[0][0]
         
         # Özel kalıp eşleşmesi
         for pattern, replacement in self.special_patterns.items():
@@ -368,6 +635,44 @@ class AdvancedOttomanTranslator:
         
         return best_match, best_score
     
+    def word_candidates(self, word: str, limit: int = 5) -> List[Tuple[str, float, str]]:
+        """Kelime için en fazla limit aday: [(türkçe, güven, kaynak), ...]
+
+        Kaynaklar: 'exact' (tüm anlamlarıyla), 'fuzzy' (tam eşleşme yoksa en
+        benzer kısmi eşleşmeler), 'suffix' (ek kalıpları) ve 'transliteration'
+        (karakter bazlı çeviri). Aynı metin en yüksek güveniyle bir kez yer alır.
+        """
+        found: Dict[str, Tuple[float, str]] = {}
+
+        def add(text: str, confidence: float, source: str):
+            if text and (text not in found or found[text][0] < confidence):
+                found[text] = (confidence, source)
+
+        if word in self.word_mapping:
+            for sense in self.word_senses.get(word) or [self.word_mapping[word]]:
+                add(sense, 1.0, 'exact')
+        else:
+            partial = []
+            for ottoman, turkish in self.word_mapping.items():
+                if len(ottoman) < MIN_FUZZY_KEY_LENGTH or not (ottoman in word or word in ottoman):
+                    continue
+                # Biri diğerinin alt dizisi: düzenleme uzaklığı uzunluk farkına eşittir
+                similarity = min(len(ottoman), len(word)) / max(len(ottoman), len(word))
+                if similarity >= MIN_FUZZY_SIMILARITY:
+                    partial.append((similarity, turkish))
+            partial.sort(key=lambda item: item[0], reverse=True)
+            for similarity, turkish in partial[:limit]:
+                add(turkish, similarity, 'fuzzy')
+
+        for pattern, replacement in self.special_patterns.items():
+            if re.search(pattern, word):
+                add(replacement, 0.9, 'suffix')
+
+        add(self.translate_character_by_character(word), 0.5, 'transliteration')
+
+        ranked = sorted(found.items(), key=lambda item: item[1][0], reverse=True)
+        return [(text, confidence, source) for text, (confidence, source) in ranked[:limit]]
+
     def _calculate_similarity(self, word1: str, word2: str) -> float:
         """İki kelime arasındaki benzerliği hesapla"""
         if not word1 or not word2:
@@ -397,33 +702,41 @@ class AdvancedOttomanTranslator:
         similarity = 1 - (matrix[len1][len2] / max_len)
         return similarity
     
-    def apply_context_corrections(self, words: List[str]) -> List[str]:
-        """Bağlam bazlı düzeltmeler ve kelime sırası düzeltmeleri"""
+    def apply_context_corrections(self, words: List[str], candidates: Optional[List[Optional[List[str]]]] = None,
+                                  window: Optional[int] = None) -> List[str]:
+        """Bağlam bazlı anlam seçimi ve kelime sırası düzeltmeleri
+
+        candidates: words ile aynı hizada, çok anlamlı kelimeler için aday
+                    anlamlar (diğer konumlarda None)
+        window: İki yanda bakılan kelime sayısı (varsayılan: self.context_window)
+
+        Her konumun desteklediği anlamlar bağlam dizininden bir kez çıkarılır;
+        aday anlamlar penceredeki komşuların desteğiyle (yakın komşu daha
+        ağır) puanlanır. Maliyet metin uzunluğuyla doğrusaldır, kural
+        sayısından bağımsızdır. Destek yoksa kelime olduğu gibi kalır.
+        """
         corrected_words = words.copy()
-        
-        # Kelime sırası düzeltmeleri
-        corrected_words = self._fix_word_order(corrected_words)
-        
-        for i, word in enumerate(corrected_words):
-            # Önceki ve sonraki kelimeleri kontrol et
-            context_words = []
-            if i > 0:
-                context_words.append(corrected_words[i-1])
-            if i < len(corrected_words) - 1:
-                context_words.append(corrected_words[i+1])
-            
-            # Bağlam kurallarını uygula
-            for context_key, related_words in self.context_rules.items():
-                if context_key in word.lower():
-                    for related in related_words:
-                        if any(related in ctx.lower() for ctx in context_words):
-                            # Bağlam uyumlu, düzeltme yapma
-                            break
-            else:
-                        # Bağlam uyumsuz, düzeltme yap
-                        pass
-        
-        return corrected_words
+        window = self.context_window if window is None else window
+
+        if candidates and window > 0 and any(options for options in candidates):
+            # Belirsiz komşular tüm adaylarıyla bağlam sayılır
+            support = [self._context_support(candidates[i] or [word]) for i, word in enumerate(corrected_words)]
+            for i, options in enumerate(candidates):
+                if not options or len(options) < 2:
+                    continue
+                scores = dict.fromkeys(options, 0.0)
+                for j in range(max(i - window, 0), min(i + window + 1, len(corrected_words))):
+                    if j == i or not support[j]:
+                        continue
+                    for sense in options:
+                        scores[sense] += support[j].get(sense, 0.0) / abs(i - j)
+                # Eşitlikte öncelikli dosyadaki (ilk) anlam kalır
+                best = max(options, key=lambda sense: scores[sense])
+                if scores[best] > 0:
+                    corrected_words[i] = best
+
+        # Kelime sırası düzeltmeleri (anlam seçiminden sonra, hizalama bozulmasın)
+        return self._fix_word_order(corrected_words)
     
     def _fix_word_order(self, words: List[str]) -> List[str]:
         """Kelime sırası düzeltmeleri"""
@@ -501,24 +814,68 @@ class AdvancedOttomanTranslator:
         
         return words
     
-    def translate_text(self, ottoman_text: str) -> Dict[str, any]:
-        """Ana çeviri fonksiyonu"""
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Önbellek anahtarı için metni normalleştir (Unicode NFC, tek boşluk)"""
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    @profiled('translate_text')
+    def translate_text(self, ottoman_text: str, word_cache: Optional[Dict[str, Tuple[str, float]]] = None) -> Dict[str, any]:
+        """Ana çeviri fonksiyonu
+
+        word_cache: Verilirse kelime eşleşmeleri bu sözlükte saklanır ve yeniden
+                    kullanılır (toplu çeviride metinler arasında paylaşılır)
+        """
+        if self.cache is None or not self.cache.enabled:
+            return self._translate_text_uncached(ottoman_text, word_cache)
+
+        # Önbellekte normalleştirilmiş metin çevrilir; aynı metnin farklı
+        # boşluk/Unicode biçimleri aynı sonucu paylaşır
+        normalized = self.normalize_text(ottoman_text)
+        key = self.cache.make_key('translation', f'window={self.context_window}',
+                                  f'beam={self.beam_width}:{self.nbest}:{self.beam_candidates}',
+                                  f'inputs={self.cache_inputs}', normalized)
+        result = self.cache.get(key)
+        if result is not None:
+            result['cache_hit'] = True
+        else:
+            result = self._translate_text_uncached(normalized, word_cache)
+            if result.get('success'):
+                self.cache.set(key, result)
+            result['cache_hit'] = False
+
+        result['ottoman_text'] = ottoman_text
+        return result
+
+    def _translate_text_uncached(self, ottoman_text: str,
+                                 word_cache: Optional[Dict[str, Tuple[str, float]]] = None) -> Dict[str, any]:
+        """Önbelleğe bakmadan çevir"""
         try:
             # Metni kelimelere böl
             words = self.split_ottoman_words(ottoman_text)
+
+            if self.beam_width > 0 and self.word_lm is not None:
+                return self._translate_with_beam(ottoman_text, words)
             
             translated_words = []
             confidence_scores = []
+            candidates = []
             
             for word in words:
                 # Noktalama işareti kontrolü
                 if re.match(r'[،؛؟!\.]', word):
                     translated_words.append(word)
                     confidence_scores.append(1.0)
+                    candidates.append(None)
                     continue
                 
                 # Kelime çevirisi
-                translated_word, confidence = self.find_best_word_match(word)
+                if word_cache is None:
+                    translated_word, confidence = self.find_best_word_match(word)
+                else:
+                    if word not in word_cache:
+                        word_cache[word] = self.find_best_word_match(word)
+                    translated_word, confidence = word_cache[word]
                 
                 if translated_word:
                     translated_words.append(translated_word)
@@ -528,9 +885,10 @@ class AdvancedOttomanTranslator:
                     char_translated = self.translate_character_by_character(word)
                     translated_words.append(char_translated)
                     confidence_scores.append(0.5)
+                candidates.append(self.word_senses.get(word))
             
             # Bağlam düzeltmeleri
-            corrected_words = self.apply_context_corrections(translated_words)
+            corrected_words = self.apply_context_corrections(translated_words, candidates)
             
             # Sonucu birleştir
             final_text = ' '.join(corrected_words)
@@ -558,25 +916,118 @@ class AdvancedOttomanTranslator:
                 'confidence': 0.0
             }
 
+    def _translate_with_beam(self, ottoman_text: str, words: List[str]) -> Dict[str, any]:
+        """Kelime kafesini cümle cümle ışın aramasıyla çöz
+
+        Noktalama işaretleri cümleleri ayırır; her cümle ayrı çözüldüğü için
+        gecikme cümle uzunluğuyla sınırlı kalır. Cümlelerin n-best listeleri
+        metin düzeyinde birleştirilir.
+        """
+        from beam_decoder import Candidate, merge_nbest
+
+        candidates: Dict[str, List] = {}
+        segments = []
+        lattice = []
+        for word in words:
+            if not re.match(r'[،؛؟!\.]', word):
+                if word not in candidates:
+                    candidates[word] = [Candidate(*candidate)
+                                        for candidate in self.word_candidates(word, self.beam_candidates)]
+                lattice.append(candidates[word])
+                continue
+            if lattice:
+                segments.append(self.beam_decoder.decode(lattice, self.nbest))
+                lattice = []
+            # Noktalama tek seçenekli bir parça olarak korunur
+            segments.append([{'words': [word], 'score': 0.0, 'confidences': [1.0]}])
+        if lattice:
+            segments.append(self.beam_decoder.decode(lattice, self.nbest))
+
+        nbest = merge_nbest(segments, self.nbest)
+        best = nbest[0]
+        corrected_words = self._fix_word_order(list(best['words']))
+        confidences = best['confidences']
+
+        return {
+            'success': True,
+            'ottoman_text': ottoman_text,
+            'turkish_text': ' '.join(corrected_words),
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'word_count': len(words),
+            'translated_words': best['words'],
+            'confidence_scores': confidences,
+            'nbest': [{'turkish_text': ' '.join(item['words']), 'score': item['score']} for item in nbest],
+            'method': 'beam_search'
+        }
+
+    @profiled('translate_batch')
+    def translate_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Birden fazla metni tek seferde çevir
+
+        Aynı metinler bir kez çevrilir, kelime eşleşmeleri tüm metinler arasında
+        paylaşılır; OCR bölgeleri gibi çok sayıda kısa metin için uygundur.
+        """
+        word_cache = {}
+        results = {}
+        for text in texts:
+            if text not in results:
+                results[text] = self.translate_text(text, word_cache=word_cache)
+        return [results[text] for text in texts]
+
 
 if __name__ == "__main__":
     # Komut satırı arayüzü: route.ts bu betiği 'python advanced_ottoman_translator.py <metin_dosyası>' ile çağırıyor
+    import argparse
     import sys
     import json
+    import time
+
+    import profiling
+
+    parser = argparse.ArgumentParser(description="Osmanlıca-Türkçe çeviri")
+    parser.add_argument('input_path', nargs='?', help="Çevrilecek metin dosyası")
+    parser.add_argument('--import-profile', action='store_true',
+                        help="Başlangıç raporunu stderr'e yaz (stdout JSON'u değişmez)")
+    parser.add_argument('--no-cache', action='store_true', help="Kalıcı çeviri önbelleğini atla")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: ai-training/cache)")
+    parser.add_argument('--cache-max-mb', type=int, default=64, help="Önbellek boyut sınırı (MB)")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TRANSLATION_CACHE_TTL,
+                        help="Önbellek kayıtlarının yaşam süresi (saniye, 0 = süresiz)")
+    parser.add_argument('--context-window', type=int, default=DEFAULT_CONTEXT_WINDOW,
+                        help="Çok anlamlı kelimelerde iki yanda bakılan kelime sayısı")
+    parser.add_argument('--beam', type=int, default=0,
+                        help="Işın genişliği (0 = açgözlü çeviri; data/training/word_lm_turkish.npz gerekir)")
+    parser.add_argument('--nbest', type=int, default=3, help="Işın aramasında döndürülecek alternatif sayısı")
+    profiling.add_cli_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure_from_args(args)
+
     try:
-        if len(sys.argv) != 2:
+        if not args.input_path:
             print(json.dumps({
                 "success": False,
-                "error": "Kullanım: python advanced_ottoman_translator.py <metin_dosyası>"
+                "error": "Kullanım: python advanced_ottoman_translator.py <metin_dosyası> [--import-profile] [--profile cpu,mem]"
             }))
             sys.exit(1)
 
-        input_path = sys.argv[1]
-        with open(input_path, 'r', encoding='utf-8') as f:
+        with open(args.input_path, 'r', encoding='utf-8') as f:
             ottoman_text = f.read().strip()
 
-        translator = AdvancedOttomanTranslator()
+        init_start = time.perf_counter()
+        translator = AdvancedOttomanTranslator(cache=build_translation_cache(
+            enabled=not args.no_cache, cache_dir=args.cache_dir,
+            max_mb=args.cache_max_mb, ttl=args.cache_ttl or None
+        ), context_window=args.context_window, beam_width=args.beam, nbest=args.nbest)
+        call_start = time.perf_counter()
         result = translator.translate_text(ottoman_text)
+        call_end = time.perf_counter()
+
+        if args.import_profile:
+            from startup import print_startup_report, startup_report
+            print_startup_report(startup_report('advanced_ottoman_translator', {
+                'init': (call_start - init_start) * 1000,
+                'first_call': (call_end - call_start) * 1000
+            }))
 
         if result.get("success"):
             output = {
@@ -585,8 +1036,11 @@ if __name__ == "__main__":
                 "confidence": result.get("confidence", 0.0),
                 "method_used": result.get("method", "advanced_character_based"),
                 "processing_time": 0.0,
-                "ai_model": "Advanced Ottoman Translator"
+                "ai_model": "Advanced Ottoman Translator",
+                "cache_hit": result.get("cache_hit", False)
             }
+            if "nbest" in result:
+                output["nbest"] = result["nbest"]
         else:
             output = {
                 "success": False,
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kelime Kafesi Üzerinde Işın Araması (Beam Search)
+Her Osmanlıca kelime için birkaç Türkçe aday (tam, bulanık, ek kalıbı, harf
+çevirisi) bir kafes (lattice) oluşturur; yollar aday güveni ve Türkçe kelime
+trigram dil modeliyle puanlanır. Işın genişliği ve skor eşiğiyle budanan arama
+cümle başına sınırlı sürede en iyi N çeviriyi verir.
+
+Dil modeli oe_tr ve merged_mapping'in Türkçe tarafından sayılır ve corpus_stats
+gibi sıralı NumPy dizilerinde (.npz) tutulur: kelime kimlikleri sıralı sözlük
+dizisindeki konumlardır, bigram/trigram anahtarları kimliklerin paketlenmesidir.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from corpus_stats import INTERPOLATION, arrays_to_npz_bytes, lookup_sorted
+
+# Kelime kimlikleri 21 bittir; trigram anahtarı (a << 42 | b << 21 | c) uint64'e sığar
+ID_BITS = 21
+MAX_VOCABULARY = 1 << ID_BITS
+
+SENTENCE_START = '<s>'
+SENTENCE_END = '</s>'
+UNKNOWN_WORD = '<unk>'
+
+DEFAULT_BEAM_WIDTH = 8
+DEFAULT_CANDIDATES = 5
+DEFAULT_NBEST = 3
+
+# En iyi hipotezden bu kadar (doğal log) kötü olanlar budanır
+DEFAULT_SCORE_THRESHOLD = 20.0
+
+# Aday güveninin (log) dil modeline göre ağırlığı
+DEFAULT_CHANNEL_WEIGHT = 2.0
+
+# Uzun ömürlü süreçlerde aday metni -> kimlik önbelleğinin üst sınırı
+ID_CACHE_SIZE = 100000
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Türkçe metni küçük harfli kelimelere böl (I/İ Türkçe kurala göre)"""
+    text = text.replace('I', 'ı').replace('İ', 'i').lower()
+    return _WORD_PATTERN.findall(text)
+
+
+class Candidate(NamedTuple):
+    """Kafesteki bir aday: Türkçe metin, güven (0-1] ve kaynağı"""
+    text: str
+    confidence: float
+    source: str
+
+
+class WordNgramModel:
+    """Kelime unigram/bigram/trigram sayıları
+
+    vocabulary sıralı bir dizi olduğundan kelime -> kimlik dönüşümü de
+    searchsorted ile yapılır; yüklemede sözlük kurulmaz.
+    """
+
+    ARRAYS = ('vocabulary', 'unigram_counts', 'bigram_keys', 'bigram_counts',
+              'trigram_keys', 'trigram_counts')
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.total_words = int(self.unigram_counts.sum())
+        self.vocabulary_size = len(self.vocabulary)
+        self.unknown_id = int(self._positions([UNKNOWN_WORD])[0][0])
+        self.start_id = int(self._positions([SENTENCE_START])[0][0])
+        self.end_id = int(self._positions([SENTENCE_END])[0][0])
+
+    # --- Oluşturma -------------------------------------------------------
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> 'WordNgramModel':
+        """Metinlerden (her biri bir cümle) n-gram sayılarını çıkar"""
+        sentences = [tokenize(text) for text in texts]
+        vocabulary = np.array(sorted({word for words in sentences for word in words}
+                                     | {SENTENCE_START, SENTENCE_END, UNKNOWN_WORD}))
+        if len(vocabulary) > MAX_VOCABULARY:
+            raise ValueError(f"Sözlük çok büyük: {len(vocabulary)} > {MAX_VOCABULARY}")
+
+        index = {word: position for position, word in enumerate(vocabulary.tolist())}
+        start, end = index[SENTENCE_START], index[SENTENCE_END]
+        sequences = [[start, start] + [index[word] for word in words] + [end] for words in sentences if words]
+        ids = np.array([word_id for sequence in sequences for word_id in sequence], dtype=np.uint64)
+
+        # Cümle sınırını aşan n-gramlar sayılmaz: her cümle iki <s> ile başlar
+        valid = np.ones(len(ids), dtype=bool)
+        offsets = np.cumsum([0] + [len(sequence) for sequence in sequences])
+        valid[offsets[1:-1]] = False  # yeni cümlenin ilk konumu öncekine bağlanmaz
+        pair_valid = valid[1:]
+        triple_valid = valid[1:-1] & valid[2:]
+
+        arrays = {'vocabulary': vocabulary}
+        # <s> de sayılır: bigram bağlamı olarak payda (c(<s>)) gerekir
+        arrays['unigram_counts'] = np.bincount(ids.astype(np.int64), minlength=len(vocabulary)).astype(np.int64)
+        bigrams = (ids[:-1] << ID_BITS) | ids[1:]
+        keys, counts = np.unique(bigrams[pair_valid], return_counts=True)
+        arrays['bigram_keys'], arrays['bigram_counts'] = keys, counts.astype(np.int64)
+        trigrams = (ids[:-2] << (2 * ID_BITS)) | (ids[1:-1] << ID_BITS) | ids[2:]
+        keys, counts = np.unique(trigrams[triple_valid], return_counts=True)
+        arrays['trigram_keys'], arrays['trigram_counts'] = keys, counts.astype(np.int64)
+        return cls(arrays)
+
+    # --- Kaydetme / yükleme ----------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Dizileri sabit tarihli sıkıştırılmış .npz olarak kodla (aynı veri, aynı bayt)"""
+        return arrays_to_npz_bytes({name: getattr(self, name) for name in self.ARRAYS})
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'WordNgramModel':
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in cls.ARRAYS})
+
+    # --- Sorgular --------------------------------------------------------
+
+    def _positions(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sıralı sözlükte (konum, bulundu mu) dizileri"""
+        query = np.array(list(words), dtype=self.vocabulary.dtype)
+        positions = np.minimum(np.searchsorted(self.vocabulary, query), len(self.vocabulary) - 1)
+        return positions, self.vocabulary[positions] == query
+
+    def word_ids(self, words: Sequence[str]) -> np.ndarray:
+        """Kelimelerin kimlikleri; sözlükte olmayanlar <unk>"""
+        if not words:
+            return np.zeros(0, dtype=np.uint64)
+        positions, found = self._positions(words)
+        return np.where(found, positions, self.unknown_id).astype(np.uint64)
+
+    def log_probs(self, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+        """P(c | a b) için enterpolasyonlu log-olasılıklar (vektörel)"""
+        trigram = lookup_sorted(self.trigram_keys, self.trigram_counts, (a << (2 * ID_BITS)) | (b << ID_BITS) | c)
+        context2 = lookup_sorted(self.bigram_keys, self.bigram_counts, (a << ID_BITS) | b)
+        bigram = lookup_sorted(self.bigram_keys, self.bigram_counts, (b << ID_BITS) | c)
+        context1 = self.unigram_counts[b.astype(np.int64)]
+        unigram = self.unigram_counts[c.astype(np.int64)]
+
+        weight3, weight2, weight1 = INTERPOLATION
+        probability = (
+            weight3 * np.divide(trigram, context2, out=np.zeros(len(c)), where=context2 > 0)
+            + weight2 * np.divide(bigram, context1, out=np.zeros(len(c)), where=context1 > 0)
+            + weight1 * (unigram + 1) / (self.total_words + self.vocabulary_size)
+        )
+        return np.log(probability)
+
+    def score(self, text: str) -> float:
+        """Tek bir cümlenin toplam log-olasılığı (cümle sınırları dahil)"""
+        ids = self.word_ids(tokenize(text))
+        sequence = np.concatenate(([self.start_id, self.start_id], ids, [self.end_id])).astype(np.uint64)
+        return float(self.log_probs(sequence[:-2], sequence[1:-1], sequence[2:]).sum())
+
+    def summary(self) -> Dict:
+        return {
+            'words': self.total_words,
+            'vocabulary': self.vocabulary_size,
+            'unique_bigrams': len(self.bigram_keys),
+            'unique_trigrams': len(self.trigram_keys)
+        }
+
+
+class _Hypothesis(NamedTuple):
+    score: float
+    channel: float
+    context: Tuple[int, int]
+    words: Tuple[str, ...]
+    confidences: Tuple[float, ...]
+
+
+class BeamDecoder:
+    """Aday kafesinde budanmış ışın araması
+
+    Her adımda ışındaki her hipotez her adayla genişletilir; tüm genişlemelerin
+    dil modeli skorları tek bir vektörel sorguyla hesaplanır. Işında en fazla
+    width hipotez kalır, en iyiden threshold'dan fazla geride olanlar atılır;
+    böylece maliyet cümle başına O(kelime x width x aday) ile sınırlıdır.
+    """
+
+    def __init__(self, model: WordNgramModel, width: int = DEFAULT_BEAM_WIDTH,
+                 threshold: float = DEFAULT_SCORE_THRESHOLD, channel_weight: float = DEFAULT_CHANNEL_WEIGHT):
+        if width < 1:
+            raise ValueError("Işın genişliği en az 1 olmalı")
+        self.model = model
+        self.width = width
+        self.threshold = threshold
+        self.channel_weight = channel_weight
+        self._id_cache: Dict[str, Tuple[int, ...]] = {}
+
+    def _candidate_ids(self, text: str) -> Tuple[int, ...]:
+        ids = self._id_cache.get(text)
+        if ids is None:
+            if len(self._id_cache) >= ID_CACHE_SIZE:
+                self._id_cache.clear()
+            ids = tuple(int(word_id) for word_id in self.model.word_ids(tokenize(text)))
+            self._id_cache[text] = ids
+        return ids
+
+    def _prune(self, hypotheses: List[_Hypothesis]) -> List[_Hypothesis]:
+        hypotheses.sort(key=lambda hypothesis: hypothesis.score, reverse=True)
+        best = hypotheses[0].score
+        return [hypothesis for hypothesis in hypotheses[:self.width] if hypothesis.score >= best - self.threshold]
+
+    def decode(self, lattice: Sequence[Sequence[Candidate]], nbest: int = DEFAULT_NBEST) -> List[Dict]:
+        """Kafesi çöz: en iyi nbest yol [{words, score, confidences}, ...]
+
+        lattice: her konum için en az bir aday (boş konumlar atlanır)
+        """
+        start = self.model.start_id
+        beam = [_Hypothesis(0.0, 0.0, (int(start), int(start)), (), ())]
+
+        for candidates in lattice:
+            if not candidates:
+                continue
+            # Tüm (hipotez, aday) genişlemelerinin kelimeleri tek dizide toplanır
+            first, second, third, owners = [], [], [], []
+            for h_index, hypothesis in enumerate(beam):
+                for c_index, candidate in enumerate(candidates):
+                    owner = h_index * len(candidates) + c_index
+                    a, b = hypothesis.context
+                    for word_id in self._candidate_ids(candidate.text):
+                        first.append(a)
+                        second.append(b)
+                        third.append(word_id)
+                        owners.append(owner)
+                        a, b = b, word_id
+
+            lm = np.bincount(
+                np.array(owners, dtype=np.int64),
+                weights=self.model.log_probs(np.array(first, dtype=np.uint64), np.array(second, dtype=np.uint64),
+                                             np.array(third, dtype=np.uint64)),
+                minlength=len(beam) * len(candidates)
+            ) if owners else np.zeros(len(beam) * len(candidates))
+
+            expanded = []
+            for h_index, hypothesis in enumerate(beam):
+                for c_index, candidate in enumerate(candidates):
+                    ids = self._candidate_ids(candidate.text)
+                    context = hypothesis.context
+                    if len(ids) >= 2:
+                        context = (ids[-2], ids[-1])
+                    elif ids:
+                        context = (context[1], ids[0])
+                    channel = self.channel_weight * float(np.log(max(candidate.confidence, 1e-6)))
+                    expanded.append(_Hypothesis(
+                        hypothesis.score + float(lm[h_index * len(candidates) + c_index]) + channel,
+                        hypothesis.channel + channel,
+                        context,
+                        hypothesis.words + (candidate.text,),
+                        hypothesis.confidences + (candidate.confidence,)
+                    ))
+            beam = self._prune(expanded)
+
+        # Cümle sonu olasılığı eklenir
+        end = np.full(len(beam), self.model.end_id, dtype=np.uint64)
+        closing = self.model.log_probs(np.array([h.context[0] for h in beam], dtype=np.uint64),
+                                       np.array([h.context[1] for h in beam], dtype=np.uint64), end)
+        final = sorted(
+            (hypothesis._replace(score=hypothesis.score + float(log_prob)) for hypothesis, log_prob in zip(beam, closing)),
+            key=lambda hypothesis: hypothesis.score, reverse=True
+        )
+        return [{'words': list(hypothesis.words), 'score': hypothesis.score,
+                 'confidences': list(hypothesis.confidences)} for hypothesis in final[:nbest]]
+
+
+def merge_nbest(sentences: Sequence[Sequence[Dict]], nbest: int = DEFAULT_NBEST) -> List[Dict]:
+    """Cümle başına n-best listelerini metin düzeyinde en iyi nbest birleşime indir"""
+    combined = [{'words': [], 'score': 0.0, 'confidences': []}]
+    for hypotheses in sentences:
+        if not hypotheses:
+            continue
+        combined = sorted(
+            ({'words': left['words'] + right['words'], 'score': left['score'] + right['score'],
+              'confidences': left['confidences'] + right['confidences']}
+             for left in combined for right in hypotheses),
+            key=lambda item: item['score'], reverse=True
+        )[:nbest]
+    return combined
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import os
+
+    from corpus_io import read_pairs
+
+    parser = argparse.ArgumentParser(description="Eşleştirme dosyalarının Türkçe tarafından kelime trigram modeli çıkar")
+    parser.add_argument('paths', nargs='+', help="Sekmeyle ayrılmış eşleştirme dosyaları (oe_tr.txt, merged_mapping.txt)")
+    parser.add_argument('--output', help="Model dosyası (ör. data/training/word_lm_turkish.npz)")
+    args = parser.parse_args()
+
+    texts = []
+    for file_path in args.paths:
+        file_pairs, _ = read_pairs(file_path)
+        texts.extend(turkish for _, turkish, _ in file_pairs)
+
+    word_model = WordNgramModel.from_texts(texts)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        word_model.save(args.output)
+    print(json.dumps(word_model.summary(), ensure_ascii=False, indent=2))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel Uyarlamalı İkilileştirme
+Lekeli, düzensiz aydınlatılmış arşiv sayfalarında tek bir Otsu eşiği koyu
+bölgeleri tümüyle siler. Sauvola ve Niblack yöntemleri her piksel için eşiği
+çevresindeki pencerenin ortalaması (m) ve standart sapmasından (s) hesaplar:
+
+    Niblack:  T = m + k * s                 (k ~ -0.2)
+    Sauvola:  T = m * (1 + k * (s / R - 1)) (k ~ 0.3, R = 128)
+
+Pencere toplamları değer ve kare değer integral görüntülerinden dört köşe
+okumasıyla alınır; maliyet pencere boyutundan bağımsız olarak piksel sayısıyla
+doğrusaldır. Büyük taramalar pencere yarıçapı kadar taşma payı olan yatay
+şeritlere bölünüp iş parçacıklarında işlenir (sonuç tek parça ile aynıdır).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from startup import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+BINARIZATION_METHODS = ('otsu', 'sauvola', 'niblack')
+
+DEFAULT_WINDOW = 31
+DEFAULT_K = {'sauvola': 0.3, 'niblack': -0.2}
+
+# Sauvola'da standart sapmanın dinamik aralığı (8 bit gri için 128)
+SAUVOLA_RANGE = 128.0
+
+# Şerit yüksekliği ve paralel işlemenin devreye girdiği piksel sayısı
+BAND_ROWS = 1024
+PARALLEL_MIN_PIXELS = 4_000_000
+
+
+def otsu(gray: 'np.ndarray') -> 'np.ndarray':
+    """Mevcut genel eşikleme yolu (karşılaştırma için)"""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def _threshold_band(padded: 'np.ndarray', method: str, window: int, k: float) -> 'np.ndarray':
+    """Taşma paylı şerit için yerel eşik yüzeyini hesapla
+
+    padded: Her kenarda window // 2 piksel yansıtılmış şerit
+    """
+    height = padded.shape[0] - window + 1
+    width = padded.shape[1] - window + 1
+    sums, squares = cv2.integral2(padded, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+    def window_sum(table):
+        return (table[window:window + height, window:window + width]
+                - table[:height, window:window + width]
+                - table[window:window + height, :width]
+                + table[:height, :width])
+
+    area = float(window * window)
+    mean = window_sum(sums)
+    mean /= area
+    std = window_sum(squares)
+    std /= area
+    std -= mean * mean
+    np.maximum(std, 0.0, out=std)
+    np.sqrt(std, out=std)
+
+    if method == 'niblack':
+        std *= k
+        mean += std
+        return mean
+
+    std /= SAUVOLA_RANGE
+    std -= 1.0
+    std *= k
+    std += 1.0
+    mean *= std
+    return mean
+
+
+def adaptive_threshold(gray: 'np.ndarray', method: str = 'sauvola', window: int = DEFAULT_WINDOW,
+                       k: Optional[float] = None, workers: Optional[int] = None,
+                       band_rows: int = BAND_ROWS) -> 'np.ndarray':
+    """Sauvola/Niblack ile ikili görüntü üret (metin 0, arka plan 255)
+
+    window: Tek sayıya yuvarlanan pencere kenarı (piksel)
+    workers: Şerit başına iş parçacığı sayısı; None ise büyük görüntülerde
+             CPU sayısına göre seçilir
+    """
+    if method not in DEFAULT_K:
+        raise ValueError(f"Bilinmeyen yerel ikilileştirme yöntemi: {method}")
+    if gray.ndim != 2:
+        raise ValueError("Gri tonlamalı (2 boyutlu) görüntü gerekli")
+
+    window = max(int(window), 3) | 1
+    k = DEFAULT_K[method] if k is None else k
+    radius = window // 2
+    height, width = gray.shape
+
+    # Yansıtma en az bir piksel ister; çok küçük görüntülerde kenar kopyalanır
+    border = cv2.BORDER_REFLECT_101 if min(height, width) > radius else cv2.BORDER_REPLICATE
+    padded = cv2.copyMakeBorder(gray, radius, radius, radius, radius, border)
+    binary = np.empty_like(gray)
+
+    def run(y0: int):
+        y1 = min(y0 + band_rows, height)
+        threshold = _threshold_band(padded[y0:y1 + 2 * radius], method, window, k)
+        np.greater(gray[y0:y1], threshold, out=threshold)
+        binary[y0:y1] = threshold.astype(np.uint8) * 255
+
+    starts = list(range(0, height, band_rows))
+    if workers is None:
+        workers = min(4, os.cpu_count() or 1) if height * width >= PARALLEL_MIN_PIXELS else 1
+    if workers > 1 and len(starts) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        # NumPy ve OpenCV büyük dizilerde GIL'i bırakır
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run, starts))
+    else:
+        for y0 in starts:
+            run(y0)
+    return binary
+
+
+def binarize(gray: 'np.ndarray', method: str = 'otsu', **options) -> 'np.ndarray':
+    """Yönteme göre ikilileştir: 'otsu' genel, 'sauvola'/'niblack' yerel eşik"""
+    if method == 'otsu':
+        return otsu(gray)
+    return adaptive_threshold(gray, method, **options)
+
+
+def compare_timings(gray: 'np.ndarray', windows: List[int], repeats: int = 3) -> Dict:
+    """Otsu ile yerel yöntemlerin sürelerini karşılaştır (en iyi tekrar, ms)"""
+    def best(function) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            times.append((time.perf_counter() - start) * 1000)
+        return min(times)
+
+    megapixels = gray.size / 1_000_000
+    results = {'shape': list(gray.shape), 'megapixels': megapixels, 'otsu_ms': best(lambda: otsu(gray))}
+    for method in DEFAULT_K:
+        for window in windows:
+            results[f'{method}_w{window}_ms'] = best(lambda: adaptive_threshold(gray, method, window, workers=1))
+        results[f'{method}_w{windows[-1]}_parallel_ms'] = best(lambda: adaptive_threshold(gray, method, windows[-1]))
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Sauvola/Niblack ikilileştirme ve Otsu ile süre karşılaştırması")
+    parser.add_argument('image', help="Gri tonlamaya çevrilecek görüntü")
+    parser.add_argument('--method', choices=BINARIZATION_METHODS, default='sauvola', help="İkilileştirme yöntemi")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="Pencere kenarı (piksel)")
+    parser.add_argument('--k', type=float, help="Yöntem katsayısı (varsayılan: sauvola 0.3, niblack -0.2)")
+    parser.add_argument('--output', help="İkili görüntünün yazılacağı dosya")
+    parser.add_argument('--compare', action='store_true', help="Otsu ile farklı pencere boyutlarında süre karşılaştır")
+    parser.add_argument('--windows', default='15,31,63,127', help="Karşılaştırmada kullanılacak pencereler")
+    args = parser.parse_args(argv)
+
+    gray = cv2.imread(args.image, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        print(json.dumps({"success": False, "error": f"Görüntü yüklenemedi: {args.image}"}))
+        sys.exit(1)
+
+    if args.compare:
+        windows = [int(item) for item in args.windows.split(',') if item]
+        print(json.dumps({"success": True, "timings": compare_timings(gray, windows)}, indent=2))
+        return
+
+    start = time.perf_counter()
+    options = {} if args.method == 'otsu' else {'window': args.window, 'k': args.k}
+    binary = binarize(gray, args.method, **options)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.output:
+        cv2.imwrite(args.output, binary)
+    print(json.dumps({
+        "success": True,
+        "method": args.method,
+        "time_ms": elapsed,
+        "foreground_ratio": float((binary == 0).mean()),
+        "output": args.output
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metin Derlemi Okuma Katmanı
+Sekmeyle ayrılmış Osmanlıca-Türkçe eşleştirme dosyalarını (oe_tr.txt,
+merged_mapping.txt...) kodlamasını BOM'dan veya içerikten tespit ederek,
+büyük parçalar halinde ve gerektiğinde tüm çekirdeklerde paralel okur.
+"""
+
+import codecs
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (osmanlıca, türkçe, satır numarası)
+Pair = Tuple[str, str, int]
+
+# Bir seferde okunacak karakter sayısı (satır sınırına kadar uzatılır)
+CHUNK_CHARS = 4 * 1024 * 1024
+
+# Bu boyutun üzerindeki dosyalar süreç havuzunda paralel ayrıştırılır
+PARALLEL_THRESHOLD = 32 * 1024 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def detect_encoding(path: str, sample_size: int = 64 * 1024) -> str:
+    """Dosyanın kodlamasını BOM'dan, yoksa içerikten tahmin et
+
+    BOM'suz UTF-16 dosyalar boş (NUL) baytların çift/tek konumlarından tanınır;
+    geçerli UTF-8 değilse Türkçe Windows kod sayfasına (cp1254) düşülür.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    if sample:
+        even_nulls = sample[0::2].count(0)
+        odd_nulls = sample[1::2].count(0)
+        half = len(sample) / 2
+        if odd_nulls > half * 0.3 and even_nulls < half * 0.05:
+            return 'utf-16-le'
+        if even_nulls > half * 0.3 and odd_nulls < half * 0.05:
+            return 'utf-16-be'
+
+    try:
+        # Örnek yarım bir karakterle bitebilir; son parçayı kesin sayma
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1254'
+
+
+def iter_text_chunks(path: str, encoding: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """Dosyayı satır sınırlarında biten büyük metin parçaları halinde oku
+
+    Satır sonları (CRLF dahil) '\\n' olarak normalleştirilir.
+    """
+    with open(path, 'r', encoding=encoding, errors='replace', newline=None) as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                break
+            if not chunk.endswith('\n'):
+                chunk += f.readline()
+            yield chunk
+
+
+def parse_pair_lines(chunk: str, first_line: int = 1) -> Tuple[List[Pair], int]:
+    """Bir metin parçasındaki sekmeyle ayrılmış çiftleri ayrıştır
+
+    Boş satırlar ve '#' ile başlayan yorumlar atlanır; sekme içermeyen ya da bir
+    tarafı boş olan satırlar reddedilir. (çiftler, reddedilen sayısı) döner.
+    """
+    pairs = []
+    rejected = 0
+    for line_num, line in enumerate(chunk.split('\n'), first_line):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if '\t' not in line:
+            rejected += 1
+            continue
+        parts = line.split('\t')
+        ottoman = parts[0].strip()
+        turkish = parts[1].strip()
+        if ottoman and turkish:
+            pairs.append((ottoman, turkish, line_num))
+        else:
+            rejected += 1
+    return pairs, rejected
+
+
+def _parse_chunk_job(job: Tuple[str, int]) -> Tuple[List[Pair], int]:
+    """Süreç havuzu için sarmalayıcı (modül seviyesinde olmalı)"""
+    return parse_pair_lines(*job)
+
+
+def _numbered_chunks(path: str, encoding: str, chunk_chars: int) -> Iterator[Tuple[str, int]]:
+    """Parçaları başlangıç satır numaralarıyla birlikte üret"""
+    line = 1
+    for chunk in iter_text_chunks(path, encoding, chunk_chars):
+        # Son satır sonu bir sonraki parçanın ilk satırını başlatır
+        text = chunk[:-1] if chunk.endswith('\n') else chunk
+        yield text, line
+        line += chunk.count('\n')
+
+
+def _iter_parsed_chunks(path: str, encoding: str, parallel: bool, workers: Optional[int],
+                        chunk_chars: int) -> Iterator[Tuple[List[Pair], int]]:
+    """Parçaları dosya sırasıyla ayrıştırıp üret
+
+    Paralel yolda aynı anda en fazla 2 * workers parça havuzda bekler; böylece
+    bellekte dosyanın tamamı değil yalnızca birkaç parça bulunur.
+    """
+    jobs = _numbered_chunks(path, encoding, chunk_chars)
+    if not parallel:
+        for text, line in jobs:
+            yield parse_pair_lines(text, line)
+        return
+
+    # Süreç havuzu yalnızca büyük dosyalarda gerekir; içe aktarması pahalıdır
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(_parse_chunk_job, job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_pairs(path: str, encoding: Optional[str] = None, parallel: Optional[bool] = None,
+               workers: Optional[int] = None, dedupe: bool = False,
+               chunk_chars: int = CHUNK_CHARS) -> Tuple[List[Pair], Dict]:
+    """Eşleştirme dosyasını oku: (çiftler, istatistikler)
+
+    encoding: Verilmezse detect_encoding ile tespit edilir
+    parallel: None ise dosya boyutuna göre seçilir (PARALLEL_THRESHOLD)
+    dedupe: True ise birebir tekrarlanan (osmanlıca, türkçe) çiftleri çıkarır;
+            tekrarlar her durumda istatistiklerde sayılır
+    """
+    encoding = encoding or detect_encoding(path)
+    if parallel is None:
+        parallel = os.path.getsize(path) > PARALLEL_THRESHOLD
+
+    pairs = []
+    rejected = 0
+    duplicates = 0
+    seen = set()
+    for chunk_pairs, chunk_rejected in _iter_parsed_chunks(path, encoding, parallel, workers, chunk_chars):
+        rejected += chunk_rejected
+        for pair in chunk_pairs:
+            key = (pair[0], pair[1])
+            if key in seen:
+                duplicates += 1
+                if dedupe:
+                    continue
+            else:
+                seen.add(key)
+            pairs.append(pair)
+
+    stats = {
+        'path': path,
+        'encoding': encoding,
+        'accepted': len(pairs),
+        'rejected': rejected,
+        'duplicates': duplicates
+    }
+    return pairs, stats
+
+
+def format_stats(stats: Dict) -> str:
+    """İstatistikleri tek satırlık özet olarak biçimlendir"""
+    return (f"{os.path.basename(stats['path'])} [{stats['encoding']}]: "
+            f"{stats['accepted']} kabul, {stats['rejected']} red, {stats['duplicates']} tekrar")
+
+
+if __name__ == "__main__":
+    for file_path in sys.argv[1:]:
+        _, file_stats = read_pairs(file_path)
+        print(format_stats(file_stats))
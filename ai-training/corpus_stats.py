@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Derlem Karakter ve N-gram İstatistikleri
+Metinleri UTF-32 kod noktası dizilerine çevirip unigram, bigram ve trigram
+karakter frekanslarını ve kelime uzunluğu dağılımını NumPy ile sayar. Büyük
+girdiler parçalar halinde süreç havuzunda paralel işlenir. Sonuç sıkıştırılmış
+diziler (.npz) olarak saklanır ve aday sıralamada (harf çevirisi, bulanık
+eşleştirme) karakter dil modeli olarak kullanılır.
+"""
+
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Kod noktaları 21 bittir; trigram anahtarı (a << 42 | b << 21 | c) uint64'e sığar
+CODE_BITS = 21
+
+# Metin sınırı; bu sembolü içeren n-gramlar sayılmaz
+TEXT_SEPARATOR = '\n'
+
+# Kelime sınırı (n-gramlara dahil edilir, aday başına ve sonuna eklenir)
+WORD_BOUNDARY = ' '
+
+# Bu kadar karakterin üzerindeki girdiler paralel sayılır
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+
+# Paralel sayımda parça başına karakter sayısı
+CHUNK_CHARS = 2 * 1024 * 1024
+
+# Trigram, bigram ve unigram tahminlerinin ağırlıkları (enterpolasyon)
+INTERPOLATION = (0.6, 0.3, 0.1)
+
+_SEPARATOR_CODE = ord(TEXT_SEPARATOR)
+_BOUNDARY_CODE = ord(WORD_BOUNDARY)
+
+
+def encode_code_points(text: str) -> np.ndarray:
+    """Metni uint32 kod noktası dizisine çevir"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(np.uint64)
+
+
+def arrays_to_npz_bytes(arrays: Dict[str, np.ndarray]) -> bytes:
+    """Dizileri verilen sırayla sıkıştırılmış .npz olarak kodla
+
+    np.savez_compressed zip kayıtlarına o anki zamanı yazar; burada sabit
+    tarih kullanılır ki aynı veri her seferinde aynı baytları üretsin.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, array in arrays.items():
+            info = zipfile.ZipInfo(f'{name}.npy', date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            array_buffer = io.BytesIO()
+            np.lib.format.write_array(array_buffer, array, allow_pickle=False)
+            archive.writestr(info, array_buffer.getvalue())
+    return buffer.getvalue()
+
+
+def lookup_sorted(keys: np.ndarray, counts: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Sıralı anahtar dizisinde toplu arama; bulunmayanlar için 0"""
+    if len(keys) == 0:
+        return np.zeros(len(query), dtype=np.int64)
+    positions = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    return np.where(keys[positions] == query, counts[positions], 0)
+
+
+def _unique_counts(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    keys, counts = np.unique(keys, return_counts=True)
+    return keys, counts.astype(np.int64)
+
+
+def count_ngrams(text: str) -> Dict[str, np.ndarray]:
+    """Tek bir metin parçasındaki n-gram ve kelime uzunluklarını say
+
+    Metinler TEXT_SEPARATOR ile ayrılmış olmalıdır; boşluk karakterleri tek bir
+    WORD_BOUNDARY'ye indirgenmiş kabul edilir.
+    """
+    codes = encode_code_points(text)
+    valid = codes != _SEPARATOR_CODE
+
+    counts = {}
+    counts['unigram_keys'], counts['unigram_counts'] = _unique_counts(codes[valid])
+
+    pair_valid = valid[:-1] & valid[1:]
+    bigrams = (codes[:-1] << CODE_BITS) | codes[1:]
+    counts['bigram_keys'], counts['bigram_counts'] = _unique_counts(bigrams[pair_valid])
+
+    triple_valid = pair_valid[:-1] & valid[2:]
+    trigrams = (codes[:-2] << (2 * CODE_BITS)) | (codes[1:-1] << CODE_BITS) | codes[2:]
+    counts['trigram_keys'], counts['trigram_counts'] = _unique_counts(trigrams[triple_valid])
+
+    # Kelime uzunlukları: ardışık sınırlar arasındaki mesafe
+    boundaries = np.flatnonzero(~valid | (codes == _BOUNDARY_CODE))
+    boundaries = np.concatenate(([-1], boundaries, [len(codes)]))
+    lengths = np.diff(boundaries) - 1
+    counts['word_lengths'] = np.bincount(lengths[lengths > 0]).astype(np.int64)
+    return counts
+
+
+def _merge_sparse(keys: List[np.ndarray], counts: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parçalardan gelen (anahtar, sayı) dizilerini birleştir"""
+    if not keys:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    merged_keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    merged_counts = np.zeros(len(merged_keys), dtype=np.int64)
+    np.add.at(merged_counts, inverse, np.concatenate(counts))
+    return merged_keys, merged_counts
+
+
+def _merge_histograms(histograms: List[np.ndarray]) -> np.ndarray:
+    size = max((len(histogram) for histogram in histograms), default=0)
+    merged = np.zeros(size, dtype=np.int64)
+    for histogram in histograms:
+        merged[:len(histogram)] += histogram
+    return merged
+
+
+def _normalize(text: str) -> str:
+    return WORD_BOUNDARY.join(text.split())
+
+
+def _text_chunks(texts: Iterable[str], chunk_chars: int) -> Iterable[str]:
+    """Metinleri normalleştirip ayraçla birleştirilmiş büyük parçalar halinde üret"""
+    batch = []
+    size = 0
+    for text in texts:
+        text = _normalize(text)
+        if not text:
+            continue
+        batch.append(text)
+        size += len(text) + 1
+        if size >= chunk_chars:
+            yield TEXT_SEPARATOR.join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield TEXT_SEPARATOR.join(batch)
+
+
+class CorpusStatistics:
+    """Karakter n-gram sayıları ve kelime uzunluğu dağılımı
+
+    Anahtarlar sıralı uint64 dizileridir (searchsorted ile arama); bigram ve
+    trigram anahtarları kod noktalarının CODE_BITS bitlik paketlenmesidir.
+    """
+
+    ARRAYS = ('unigram_keys', 'unigram_counts', 'bigram_keys', 'bigram_counts',
+              'trigram_keys', 'trigram_counts', 'word_lengths')
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.total_characters = int(self.unigram_counts.sum())
+        self.vocabulary_size = len(self.unigram_keys)
+
+    # --- Oluşturma -------------------------------------------------------
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], parallel: Optional[bool] = None,
+                   workers: Optional[int] = None, chunk_chars: int = CHUNK_CHARS) -> 'CorpusStatistics':
+        """Metinlerden istatistikleri hesapla
+
+        parallel: None ise toplam boyuta göre seçilir (PARALLEL_THRESHOLD)
+        """
+        chunks = list(_text_chunks(texts, chunk_chars))
+        if parallel is None:
+            parallel = len(chunks) > 1 and sum(len(chunk) for chunk in chunks) > PARALLEL_THRESHOLD
+
+        if parallel:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(count_ngrams, chunks))
+        else:
+            results = [count_ngrams(chunk) for chunk in chunks]
+
+        arrays = {}
+        for order in ('unigram', 'bigram', 'trigram'):
+            arrays[f'{order}_keys'], arrays[f'{order}_counts'] = _merge_sparse(
+                [result[f'{order}_keys'] for result in results],
+                [result[f'{order}_counts'] for result in results]
+            )
+        arrays['word_lengths'] = _merge_histograms([result['word_lengths'] for result in results])
+        return cls(arrays)
+
+    # --- Kaydetme / yükleme ----------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Dizileri sabit tarihli sıkıştırılmış .npz olarak kodla (aynı veri, aynı bayt)"""
+        return arrays_to_npz_bytes({name: getattr(self, name) for name in self.ARRAYS})
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'CorpusStatistics':
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in cls.ARRAYS})
+
+    # --- Sorgular --------------------------------------------------------
+
+    def character_frequencies(self) -> Dict[str, int]:
+        """Karakter -> sayı sözlüğü (kelime sınırı hariç)"""
+        return {
+            chr(int(code)): int(count)
+            for code, count in zip(self.unigram_keys, self.unigram_counts)
+            if code != _BOUNDARY_CODE
+        }
+
+    def top_ngrams(self, order: int, limit: int = 20) -> List[Tuple[str, int]]:
+        """En sık görülen n-gramlar (order: 1, 2 veya 3)"""
+        name = {1: 'unigram', 2: 'bigram', 3: 'trigram'}[order]
+        keys, counts = getattr(self, f'{name}_keys'), getattr(self, f'{name}_counts')
+        top = np.argsort(counts, kind='stable')[::-1][:limit]
+        mask = (1 << CODE_BITS) - 1
+        result = []
+        for index in top:
+            key = int(keys[index])
+            chars = [chr((key >> (CODE_BITS * shift)) & mask) for shift in reversed(range(order))]
+            result.append((''.join(chars), int(counts[index])))
+        return result
+
+    def word_length_distribution(self) -> np.ndarray:
+        """Kelime uzunluğu olasılıkları (indeks = uzunluk)"""
+        total = self.word_lengths.sum()
+        return self.word_lengths / total if total else self.word_lengths.astype(np.float64)
+
+    def score(self, text: str) -> float:
+        """Metnin karakter başına ortalama log-olasılığı (enterpolasyonlu trigram)
+
+        Metin başına ve sonuna kelime sınırı eklenir; değer uzunluktan bağımsız
+        olduğu için farklı uzunluktaki adaylar karşılaştırılabilir.
+        """
+        text = _normalize(text)
+        if not text:
+            return float('-inf')
+
+        codes = encode_code_points(WORD_BOUNDARY * 2 + text + WORD_BOUNDARY)
+        a, b, c = codes[:-2], codes[1:-1], codes[2:]
+
+        trigram = lookup_sorted(self.trigram_keys, self.trigram_counts, (a << (2 * CODE_BITS)) | (b << CODE_BITS) | c)
+        context2 = lookup_sorted(self.bigram_keys, self.bigram_counts, (a << CODE_BITS) | b)
+        bigram = lookup_sorted(self.bigram_keys, self.bigram_counts, (b << CODE_BITS) | c)
+        context1 = lookup_sorted(self.unigram_keys, self.unigram_counts, b)
+        unigram = lookup_sorted(self.unigram_keys, self.unigram_counts, c)
+
+        weight3, weight2, weight1 = INTERPOLATION
+        probability = (
+            weight3 * np.divide(trigram, context2, out=np.zeros(len(c)), where=context2 > 0)
+            + weight2 * np.divide(bigram, context1, out=np.zeros(len(c)), where=context1 > 0)
+            + weight1 * (unigram + 1) / (self.total_characters + self.vocabulary_size + 1)
+        )
+        return float(np.log(probability).mean())
+
+    def rank(self, candidates: Sequence[str]) -> List[Tuple[str, float]]:
+        """Adayları dil modeli skoruna göre (en olası önce) sırala"""
+        scored = [(candidate, self.score(candidate)) for candidate in candidates]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def summary(self) -> Dict:
+        distribution = self.word_length_distribution()
+        return {
+            'total_characters': self.total_characters,
+            'unique_characters': self.vocabulary_size,
+            'unique_bigrams': len(self.bigram_keys),
+            'unique_trigrams': len(self.trigram_keys),
+            'words': int(self.word_lengths.sum()),
+            'mean_word_length': float((np.arange(len(distribution)) * distribution).sum())
+        }
+
+
+def build_pair_statistics(pairs: Iterable, parallel: Optional[bool] = None,
+                          workers: Optional[int] = None) -> Tuple[CorpusStatistics, CorpusStatistics]:
+    """Çeviri çiftlerinden (osmanlıca, türkçe) tarafları için istatistik hesapla
+
+    Çiftler corpus_io tuple'ları ya da 'ottoman'/'turkish' anahtarlı sözlükler olabilir.
+    """
+    ottoman_texts = []
+    turkish_texts = []
+    for pair in pairs:
+        if isinstance(pair, dict):
+            ottoman_texts.append(pair['ottoman'])
+            turkish_texts.append(pair['turkish'])
+        else:
+            ottoman_texts.append(pair[0])
+            turkish_texts.append(pair[1])
+
+    return (CorpusStatistics.from_texts(ottoman_texts, parallel=parallel, workers=workers),
+            CorpusStatistics.from_texts(turkish_texts, parallel=parallel, workers=workers))
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from corpus_io import read_pairs
+
+    parser = argparse.ArgumentParser(description="Eşleştirme dosyalarından karakter n-gram istatistikleri çıkar")
+    parser.add_argument('paths', nargs='+', help="Sekmeyle ayrılmış eşleştirme dosyaları")
+    parser.add_argument('--output-dir', help="corpus_stats_ottoman.npz / corpus_stats_turkish.npz klasörü")
+    parser.add_argument('--workers', type=int, help="Paralel sayım için süreç sayısı")
+    args = parser.parse_args()
+
+    all_pairs = []
+    for file_path in args.paths:
+        file_pairs, _ = read_pairs(file_path)
+        all_pairs.extend(file_pairs)
+
+    ottoman_stats, turkish_stats = build_pair_statistics(all_pairs, workers=args.workers)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        ottoman_stats.save(os.path.join(args.output_dir, 'corpus_stats_ottoman.npz'))
+        turkish_stats.save(os.path.join(args.output_dir, 'corpus_stats_turkish.npz'))
+
+    print(json.dumps({
+        'ottoman': dict(ottoman_stats.summary(), top_bigrams=ottoman_stats.top_ngrams(2, 10)),
+        'turkish': dict(turkish_stats.summary(), top_bigrams=turkish_stats.top_ngrams(2, 10))
+    }, ensure_ascii=False, indent=2))
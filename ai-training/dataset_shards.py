@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parçalı (Shard) Eğitim Veri Seti
+İşlenmiş kayıtları sabit boyutlu JSONL parçalarına böler. Kayıtlar tohumlu
+(seed) olarak karıştırılır, eğitim/doğrulama ayrımı anahtarın özetinden
+belirlenir ve index.json her parçanın kayıt ofsetini, kayıt sayısını, boyutunu
+ve özetini tutar. Eğitim tarafı parçaları tüm veriyi belleğe almadan, gerekirse
+işçiler arasında paylaştırarak akışla okuyabilir.
+"""
+
+import hashlib
+import json
+import os
+import random
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pair_store import encode_pairs_jsonl
+
+INDEX_VERSION = 1
+INDEX_FILE = 'index.json'
+
+DEFAULT_SHARD_SIZE = 10000
+DEFAULT_SEED = 42
+DEFAULT_VAL_FRACTION = 0.05
+
+SPLITS = ('train', 'val')
+
+# Ayrım özetinin çözünürlüğü (val_fraction bu adımlarla yuvarlanır)
+_SPLIT_BUCKETS = 10000
+
+
+def assign_split(key: str, val_fraction: float) -> str:
+    """Kaydı anahtarının özetine göre eğitim ya da doğrulama kümesine ata
+
+    Atama karıştırmadan ve derlemin büyüklüğünden bağımsızdır: aynı kelime
+    derlem büyüse de hep aynı kümede kalır, iki kümeye birden düşmez.
+    """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    bucket = int.from_bytes(digest, 'little') % _SPLIT_BUCKETS
+    return 'val' if bucket < val_fraction * _SPLIT_BUCKETS else 'train'
+
+
+def split_and_shuffle(records: List[Dict], seed: int = DEFAULT_SEED,
+                      val_fraction: float = DEFAULT_VAL_FRACTION,
+                      key: Callable[[Dict], str] = lambda record: record['ottoman']) -> Dict[str, List[Dict]]:
+    """Kayıtları kümelere ayır ve her kümeyi tohumlu olarak karıştır"""
+    splits = {split: [] for split in SPLITS}
+    for record in records:
+        splits[assign_split(key(record), val_fraction)].append(record)
+
+    for index, split in enumerate(SPLITS):
+        # Her küme kendi türetilmiş tohumuyla karışır; biri değişince diğeri etkilenmez
+        random.Random(seed * len(SPLITS) + index).shuffle(splits[split])
+    return splits
+
+
+def encode_shards(records: List[Dict], shard_size: int = DEFAULT_SHARD_SIZE, seed: int = DEFAULT_SEED,
+                  val_fraction: float = DEFAULT_VAL_FRACTION,
+                  key: Callable[[Dict], str] = lambda record: record['ottoman']) -> Tuple[Dict[str, bytes], Dict]:
+    """Kayıtları parçalara kodla: ({göreli yol: içerik}, index)
+
+    Dosyalar diske yazılmadan döner; çağıran taraf (ör. artımlı derleme)
+    içeriği değişmeyen parçaları yeniden yazmayabilir.
+    """
+    if shard_size <= 0:
+        raise ValueError("Parça boyutu pozitif olmalı")
+
+    files = {}
+    index = {
+        'version': INDEX_VERSION,
+        'format': 'jsonl',
+        'seed': seed,
+        'shard_size': shard_size,
+        'val_fraction': val_fraction,
+        'total_records': len(records),
+        'splits': {}
+    }
+
+    for split, split_records in split_and_shuffle(records, seed, val_fraction, key).items():
+        shards = []
+        for offset in range(0, len(split_records), shard_size):
+            path = f"{split}/shard-{len(shards):05d}.jsonl"
+            data = encode_pairs_jsonl(split_records[offset:offset + shard_size])
+            files[path] = data
+            shards.append({
+                'path': path,
+                'offset': offset,
+                'records': min(shard_size, len(split_records) - offset),
+                'bytes': len(data),
+                'sha256': hashlib.sha256(data).hexdigest()
+            })
+        index['splits'][split] = {'records': len(split_records), 'shards': shards}
+
+    return files, index
+
+
+def encode_index(index: Dict) -> bytes:
+    return json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def write_shards(output_dir: str, records: List[Dict], shard_size: int = DEFAULT_SHARD_SIZE,
+                 seed: int = DEFAULT_SEED, val_fraction: float = DEFAULT_VAL_FRACTION) -> Dict:
+    """Parçaları ve index.json'ı klasöre yaz; önceki derlemeden kalan parçaları sil"""
+    files, index = encode_shards(records, shard_size, seed, val_fraction)
+
+    for split in SPLITS:
+        split_dir = os.path.join(output_dir, split)
+        if os.path.isdir(split_dir):
+            for name in os.listdir(split_dir):
+                if name.startswith('shard-') and f"{split}/{name}" not in files:
+                    os.remove(os.path.join(split_dir, name))
+
+    for path, data in files.items():
+        full_path = os.path.join(output_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as f:
+            f.write(data)
+
+    with open(os.path.join(output_dir, INDEX_FILE), 'wb') as f:
+        f.write(encode_index(index))
+    return index
+
+
+def load_index(dataset_dir: str) -> Dict:
+    with open(os.path.join(dataset_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f"Desteklenmeyen index sürümü: {index.get('version')}")
+    return index
+
+
+def shards_for_worker(index: Dict, split: str = 'train', worker: int = 0, num_workers: int = 1) -> List[Dict]:
+    """İşçiye düşen parçalar (parçalar işçiler arasında sırayla dağıtılır)"""
+    if not 0 <= worker < num_workers:
+        raise ValueError(f"Geçersiz işçi numarası: {worker}/{num_workers}")
+    return index['splits'].get(split, {}).get('shards', [])[worker::num_workers]
+
+
+def iter_shard_records(dataset_dir: str, split: str = 'train', worker: int = 0,
+                       num_workers: int = 1, index: Optional[Dict] = None) -> Iterator[Dict]:
+    """İşçiye düşen parçalardaki kayıtları akışla oku"""
+    index = index or load_index(dataset_dir)
+    for shard in shards_for_worker(index, split, worker, num_workers):
+        with open(os.path.join(dataset_dir, shard['path']), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _load_records(path: str) -> Iterable[Dict]:
+    """İşlenmiş çift dosyasını (.json, .jsonl, .bin ya da ham .txt) oku"""
+    if path.endswith('.bin'):
+        from pair_store import PairStore
+        with PairStore(path) as store:
+            return list(store)
+    if path.endswith('.jsonl'):
+        from pair_store import iter_pairs_jsonl
+        return list(iter_pairs_jsonl(path))
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['data']
+
+    from corpus_io import read_pairs
+    pairs, _ = read_pairs(path)
+    source = os.path.basename(path)
+    return [{'ottoman': ottoman, 'turkish': turkish, 'source': source, 'line': line}
+            for ottoman, turkish, line in pairs]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Çeviri çiftlerini karıştırılmış eğitim/doğrulama parçalarına böl")
+    parser.add_argument('input', help="translation_pairs.json/.jsonl/.bin ya da sekmeyle ayrılmış .txt")
+    parser.add_argument('output_dir', help="Parçaların ve index.json'ın yazılacağı klasör")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="Parça başına kayıt")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Karıştırma tohumu")
+    parser.add_argument('--val-fraction', type=float, default=DEFAULT_VAL_FRACTION, help="Doğrulama oranı")
+    args = parser.parse_args()
+
+    written = write_shards(args.output_dir, list(_load_records(args.input)),
+                           args.shard_size, args.seed, args.val_fraction)
+    for split_name, split_info in written['splits'].items():
+        print(f"✅ {split_name}: {split_info['records']} kayıt, {len(split_info['shards'])} parça")
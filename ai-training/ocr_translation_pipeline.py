@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Süreç İçi OCR → Çeviri Hattı
+Tesseract OCR ile bulunan her bölgenin metnini, önceden yüklenmiş tek bir
+AdvancedOttomanTranslator örneğiyle toplu olarak çevirir. İkinci bir Python
+süreci başlatılmaz; her çevrilmiş parça kendi sınırlayıcı kutusuyla döner.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+import page_hash
+import profiling
+from advanced_ottoman_translator import AdvancedOttomanTranslator
+from tesseract_ottoman_ocr import PROCESSING_MODES, ImageSource, TesseractOttomanOCR, build_cache, build_page_index
+
+
+class OCRTranslationPipeline:
+    """OCR ve çeviriyi tek süreçte, paylaşılan çevirmenle çalıştıran hat"""
+
+    def __init__(self, ocr: Optional[TesseractOttomanOCR] = None,
+                 translator: Optional[AdvancedOttomanTranslator] = None,
+                 page_index: Optional[page_hash.PageIndex] = None):
+        """Hat başlatıcı
+
+        ocr / translator verilmezse varsayılan örnekler oluşturulur. Çevirmen
+        tabloları bir kez yüklenir ve hattın tüm çağrılarında yeniden kullanılır.
+        page_index: Verilirse yakın kopya sayfalarda OCR ve çeviri sonucu birlikte
+                    yeniden kullanılır
+        """
+        self.ocr = ocr or TesseractOttomanOCR()
+        self.translator = translator or AdvancedOttomanTranslator()
+        self.page_index = page_index
+
+    @profiling.profiled('ocr_translation')
+    def process(self, source: ImageSource, mode: str = 'regions', use_cache: bool = True,
+                page_label: Optional[str] = None) -> Dict:
+        """Görüntüyü OCR'la, bölge metinlerini toplu çevir ve birleştir"""
+        if self.page_index is None:
+            return self._process(source, mode, use_cache)
+        if page_label is None and isinstance(source, str):
+            page_label = os.path.basename(source)
+        return self.page_index.process(
+            source, lambda: self._process(source, mode, use_cache),
+            label=page_label, signature='translation|' + self.ocr.settings_signature(mode)
+        )
+
+    def _process(self, source: ImageSource, mode: str, use_cache: bool) -> Dict:
+        start_time = time.time()
+
+        result = self.ocr.process_image(source, use_cache=use_cache, mode=mode)
+        if not result.get("success"):
+            return result
+
+        ocr_time = time.time() - start_time
+
+        # Bölge metinlerini temizleyip tek toplu çağrıda çevir
+        segments = result.get("segments", [])
+        texts = [self.ocr.clean_ottoman_text(segment["text"]) for segment in segments]
+        translations = self.translator.translate_batch(texts)
+
+        translated_segments = []
+        for segment, text, translation in zip(segments, texts, translations):
+            if not text:
+                continue
+            translated_segments.append({
+                "bbox": segment["bbox"],
+                "ottoman_text": text,
+                "turkish_text": translation.get("turkish_text", ""),
+                "ocr_confidence": segment["confidence"],
+                "translation_confidence": translation.get("confidence", 0.0)
+            })
+
+        translation_confidences = [segment["translation_confidence"] for segment in translated_segments]
+
+        result = dict(result)
+        result.update({
+            "translated_text": ' '.join(segment["turkish_text"] for segment in translated_segments),
+            "translation_confidence": (sum(translation_confidences) / len(translation_confidences)
+                                       if translation_confidences else 0.0),
+            "segments": translated_segments,
+            "ocr_time": ocr_time,
+            "translation_time": time.time() - start_time - ocr_time,
+            "processing_time": time.time() - start_time,
+            "translation_method": "advanced_character_based",
+            "timestamp": time.time()
+        })
+        return result
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Osmanlıca OCR ve çeviri hattı")
+    parser.add_argument('image_path', nargs='?', help="İşlenecek görüntü dosyası ('-' ise stdin'den okunur)")
+    parser.add_argument('--stdin', action='store_true', help="Görüntü baytlarını stdin'den oku")
+    parser.add_argument('--mode', choices=PROCESSING_MODES, default='regions', help="OCR işlem modu")
+    parser.add_argument('--no-cache', action='store_true', help="OCR önbelleğini atla")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: ai-training/cache)")
+    parser.add_argument('--cache-max-mb', type=int, default=256, help="Önbellek boyut sınırı (MB)")
+    parser.add_argument('--import-profile', action='store_true',
+                        help="İçe aktarma süreleri ve ertelenen modüllerle başlangıç raporu yazdır")
+    page_hash.add_cli_arguments(parser)
+    profiling.add_cli_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure_from_args(args)
+
+    if args.import_profile and not args.image_path and not args.stdin:
+        from startup import startup_report
+        print(json.dumps(startup_report('ocr_translation_pipeline'), ensure_ascii=False, indent=2))
+        return
+
+    if args.stdin or args.image_path == '-':
+        source = sys.stdin.buffer.read()
+    elif args.image_path and os.path.exists(args.image_path):
+        source = args.image_path
+    else:
+        print(json.dumps({
+            "success": False,
+            "error": "Kullanım: python ocr_translation_pipeline.py <image_path | ->"
+        }))
+        sys.exit(1)
+
+    init_start = time.perf_counter()
+    pipeline = OCRTranslationPipeline(ocr=TesseractOttomanOCR(cache=build_cache(args)),
+                                      page_index=build_page_index(args))
+    call_start = time.perf_counter()
+    result = pipeline.process(source, mode=args.mode, page_label=args.page_label)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.import_profile:
+        # Rapor stderr'e yazılır; stdout yalnızca sonucu içerir
+        from startup import print_startup_report, startup_report
+        print_startup_report(startup_report('ocr_translation_pipeline', {
+            'init': (call_start - init_start) * 1000,
+            'first_call': (time.perf_counter() - call_start) * 1000
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sıcak OCR İşçisi
+Her yüklemede yeni bir yorumlayıcı açmak, cv2/numpy/pytesseract'ı içe aktarmak,
+TesseractOttomanOCR'ı kurmak ve tesseract ikilisini aramak yerine bu maliyetler
+işçi başına bir kez ödenir. İşler stdin/stdout ya da yerel soket (TCP veya Unix)
+üzerinden satır başına bir JSON olarak alınır, sınırlı sayıda iş parçacığında
+çalıştırılır ve process_image ile aynı biçimde döner:
+
+    {"id": 1, "op": "ocr", "image_path": "sayfa.png", "mode": "regions"}
+    {"id": 2, "op": "ocr", "image_b64": "...", "use_cache": false}
+    {"id": 3, "op": "translate", "text": "..."}
+    {"id": 4, "op": "health"}            # kuyruk derinliği ve sayaçlar
+    -> {"id": 1, "success": true, "extracted_text": ..., ...}
+
+Protokol scripts/load_test.py'nin stdio/tcp hedefleriyle aynıdır. pytesseract
+her çağrıda tesseract ikilisini çalıştırır; ısınma çağrısı ikiliyi ve tessdata
+dosyalarını işletim sistemi önbelleğine alır.
+"""
+
+import argparse
+import base64
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import page_hash
+from tesseract_ottoman_ocr import PROCESSING_MODES, TesseractOttomanOCR, build_cache, build_page_index, cv2, np, pytesseract
+
+# İstek başına değiştirilebilen OCR ayarları (her işte varsayılana döner)
+OCR_OPTIONS = ('tile_size', 'tile_overlap', 'confidence_threshold', 'cascade_max_side',
+               'preprocess_preset', 'binarization_window', 'binarization_k')
+
+DEFAULT_MAX_QUEUE = 64
+
+Responder = Callable[[Dict], None]
+
+# Kuyruğu kapatma işareti
+_STOP = object()
+
+
+class OCRWorker:
+    """Isıtılmış OCR motorlarıyla sınırlı eşzamanlılıkta iş çalıştıran havuz
+
+    Her iş parçacığının kendi TesseractOttomanOCR örneği (ve önbellek
+    bağlantısı) vardır; örnekler başlangıçta kurulur. Kuyruk doluysa yeni iş
+    beklemeden reddedilir (geri basınç).
+    """
+
+    def __init__(self, concurrency: int = 2, max_queue: int = DEFAULT_MAX_QUEUE,
+                 cache_factory: Optional[Callable] = None, default_mode: str = 'regions',
+                 page_index: Optional[page_hash.PageIndex] = None):
+        self.concurrency = max(int(concurrency), 1)
+        self.max_queue = max(int(max_queue), 1)
+        self.cache_factory = cache_factory
+        self.default_mode = default_mode
+        # Tüm iş parçacıkları aynı sayfa dizinini paylaşır (PageIndex kendi kilidini tutar)
+        self.page_index = page_index
+        self.started_at = time.time()
+        self.warmup: Dict = {}
+
+        self._jobs: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._counters = {'completed': 0, 'failed': 0, 'rejected': 0, 'in_flight': 0}
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._local = threading.local()
+        self._threads: List[threading.Thread] = []
+
+    # --- Başlatma --------------------------------------------------------
+
+    def warm_up(self) -> Dict:
+        """Ağır modülleri yükle, tesseract'ı bul ve boş bir görüntüyle ısıt"""
+        timings = {}
+        start = time.perf_counter()
+        cv2.__version__, np.__version__, pytesseract.__name__
+        timings['imports_ms'] = (time.perf_counter() - start) * 1000
+
+        ocr = TesseractOttomanOCR()
+        start = time.perf_counter()
+        try:
+            timings['tesseract_version'] = str(pytesseract.get_tesseract_version())
+            pytesseract.image_to_string(np.full((32, 96), 255, dtype=np.uint8),
+                                        lang=ocr.tesseract_lang, config=ocr.tesseract_config)
+        except Exception as e:
+            timings['tesseract_error'] = str(e)
+            print(f"⚠️ Tesseract ısıtılamadı: {e}", file=sys.stderr)
+        timings['tesseract_ms'] = (time.perf_counter() - start) * 1000
+        self.warmup = timings
+        return timings
+
+    def start(self):
+        """Isıtmayı yap ve iş parçacıklarını (motorlarıyla birlikte) başlat"""
+        self.warm_up()
+        ready = threading.Barrier(self.concurrency + 1)
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._run, args=(ready,), name=f"ocr-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        ready.wait()
+        print(f"🔥 OCR işçisi hazır: {self.concurrency} iş parçacığı, kuyruk {self.max_queue} "
+              f"(içe aktarma {self.warmup['imports_ms']:.0f} ms, tesseract {self.warmup['tesseract_ms']:.0f} ms)",
+              file=sys.stderr)
+
+    def close(self):
+        """Kuyruktaki işleri bitir ve iş parçacıklarını durdur"""
+        for _ in self._threads:
+            self._jobs.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # --- İş kabulü -------------------------------------------------------
+
+    def submit(self, request: Dict, respond: Responder):
+        """İsteği kuyruğa al; health/stats hemen yanıtlanır, kuyruk doluysa reddedilir"""
+        op = request.get('op', 'ocr')
+        if op in ('health', 'stats'):
+            respond({'id': request.get('id'), 'success': True, 'status': 'ok', **self.stats()})
+            return
+        if op not in ('ocr', 'translate'):
+            respond({'id': request.get('id'), 'success': False, 'error': f"Bilinmeyen işlem: {op}"})
+            return
+
+        try:
+            self._jobs.put_nowait((request, respond, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self._counters['rejected'] += 1
+            respond({'id': request.get('id'), 'success': False,
+                     'error': f"Kuyruk dolu ({self.max_queue} iş bekliyor)", 'retry': True})
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            finished = counters['completed'] + counters['failed']
+            busy, wait = self._busy_seconds, self._wait_seconds
+        uptime = time.time() - self.started_at
+        return {
+            'pid': os.getpid(),
+            'uptime': uptime,
+            'concurrency': self.concurrency,
+            'queue_depth': self._jobs.qsize(),
+            'max_queue': self.max_queue,
+            **counters,
+            'mean_run_ms': busy / finished * 1000 if finished else None,
+            'mean_wait_ms': wait / finished * 1000 if finished else None,
+            'utilization': busy / (uptime * self.concurrency) if uptime > 0 else 0.0,
+            'warmup': self.warmup,
+            **({'page_index': self.page_index.stats()} if self.page_index is not None else {})
+        }
+
+    # --- Çalıştırma ------------------------------------------------------
+
+    def _engine(self) -> TesseractOttomanOCR:
+        ocr = getattr(self._local, 'ocr', None)
+        if ocr is None:
+            ocr = TesseractOttomanOCR(cache=self.cache_factory() if self.cache_factory else None,
+                                      page_index=self.page_index)
+            self._local.ocr = ocr
+            self._local.defaults = {name: getattr(ocr, name) for name in OCR_OPTIONS}
+        return ocr
+
+    def _translator(self):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            from advanced_ottoman_translator import AdvancedOttomanTranslator
+            translator = AdvancedOttomanTranslator()
+            self._local.translator = translator
+        return translator
+
+    def _run(self, ready: threading.Barrier):
+        self._engine()
+        ready.wait()
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            request, respond, queued_at = job
+            started = time.perf_counter()
+            with self._lock:
+                self._counters['in_flight'] += 1
+            try:
+                response = self.handle(request)
+            except Exception as e:
+                response = {'success': False, 'error': str(e), 'timestamp': time.time()}
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._counters['in_flight'] -= 1
+                self._counters['completed' if response.get('success') else 'failed'] += 1
+                self._busy_seconds += finished - started
+                self._wait_seconds += started - queued_at
+            response = {'id': request.get('id'), **response}
+            try:
+                respond(response)
+            except OSError as e:
+                # İstemci bağlantıyı kapatmış olabilir; işçi çalışmaya devam eder
+                print(f"⚠️ Yanıt gönderilemedi: {e}", file=sys.stderr)
+
+    def handle(self, request: Dict) -> Dict:
+        """Tek bir işi bu iş parçacığının motoruyla çalıştır"""
+        if request.get('op') == 'translate':
+            result = self._translator().translate_text(request.get('text', ''))
+            return {
+                'success': bool(result.get('success')),
+                'turkish_text': result.get('turkish_text', ''),
+                'confidence': result.get('confidence', 0.0),
+                'method_used': result.get('method', 'advanced_character_based'),
+                **({'error': result['error']} if 'error' in result else {})
+            }
+
+        if 'image_b64' in request:
+            source = base64.b64decode(request['image_b64'])
+        elif 'image_path' in request:
+            source = request['image_path']
+            if not os.path.exists(source):
+                return {'success': False, 'error': f"Görüntü dosyası bulunamadı: {source}", 'timestamp': time.time()}
+        else:
+            return {'success': False, 'error': "image_path ya da image_b64 gerekli", 'timestamp': time.time()}
+
+        ocr = self._engine()
+        for name, default in self._local.defaults.items():
+            setattr(ocr, name, request.get(name, default))
+        mode = request.get('mode', self.default_mode)
+        return ocr.process_image(source, use_cache=request.get('use_cache', True), mode=mode,
+                                 page_label=request.get('page_label'))
+
+
+def serve_stdio(worker: OCRWorker):
+    """stdin'den istek satırları oku, yanıtları stdout'a yaz (EOF'ta işleri bitirip çık)"""
+    output = sys.stdout
+    # Kütüphanelerin print çıktıları protokol satırlarına karışmasın
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+
+    def respond(response: Dict):
+        line = json.dumps(response, ensure_ascii=False)
+        with write_lock:
+            output.write(line + '\n')
+            output.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            respond({'id': None, 'success': False, 'error': f"Geçersiz JSON: {e}"})
+            continue
+        worker.submit(request, respond)
+    worker.close()
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    """Bağlantı başına satır satır istek okuyan işleyici (yanıtlar sırasız olabilir)"""
+
+    def handle(self):
+        write_lock = threading.Lock()
+
+        def respond(response: Dict):
+            data = (json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8')
+            with write_lock:
+                self.wfile.write(data)
+                self.wfile.flush()
+
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            try:
+                request = json.loads(raw)
+            except json.JSONDecodeError as e:
+                respond({'id': None, 'success': False, 'error': f"Geçersiz JSON: {e}"})
+                continue
+            self.server.worker.submit(request, respond)
+
+
+def serve_socket(worker: OCRWorker, host: str = '127.0.0.1', port: Optional[int] = None,
+                 unix_path: Optional[str] = None):
+    """TCP (host:port) ya da Unix soketinde istekleri dinle"""
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        server_class = socketserver.ThreadingUnixStreamServer
+        address = unix_path
+    else:
+        server_class = socketserver.ThreadingTCPServer
+        server_class.allow_reuse_address = True
+        address = (host, port)
+
+    server_class.daemon_threads = True
+    with server_class(address, _ConnectionHandler) as server:
+        server.worker = worker
+        print(f"🚀 OCR işçisi dinliyor: {unix_path or f'{host}:{port}'}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.close()
+            if unix_path and os.path.exists(unix_path):
+                os.unlink(unix_path)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Isıtılmış motorlarla uzun ömürlü OCR işçisi")
+    parser.add_argument('--port', type=int, help="TCP portu (verilmezse stdin/stdout kullanılır)")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP adresi")
+    parser.add_argument('--unix', help="Unix soket yolu")
+    parser.add_argument('--concurrency', type=int, default=min(4, os.cpu_count() or 1),
+                        help="Aynı anda çalışan OCR işi sayısı")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Bekleyebilecek en fazla iş (dolunca yeni işler reddedilir)")
+    parser.add_argument('--mode', choices=PROCESSING_MODES, default='regions', help="Varsayılan işlem modu")
+    parser.add_argument('--no-cache', action='store_true', help="Sonuç önbelleğini atla")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: ai-training/cache)")
+    parser.add_argument('--cache-max-mb', type=int, default=256, help="Önbellek boyut sınırı (MB)")
+    page_hash.add_cli_arguments(parser)
+    args = parser.parse_args(argv)
+
+    worker = OCRWorker(args.concurrency, args.max_queue, cache_factory=lambda: build_cache(args),
+                       default_mode=args.mode, page_index=build_page_index(args))
+    worker.start()
+
+    if args.port or args.unix:
+        serve_socket(worker, args.host, args.port, args.unix)
+    else:
+        serve_stdio(worker)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Algısal Sayfa Özeti ve Yakın Kopya Tespiti
+Taranmış ciltlerde aynı sayfanın yeniden çekimleri yalnızca sıkıştırma ya da
+hafif kırpma farkı taşır; bayt özeti (sha256) bunları yakalayamaz. Küçültülmüş
+gri görüntüden dHash (komşu piksel farkları) ya da pHash (DCT düşük frekansları)
+hesaplanır ve sayfalar Hamming uzaklığına göre BK-ağacında aranır. Yeni sayfa
+işlenmiş bir sayfaya verilen uzaklık içindeyse tam OCR/çeviri yerine önceki
+sonuç kullanılır ('reuse') ya da sonuç yakın kopya olarak işaretlenir ('flag').
+
+Dizin isteğe bağlı olarak SQLite'ta kalıcıdır; böylece istek başına süreç
+başlatan route'lar da aynı cildin sayfalarını çağrılar arasında eşleştirir.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from startup import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+HASH_METHODS = ('dhash', 'phash')
+DUPLICATE_ACTIONS = ('reuse', 'flag')
+
+# Kenar başına bit sayısı: 16 -> 256 bitlik özet. Aynı düzendeki farklı metin
+# sayfalarını ayırmak için 8x8'den daha fazla ayrıntı gerekir. Sentetik
+# sayfalarda farklı sayfalar arası pHash uzaklığı >= 52, JPEG yeniden
+# sıkıştırma ve %1-3 kırpmada ortalama ~22 (en çok ~50) ölçüldü; varsayılan
+# eşik yanlış eşleşmeye karşı temkinli seçildi. dHash açık zeminli metin
+# sayfalarında gürültüye duyarlıdır.
+DEFAULT_METHOD = 'phash'
+DEFAULT_HASH_SIZE = 16
+DEFAULT_MAX_DISTANCE = 40
+
+# Dizin sınırı: her kayıt tam OCR/çeviri sonucunu taşır, süresiz büyümemeli
+DEFAULT_MAX_PAGES = 20000
+
+# Eşleşen sayfanın son kullanım zamanı en fazla bu sıklıkta güncellenir
+ACCESS_REFRESH_SECONDS = 60.0
+
+# Özet için görüntü 1/4 ölçekte çözülür (tam çözme gerekmez)
+REDUCED_READ = 'IMREAD_REDUCED_GRAYSCALE_4'
+
+
+def load_gray(source) -> Optional['np.ndarray']:
+    """Kaynağı özet için küçültülmüş gri görüntü olarak yükle"""
+    if isinstance(source, str):
+        return cv2.imread(source, getattr(cv2, REDUCED_READ))
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buffer = np.frombuffer(source, dtype=np.uint8)
+        return cv2.imdecode(buffer, getattr(cv2, REDUCED_READ)) if buffer.size else None
+    if source.ndim == 1:
+        return cv2.imdecode(source.astype(np.uint8, copy=False), getattr(cv2, REDUCED_READ))
+    if source.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if source.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(source, code)
+    return source
+
+
+def _bits_to_int(bits: 'np.ndarray') -> int:
+    return int.from_bytes(np.packbits(bits.astype(np.uint8).ravel()).tobytes(), 'big')
+
+
+def dhash(gray: 'np.ndarray', size: int = DEFAULT_HASH_SIZE) -> int:
+    """Yatay komşu farkı özeti (size x size bit)"""
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray: 'np.ndarray', size: int = DEFAULT_HASH_SIZE) -> int:
+    """DCT düşük frekans özeti (size x size bit, DC hariç medyana göre)"""
+    small = cv2.resize(gray, (size * 4, size * 4), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:size, :size]
+    median = np.median(low.ravel()[1:])
+    return _bits_to_int(low > median)
+
+
+def perceptual_hash(source, method: str = DEFAULT_METHOD, size: int = DEFAULT_HASH_SIZE) -> Optional[int]:
+    """Kaynağın algısal özeti; görüntü çözülemezse None"""
+    if method not in HASH_METHODS:
+        raise ValueError(f"Bilinmeyen özet yöntemi: {method}")
+    gray = load_gray(source)
+    if gray is None or gray.size == 0:
+        return None
+    return dhash(gray, size) if method == 'dhash' else phash(gray, size)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Hamming uzaklığıyla yakın özet araması için BK-ağacı
+
+    Her düğümün çocukları düğüme olan uzaklığa göre tutulur; üçgen eşitsizliği
+    sayesinde sorguda yalnızca |d - r| ... d + r aralığındaki dallar gezilir.
+    """
+
+    def __init__(self):
+        self._root: Optional[list] = None  # [özet, değerler, {uzaklık: çocuk}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, value):
+        self._size += 1
+        if self._root is None:
+            self._root = [key, [value], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(key, node[0])
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, [value], {}]
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, object]]:
+        """Uzaklığı max_distance'ı aşmayan (uzaklık, değer) çiftleri, yakından uzağa"""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(key, node[0])
+            if distance <= max_distance:
+                found.extend((distance, value) for value in node[1])
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node[2].items() if low <= edge <= high)
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+class PageIndex:
+    """İşlenmiş sayfaların algısal özet dizini ve sonuçları
+
+    db_path verilirse kayıtlar SQLite'ta tutulur ve süreçler arasında paylaşılır;
+    açılışta yalnızca özetler ağaca yüklenir, sonuç eşleşme olunca okunur.
+    Dizin en çok max_pages sayfa tutar: sınır aşılınca en uzun süredir
+    eşleşmeyen sayfalar, ttl verildiyse süresi dolanlar da silinir.
+    Aynı örnek birden fazla iş parçacığından kullanılabilir.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, action: str = 'reuse',
+                 method: str = DEFAULT_METHOD, size: int = DEFAULT_HASH_SIZE, db_path: Optional[str] = None,
+                 max_pages: int = DEFAULT_MAX_PAGES, ttl: Optional[float] = None):
+        if action not in DUPLICATE_ACTIONS:
+            raise ValueError(f"Bilinmeyen yakın kopya davranışı: {action}")
+        if method not in HASH_METHODS:
+            raise ValueError(f"Bilinmeyen özet yöntemi: {method}")
+        if max_pages < 1:
+            raise ValueError("Sayfa dizini en az bir sayfa tutmalı")
+        self.max_distance = max_distance
+        self.action = action
+        self.method = method
+        self.size = size
+        self.db_path = db_path
+        self.max_pages = max_pages
+        self.ttl = ttl
+
+        self._tree = BKTree()
+        # Bellek içi dizin: satır -> (oluşturma zamanı, özet, imza, ad, sonuç), en eski erişilen başta
+        self._results: 'OrderedDict[int, Tuple[float, int, str, Optional[str], Dict]]' = OrderedDict()
+        self._next_rowid = 1
+        self._lock = threading.Lock()
+        self._conn = None
+        self._loaded_rowid = 0
+        # Ağaçta kalan ama silinmiş satırlar; çoğalınca ağaç yeniden kurulur
+        self._stale = 0
+        self.stats_counters = {'lookups': 0, 'duplicates': 0, 'added': 0, 'pruned': 0}
+
+    # --- Kalıcılık -------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "id INTEGER PRIMARY KEY, method TEXT NOT NULL, hash TEXT NOT NULL, "
+                "signature TEXT NOT NULL, label TEXT, result TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_used REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(pages)")}
+            if 'last_used' not in columns:
+                # Sınırsız sürümde oluşturulmuş dizinler: son kullanım oluşturma zamanından başlar
+                try:
+                    with conn:
+                        conn.execute("ALTER TABLE pages ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+                        conn.execute("UPDATE pages SET last_used = created_at")
+                except sqlite3.OperationalError:
+                    pass  # Başka süreç aynı anda ekledi
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)")
+            self._conn = conn
+        return self._conn
+
+    def _refresh(self):
+        """Başka süreçlerin eklediği özetleri ağaca al"""
+        if self._stale > max(len(self._tree) // 4, 64):
+            self._rebuild()
+        if self.db_path is None:
+            return
+        rows = self._connect().execute(
+            "SELECT id, hash, signature, label FROM pages WHERE id > ? AND method = ? ORDER BY id",
+            (self._loaded_rowid, f"{self.method}:{self.size}")
+        ).fetchall()
+        for rowid, digest, signature, label in rows:
+            self._tree.add(int(digest, 16), (rowid, signature, label))
+            self._loaded_rowid = rowid
+
+    def _rebuild(self):
+        """BK-ağacı silmeyi desteklemez: ağacı yalnızca kalan satırlardan yeniden kur"""
+        self._tree = BKTree()
+        self._loaded_rowid = 0
+        self._stale = 0
+        for rowid, (_, digest, signature, label, _) in self._results.items():
+            self._tree.add(digest, (rowid, signature, label))
+
+    def _record_pruned(self, removed: int):
+        self.stats_counters['pruned'] += removed
+        self._stale += removed
+
+    def _load_result(self, rowid: int) -> Optional[Dict]:
+        """Satırın sonucunu oku ve son kullanım zamanını tazele (silinmiş/süresi dolmuşsa None)"""
+        now = time.time()
+        if self.db_path is None:
+            entry = self._results.get(rowid)
+            if entry is None or (self.ttl is not None and now - entry[0] > self.ttl):
+                return None
+            self._results.move_to_end(rowid)
+            return entry[4]
+        conn = self._connect()
+        row = conn.execute("SELECT result, created_at, last_used FROM pages WHERE id = ?", (rowid,)).fetchone()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            return None
+        if now - row[2] > ACCESS_REFRESH_SECONDS:
+            # Yazma kilidi yalnızca eşleşmede ve seyrek alınır
+            with conn:
+                conn.execute("UPDATE pages SET last_used = ? WHERE id = ?", (now, rowid))
+        return json.loads(row[0])
+
+    def _prune(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Süresi dolan ve max_pages sınırını aşan en eski kullanılan sayfaları sil"""
+        if conn is None:
+            cutoff = None if self.ttl is None else time.time() - self.ttl
+            removed = 0
+            while self._results:
+                rowid, (created_at, *_) = next(iter(self._results.items()))
+                if len(self._results) <= self.max_pages and (cutoff is None or created_at >= cutoff):
+                    break
+                del self._results[rowid]
+                removed += 1
+            return removed
+
+        removed = 0
+        if self.ttl is not None:
+            removed += conn.execute("DELETE FROM pages WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] - self.max_pages
+        if excess > 0:
+            removed += conn.execute(
+                "DELETE FROM pages WHERE id IN (SELECT id FROM pages ORDER BY last_used ASC, id ASC LIMIT ?)",
+                (excess,)
+            ).rowcount
+        return removed
+
+    # --- Arama ve ekleme -------------------------------------------------
+
+    def digest(self, source) -> Optional[int]:
+        return perceptual_hash(source, self.method, self.size)
+
+    def find(self, digest: int, signature: str = '') -> Optional[Dict]:
+        """Aynı ayarlarla işlenmiş en yakın sayfa: {'page', 'distance', 'result'}"""
+        with self._lock:
+            self.stats_counters['lookups'] += 1
+            self._refresh()
+            for distance, (rowid, entry_signature, label) in self._tree.search(digest, self.max_distance):
+                if entry_signature != signature:
+                    continue
+                result = self._load_result(rowid)
+                if result is None:
+                    self._stale += 1
+                else:
+                    self.stats_counters['duplicates'] += 1
+                    return {'page': label, 'distance': distance, 'result': result}
+        return None
+
+    def add(self, digest: int, result: Dict, label: Optional[str] = None, signature: str = ''):
+        with self._lock:
+            self.stats_counters['added'] += 1
+            now = time.time()
+            if self.db_path is None:
+                rowid = self._next_rowid
+                self._next_rowid += 1
+                self._results[rowid] = (now, digest, signature, label, result)
+                self._tree.add(digest, (rowid, signature, label))
+                self._record_pruned(self._prune())
+                return
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO pages (method, hash, signature, label, result, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (f"{self.method}:{self.size}", format(digest, 'x'), signature, label,
+                     json.dumps(result, ensure_ascii=False), now, now)
+                )
+                self._record_pruned(self._prune(conn))
+            # Yeni satır (ve arada başka süreçlerin ekledikleri) ağaca buradan alınır
+            self._refresh()
+
+    def process(self, source, run: Callable[[], Dict], label: Optional[str] = None,
+                signature: str = '') -> Dict:
+        """Yakın kopya varsa önceki sonucu döndür/işaretle, yoksa run() ile işle ve ekle
+
+        signature: Sonucu etkileyen ayarlar (mod, ön ayar...); yalnızca aynı
+        imzalı sayfalar eşleşir
+        """
+        try:
+            digest = self.digest(source)
+        except Exception as e:
+            print(f"Sayfa özeti hesaplanamadı: {e}", file=sys.stderr)
+            digest = None
+        if digest is None:
+            return run()
+
+        start_time = time.time()
+        match = self.find(digest, signature)
+        if match is not None and self.action == 'reuse':
+            result = dict(match['result'])
+            result.update({
+                "duplicate_of": {"page": match['page'], "distance": match['distance']},
+                "processing_time": time.time() - start_time,
+                "timestamp": time.time()
+            })
+            return result
+
+        result = run()
+        if match is not None:
+            result["near_duplicate_of"] = {"page": match['page'], "distance": match['distance']}
+        elif result.get("success"):
+            self.add(digest, result, label, signature)
+        result["page_hash"] = format(digest, 'x')
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            if self.db_path is None:
+                pages = len(self._results)
+            else:
+                pages = self._connect().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return {'pages': pages, 'max_pages': self.max_pages, 'ttl': self.ttl,
+                    'max_distance': self.max_distance, 'action': self.action,
+                    'method': self.method, 'bits': self.size * self.size, **self.stats_counters}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def add_cli_arguments(parser):
+    """CLI'lara ortak yakın kopya bayraklarını ekle"""
+    parser.add_argument('--dedupe', choices=('off',) + DUPLICATE_ACTIONS, default='off',
+                        help="Yakın kopya sayfalar: 'reuse' önceki sonucu kullanır, 'flag' işleyip işaretler")
+    parser.add_argument('--dedupe-distance', type=int, default=DEFAULT_MAX_DISTANCE,
+                        help=f"Yakın kopya sayılacak en büyük Hamming uzaklığı ({DEFAULT_HASH_SIZE ** 2} bit üzerinden)")
+    parser.add_argument('--dedupe-index', help="Sayfa dizini veritabanı (varsayılan: önbellek klasöründe page_index.sqlite3)")
+    parser.add_argument('--dedupe-max-pages', type=int, default=DEFAULT_MAX_PAGES,
+                        help="Dizinde tutulacak en çok sayfa; aşılınca en uzun süredir eşleşmeyenler silinir")
+    parser.add_argument('--dedupe-ttl', type=float,
+                        help="Dizin kayıtlarının saniye cinsinden yaşam süresi (varsayılan: süresiz)")
+    parser.add_argument('--page-label', help="Dizinde bu sayfayı tanımlayan ad (varsayılan: dosya adı)")
+
+
+def iter_near_duplicates(paths: List[str], max_distance: int, method: str = DEFAULT_METHOD,
+                         size: int = DEFAULT_HASH_SIZE) -> Iterator[Dict]:
+    """Dosyalar arasında, her biri için kendinden önceki en yakın eşi bul"""
+    tree = BKTree()
+    for path in paths:
+        digest = perceptual_hash(path, method, size)
+        if digest is None:
+            print(f"⚠️ Görüntü yüklenemedi: {path}", file=sys.stderr)
+            continue
+        matches = tree.search(digest, max_distance)
+        if matches:
+            yield {'page': path, 'duplicate_of': matches[0][1], 'distance': matches[0][0]}
+        tree.add(digest, path)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Taranmış sayfalarda yakın kopyaları bul")
+    parser.add_argument('images', nargs='+', help="Karşılaştırılacak görüntüler (işlenme sırasıyla)")
+    parser.add_argument('--method', choices=HASH_METHODS, default=DEFAULT_METHOD, help="Algısal özet yöntemi")
+    parser.add_argument('--hash-size', type=int, default=DEFAULT_HASH_SIZE, help="Kenar başına bit (16 -> 256 bit)")
+    parser.add_argument('--max-distance', type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Yakın kopya sayılacak en büyük Hamming uzaklığı")
+    args = parser.parse_args(argv)
+
+    duplicates = list(iter_near_duplicates(args.images, args.max_distance, args.method, args.hash_size))
+    print(json.dumps({"success": True, "pages": len(args.images), "duplicates": duplicates},
+                     ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
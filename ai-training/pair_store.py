@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sütunlu Çeviri Çifti Deposu
+Çeviri çiftlerini uzunluk önekli dize tabloları (UTF-8 blok + uint64 ofset
+dizisi) halinde tek bir ikili dosyada saklar. Dosya mmap ile açılır; tüm
+dosyayı ayrıştırmadan indeksle rastgele erişim sağlar. Akışla okunabilen
+JSONL biçimi için yardımcılar da buradadır.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+MAGIC = b'MIRASPS1'
+ALIGNMENT = 8
+
+_HEADER_LENGTH = struct.Struct('<I')
+_OFFSET_PAIR = struct.Struct('<QQ')
+_LINE = struct.Struct('<I')
+
+
+def _little_endian(values: array) -> bytes:
+    """Diziyi platformdan bağımsız olarak little-endian baytlara çevir"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _string_table(strings: List[str]) -> Tuple[bytes, bytes]:
+    """Dizelerden (ofsetler, blok) üret; i. dize blok[ofset[i]:ofset[i+1]]"""
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = array('Q', [0])
+    offsets.extend(accumulate(len(value) for value in encoded))
+    return _little_endian(offsets), b''.join(encoded)
+
+
+def encode_pair_store(pairs: List[Dict]) -> bytes:
+    """Çiftleri sütunlu ikili biçime kodla
+
+    Sütunlar: ottoman ve turkish dize tabloları, source için sözlük kodlu
+    uint8 dizisi ve line için uint32 dizisi.
+    """
+    sources = sorted({pair['source'] for pair in pairs})
+    source_codes = {source: code for code, source in enumerate(sources)}
+    if len(sources) > 255:
+        raise ValueError("En fazla 255 farklı kaynak desteklenir")
+
+    ottoman_offsets, ottoman_blob = _string_table([pair['ottoman'] for pair in pairs])
+    turkish_offsets, turkish_blob = _string_table([pair['turkish'] for pair in pairs])
+    source_bytes = bytes(source_codes[pair['source']] for pair in pairs)
+    line_bytes = _little_endian(array('I', (int(pair.get('line', 0)) for pair in pairs)))
+
+    sections = [
+        ('ottoman_offsets', ottoman_offsets),
+        ('ottoman_data', ottoman_blob),
+        ('turkish_offsets', turkish_offsets),
+        ('turkish_data', turkish_blob),
+        ('source_codes', source_bytes),
+        ('lines', line_bytes),
+    ]
+
+    # Bölüm konumları başlığın boyutuna bağlı; başlığı sabit uzunlukta ayır
+    layout = {}
+    header = {'count': len(pairs), 'sources': sources, 'sections': layout}
+    reserved = len(json.dumps(header, ensure_ascii=False).encode('utf-8')) + 96 * len(sections)
+    position = len(MAGIC) + _HEADER_LENGTH.size + reserved
+    for name, data in sections:
+        position += -position % ALIGNMENT
+        layout[name] = [position, len(data)]
+        position += len(data)
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8').ljust(reserved, b' ')
+
+    parts = [MAGIC, _HEADER_LENGTH.pack(len(header_bytes)), header_bytes]
+    written = sum(len(part) for part in parts)
+    for name, data in sections:
+        parts.append(b'\0' * (layout[name][0] - written))
+        parts.append(data)
+        written = layout[name][0] + len(data)
+    return b''.join(parts)
+
+
+def write_pair_store(path: str, pairs: List[Dict]):
+    """Çiftleri sütunlu ikili dosyaya yaz"""
+    with open(path, 'wb') as f:
+        f.write(encode_pair_store(pairs))
+
+
+class PairStore:
+    """mmap ile açılan, indeksle erişilen salt okunur çift deposu"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Geçersiz çift deposu dosyası: {path}")
+
+        header_length = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))[0]
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+
+        self.count = header['count']
+        self.sources = header['sources']
+        self._sections = {name: start for name, (start, _) in header['sections'].items()}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, column: str, index: int) -> str:
+        start, end = _OFFSET_PAIR.unpack_from(self._mmap, self._sections[f'{column}_offsets'] + 8 * index)
+        base = self._sections[f'{column}_data']
+        return self._mmap[base + start:base + end].decode('utf-8')
+
+    def ottoman(self, index: int) -> str:
+        return self._string('ottoman', self._check(index))
+
+    def turkish(self, index: int) -> str:
+        return self._string('turkish', self._check(index))
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return index
+
+    def __getitem__(self, index: int) -> Dict:
+        index = self._check(index)
+        return {
+            'ottoman': self._string('ottoman', index),
+            'turkish': self._string('turkish', index),
+            'source': self.sources[self._mmap[self._sections['source_codes'] + index]],
+            'line': _LINE.unpack_from(self._mmap, self._sections['lines'] + 4 * index)[0]
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def encode_pairs_jsonl(pairs: Iterable[Dict]) -> bytes:
+    """Çiftleri satır başına bir JSON nesnesi olacak şekilde kodla"""
+    return ''.join(json.dumps(pair, ensure_ascii=False) + '\n' for pair in pairs).encode('utf-8')
+
+
+def write_pairs_jsonl(path: str, pairs: Iterable[Dict]):
+    """Her satıra bir çift yazan, akışla okunabilen JSONL dosyası oluştur"""
+    with open(path, 'wb') as f:
+        f.write(encode_pairs_jsonl(pairs))
+
+
+def iter_pairs_jsonl(path: str) -> Iterator[Dict]:
+    """JSONL dosyasını belleğe almadan satır satır oku"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
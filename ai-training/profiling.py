@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İsteğe Bağlı Profil Çıkarma
+Yavaş istekleri yeniden dağıtım yapmadan incelemek için tek bir çalıştırmada
+cProfile ve/veya tracemalloc açılır. Ayarlar ortam değişkenlerinden okunur ya da
+configure() ile verilir:
+
+    MIRAS_PROFILE=cpu,mem       # cpu: cProfile, mem: tracemalloc (1/all: ikisi)
+    MIRAS_PROFILE_DIR=profiller # çıktı klasörü (varsayılan: ai-training/logs/profiles)
+    MIRAS_PROFILE_SAMPLE=20     # uzun süren modlarda her 20 çağrıdan birini ölç
+
+Her ölçülen çağrı için .pstats dosyası, flame graph araçlarının okuduğu
+katlanmış yığın (collapsed stack) metni ve en çok bellek ayıran satırlar
+yazılır. Kapalıyken maliyet bir öznitelik kontrolüdür.
+"""
+
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROFILE_MODES = ('cpu', 'mem')
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profiles')
+
+# tracemalloc'un her ayırma için saklayacağı yığın derinliği
+MEMORY_FRAMES = 10
+
+# Katlanmış yığınlarda bundan küçük ağırlıklı yollar atılır
+MIN_PATH_WEIGHT = 1e-3
+MAX_STACK_DEPTH = 64
+
+
+class ProfileSettings:
+    """Etkin profil modları, çıktı klasörü ve örnekleme oranı"""
+
+    def __init__(self, modes: Tuple[str, ...] = (), directory: Optional[str] = None,
+                 sample: int = 1, top: int = 25):
+        for mode in modes:
+            if mode not in PROFILE_MODES:
+                raise ValueError(f"Bilinmeyen profil modu: {mode} ({', '.join(PROFILE_MODES)})")
+        self.modes = tuple(modes)
+        self.directory = directory or DEFAULT_PROFILE_DIR
+        self.sample = max(int(sample), 1)
+        self.top = top
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.modes)
+
+    @staticmethod
+    def parse_modes(value: Optional[str]) -> Tuple[str, ...]:
+        """'cpu,mem' / '1' / 'all' / '' -> mod listesi"""
+        value = (value or '').strip().lower()
+        if value in ('', '0', 'false', 'off', 'no'):
+            return ()
+        if value in ('1', 'true', 'on', 'yes', 'all'):
+            return PROFILE_MODES
+        return tuple(mode for mode in (item.strip() for item in value.split(',')) if mode)
+
+    @classmethod
+    def from_env(cls) -> 'ProfileSettings':
+        return cls(
+            modes=cls.parse_modes(os.environ.get('MIRAS_PROFILE')),
+            directory=os.environ.get('MIRAS_PROFILE_DIR'),
+            sample=int(os.environ.get('MIRAS_PROFILE_SAMPLE', '1') or 1)
+        )
+
+
+_settings: Optional[ProfileSettings] = None
+
+# cProfile iç içe çalışamaz ve tracemalloc süreç geneldir: aynı anda yalnızca
+# bir ölçüm yapılır. Kilidi alamayan çağrılar (iç içe ya da başka iş parçacığından)
+# ölçülmeden çalışır.
+_lock = threading.Lock()
+
+# Uzun ömürlü işçide aynı saniyede biten ölçümlerin dosyaları çakışmasın
+_sequence = itertools.count(1)
+
+
+def get_settings() -> ProfileSettings:
+    global _settings
+    if _settings is None:
+        _settings = ProfileSettings.from_env()
+    return _settings
+
+
+def configure(modes=None, directory: Optional[str] = None, sample: Optional[int] = None,
+              top: Optional[int] = None) -> ProfileSettings:
+    """Ayarları koddan değiştir (verilmeyenler ortam değişkenlerinden gelir)
+
+    modes: 'cpu,mem' gibi bir dize ya da mod listesi; boş ise profil kapanır
+    """
+    global _settings
+    current = get_settings()
+    if isinstance(modes, str):
+        modes = ProfileSettings.parse_modes(modes)
+    _settings = ProfileSettings(
+        modes=current.modes if modes is None else tuple(modes),
+        directory=directory or current.directory,
+        sample=current.sample if sample is None else sample,
+        top=current.top if top is None else top
+    )
+    return _settings
+
+
+def add_cli_arguments(parser):
+    """CLI'lara ortak --profile / --profile-dir bayraklarını ekle"""
+    parser.add_argument('--profile', metavar='MODLAR',
+                        help="Bu çalıştırmayı profille: cpu, mem ya da cpu,mem (MIRAS_PROFILE ile aynı)")
+    parser.add_argument('--profile-dir', help="Profil çıktı klasörü (MIRAS_PROFILE_DIR)")
+
+
+def configure_from_args(args):
+    """--profile bayrakları verildiyse ayarları güncelle; CLI tek çalıştırma olduğundan örnekleme kapanır"""
+    if getattr(args, 'profile', None) or getattr(args, 'profile_dir', None):
+        configure(modes=args.profile, directory=args.profile_dir, sample=1 if args.profile else None)
+
+
+def collapsed_stacks(stats) -> List[str]:
+    """pstats.Stats'tan yaklaşık katlanmış yığınlar üret ('a;b;c <mikrosaniye>')
+
+    cProfile tam yığınları değil yalnızca çağıran -> çağrılan kenarlarını tutar.
+    Her fonksiyonun kendi süresi, çağıranlarına kenar kümülatif süreleri
+    oranında dağıtılarak köklerden yollara açılır.
+    """
+    entries = stats.stats
+
+    def label(function) -> str:
+        filename, line, name = function
+        if filename == '~':
+            return name
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    memo: Dict = {}
+
+    def paths(function, depth: int, visiting: frozenset) -> List[Tuple[Tuple[str, ...], float]]:
+        # Döngülerde (özyineleme) yığındaki çağıranlar atlanır; sonuç yaklaşık olduğundan
+        # ilk hesaplanan yollar fonksiyon başına önbelleklenir
+        if function in memo:
+            return memo[function]
+        callers = entries.get(function, (0, 0, 0, 0, {}))[4]
+        callers = {caller: edge for caller, edge in callers.items() if caller not in visiting}
+        total = sum(edge[3] for edge in callers.values())
+        if not callers or total <= 0 or depth >= MAX_STACK_DEPTH:
+            result = [((label(function),), 1.0)]
+        else:
+            result = []
+            for caller, edge in callers.items():
+                share = edge[3] / total
+                if share < MIN_PATH_WEIGHT:
+                    continue
+                for path, weight in paths(caller, depth + 1, visiting | {function}):
+                    if weight * share >= MIN_PATH_WEIGHT:
+                        result.append((path + (label(function),), weight * share))
+        memo[function] = result
+        return result
+
+    totals: Dict[str, int] = {}
+    for function, (_, _, self_time, _, _) in entries.items():
+        if self_time <= 0:
+            continue
+        for path, weight in paths(function, 0, frozenset()):
+            line = ';'.join(path)
+            totals[line] = totals.get(line, 0) + int(self_time * weight * 1_000_000)
+
+    return [f"{line} {value}" for line, value in sorted(totals.items()) if value > 0]
+
+
+def _write_cpu_profile(profiler, base: str, settings: ProfileSettings) -> List[str]:
+    import io
+    import pstats
+
+    pstats_path = f"{base}.pstats"
+    profiler.dump_stats(pstats_path)
+    stats = pstats.Stats(profiler)
+
+    collapsed_path = f"{base}.collapsed.txt"
+    with open(collapsed_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+
+    summary_path = f"{base}.cpu.txt"
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(settings.top)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+    return [pstats_path, collapsed_path, summary_path]
+
+
+def _write_memory_profile(snapshot, peak: int, base: str, settings: ProfileSettings) -> List[str]:
+    path = f"{base}.mem.txt"
+    statistics = snapshot.statistics('lineno')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Tepe bellek: {peak / (1024 * 1024):.2f} MB\n")
+        f.write(f"En çok ayıran {settings.top} satır:\n")
+        for statistic in statistics[:settings.top]:
+            frame = statistic.traceback[0]
+            f.write(f"{statistic.size / 1024:10.1f} KB {statistic.count:8d} blok  {frame.filename}:{frame.lineno}\n")
+    return [path]
+
+
+@contextmanager
+def profile_run(name: str, settings: Optional[ProfileSettings] = None) -> Iterator[Optional[List[str]]]:
+    """Bloğu etkin modlarla profille; yazılan dosya yolları verilen listeye eklenir
+
+    Profil kapalıysa, örneklemeye takılmadıysa ya da başka bir ölçüm sürüyorsa
+    blok olduğu gibi çalışır ve None verilir.
+    """
+    settings = settings or get_settings()
+    if not settings.enabled or _lock.locked():
+        yield None
+        return
+    if settings.sample > 1:
+        import random
+        # Her süreç bağımsız örneklenir: tek istekli süreçlerde de 1/N oran korunur
+        if random.random() * settings.sample >= 1:
+            yield None
+            return
+    # Kontrol ile alma arasında başka bir iş parçacığı ölçüme başlamış olabilir
+    if not _lock.acquire(blocking=False):
+        yield None
+        return
+
+    profiler = None
+    written: List[str] = []
+    try:
+        if 'mem' in settings.modes:
+            import tracemalloc
+            tracemalloc.start(MEMORY_FRAMES)
+        if 'cpu' in settings.modes:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        yield written
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        snapshot = peak = None
+        if 'mem' in settings.modes:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        _lock.release()
+
+        try:
+            os.makedirs(settings.directory, exist_ok=True)
+            base = os.path.join(settings.directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}")
+            if profiler is not None:
+                written.extend(_write_cpu_profile(profiler, base, settings))
+            if snapshot is not None:
+                written.extend(_write_memory_profile(snapshot, peak, base, settings))
+            print(f"📈 Profil kaydedildi: {', '.join(written)}", file=sys.stderr)
+        except Exception as e:
+            print(f"Profil yazılırken hata: {e}", file=sys.stderr)
+
+
+def profiled(name: str):
+    """Metodu/fonksiyonu profile_run ile saran dekoratör (kapalıyken yalnızca bir kontrol)"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _lock.locked() or not get_settings().enabled:
+                return function(*args, **kwargs)
+            with profile_run(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
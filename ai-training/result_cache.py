@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalıcı Sonuç Önbelleği
+SQLite (WAL modu) üzerinde, birden fazla işçi sürecinin aynı anda
+kullanabildiği, boyut sınırlı LRU önbellek. Kayıtlar isteğe bağlı olarak
+yaşam süresi (TTL) sonunda düşer; veri sürümü (ör. sözlük özeti) değişince
+tüm kayıtlar geçersiz sayılır.
+
+Okumalar yazma kilidi almaz: isabet/ıskalama sayaçları bellekte biriktirilip
+toplu yazılır, son erişim zamanı ise yalnızca ACCESS_REFRESH_SECONDS'tan eski
+kayıtlar için güncellenir. Böylece okuyucu süreçler birbirini beklemez.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+# Şema sürümü (PRAGMA user_version); eski veritabanları açılışta yükseltilir
+SCHEMA_VERSION = 2
+
+# Biriken sayaç/erişim güncellemeleri bu kadar okumada ya da bu kadar saniyede bir yazılır
+FLUSH_EVERY = 64
+FLUSH_SECONDS = 10.0
+
+# LRU sırası için son erişim zamanı en fazla bu sıklıkta güncellenir
+ACCESS_REFRESH_SECONDS = 60.0
+
+
+class ResultCache:
+    """İçerik adresli, süreçler arası paylaşılan sonuç önbelleği"""
+
+    def __init__(self, db_path: str, max_bytes: int = 256 * 1024 * 1024, enabled: bool = True,
+                 ttl: Optional[float] = None, data_version: Optional[str] = None):
+        """Önbellek başlatıcı
+
+        db_path: SQLite veritabanı dosyası (klasörü yoksa oluşturulur)
+        max_bytes: Saklanan sonuçların toplam boyut sınırı, aşılınca en eski
+                   erişilen kayıtlar silinir
+        enabled: False ise önbellek tamamen devre dışıdır (bypass)
+        ttl: Saniye cinsinden yaşam süresi; None ise kayıtlar süresizdir
+        data_version: Sonuçları üreten verinin sürümü; veritabanındakinden
+                      farklıysa açılışta tüm kayıtlar silinir
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.ttl = ttl
+        self.data_version = data_version
+        self._conn = None
+
+        # Henüz veritabanına yazılmamış sayaçlar ve son erişim zamanları
+        self._pending_counters: Dict[str, int] = {}
+        self._pending_access: Dict[str, float] = {}
+        self._pending_reads = 0
+        self._last_flush = time.time()
+        self._flush_registered = False
+
+    @staticmethod
+    def make_key(*parts: Union[str, bytes]) -> str:
+        """Verilen parçalardan sha256 anahtarı üret"""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            # Parça sınırlarını belirsizliğe yer bırakmayacak şekilde işaretle
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Bağlantıyı tembel olarak aç ve şemayı hazırla"""
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            self._migrate(conn)
+            self._check_data_version(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Yazma kilidini alıp bloğu tek işlemde çalıştır; hata olursa geri al
+
+        Bağlantı otomatik işlem kipinde değildir (isolation_level=None); ROLLBACK
+        yapılmazsa paylaşılan bağlantı açık işlemde kalır ve sonraki BEGIN'ler düşer.
+        """
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Şemayı SCHEMA_VERSION'a yükselt"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self._transaction(conn):
+            # Sürüm 2: veri sürümü gibi ayarlar için meta tablosu, TTL için created_at indeksi
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries(created_at)')
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _check_data_version(self, conn: sqlite3.Connection):
+        """Veri sürümü değiştiyse tüm kayıtları geçersiz kıl"""
+        if self.data_version is None:
+            return
+
+        row = conn.execute("SELECT value FROM meta WHERE name = 'data_version'").fetchone()
+        if row is not None and row[0] == self.data_version:
+            return
+
+        with self._transaction(conn):
+            # Kilit alınana kadar başka bir süreç güncellemiş olabilir
+            row = conn.execute("SELECT value FROM meta WHERE name = 'data_version'").fetchone()
+            if row is None or row[0] != self.data_version:
+                conn.execute('DELETE FROM entries')
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta(name, value) VALUES ('data_version', ?)",
+                    (self.data_version,)
+                )
+                if row is not None:
+                    self._bump(conn, 'invalidations')
+
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        """İstatistik sayacını artır"""
+        conn.execute(
+            'INSERT INTO counters(name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            (name, amount)
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Anahtara karşılık gelen sonucu döndür, yoksa None
+
+        Yalnızca okuma yapılır; sayaçlar ve son erişim zamanı _flush ile toplu yazılır.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT value, created_at, last_access FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            now = time.time()
+
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                # Süresi dolmuş kayıt ıskalama sayılır; silinmesi sonraki yazmada (_evict) olur
+                self._count('expired')
+                row = None
+            if row is None:
+                self._count('misses')
+            else:
+                self._count('hits')
+                if now - row[2] > ACCESS_REFRESH_SECONDS:
+                    self._pending_access[key] = now
+
+            self._pending_reads += 1
+            if self._pending_reads >= FLUSH_EVERY or now - self._last_flush >= FLUSH_SECONDS:
+                self._flush(conn)
+
+            return json.loads(row[0]) if row is not None else None
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Önbellek okuma hatası: {e}", file=sys.stderr)
+            return None
+
+    def _count(self, name: str, amount: int = 1):
+        """Sayacı bellekte artır (süreç çıkışında da yazılır)"""
+        self._pending_counters[name] = self._pending_counters.get(name, 0) + amount
+        if not self._flush_registered:
+            atexit.register(self.flush)
+            self._flush_registered = True
+
+    def _write_pending(self, conn: sqlite3.Connection):
+        """Biriken sayaç ve erişim güncellemelerini açık işleme yaz"""
+        for name, amount in self._pending_counters.items():
+            self._bump(conn, name, amount)
+        if self._pending_access:
+            conn.executemany(
+                'UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?',
+                [(accessed, key) for key, accessed in self._pending_access.items()]
+            )
+        self._pending_counters = {}
+        self._pending_access = {}
+        self._pending_reads = 0
+        self._last_flush = time.time()
+
+    def _flush(self, conn: sqlite3.Connection):
+        if not self._pending_counters and not self._pending_access:
+            self._pending_reads = 0
+            self._last_flush = time.time()
+            return
+        with self._transaction(conn):
+            self._write_pending(conn)
+
+    def flush(self):
+        """Biriken istatistikleri hemen veritabanına yaz"""
+        if self._conn is None or (not self._pending_counters and not self._pending_access):
+            return
+        try:
+            self._flush(self._conn)
+        except sqlite3.Error as e:
+            print(f"Önbellek sayaç yazma hatası: {e}", file=sys.stderr)
+
+    def set(self, key: str, value: Dict):
+        """Sonucu önbelleğe yaz ve gerekirse LRU tahliyesi yap"""
+        if not self.enabled:
+            return
+
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            size = len(payload.encode('utf-8'))
+            if size > self.max_bytes:
+                return
+
+            conn = self._connect()
+            now = time.time()
+            with self._transaction(conn):
+                # Yazma kilidi zaten alındı; bekleyen erişimler tahliyeden önce işlenir
+                self._write_pending(conn)
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries(key, value, size, created_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, payload, size, now, now)
+                )
+                self._evict(conn)
+
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Önbellek yazma hatası: {e}", file=sys.stderr)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Süresi dolan kayıtları ve boyut sınırı aşıldıysa en eski erişilenleri sil"""
+        if self.ttl is not None:
+            cursor = conn.execute('DELETE FROM entries WHERE created_at < ?', (time.time() - self.ttl,))
+            if cursor.rowcount > 0:
+                self._bump(conn, 'expired', cursor.rowcount)
+
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute('SELECT key, size FROM entries ORDER BY last_access ASC').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+
+        if evicted:
+            self._bump(conn, 'evictions', evicted)
+
+    def invalidate(self, key: str) -> bool:
+        """Tek bir kaydı sil"""
+        try:
+            conn = self._connect()
+            cursor = conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Önbellek silme hatası: {e}", file=sys.stderr)
+            return False
+
+    def clear(self):
+        """Tüm kayıtları ve istatistikleri sil"""
+        try:
+            conn = self._connect()
+            with self._transaction(conn):
+                conn.execute('DELETE FROM entries')
+                conn.execute('DELETE FROM counters')
+            self._pending_counters = {}
+            self._pending_access = {}
+        except sqlite3.Error as e:
+            print(f"Önbellek temizleme hatası: {e}", file=sys.stderr)
+
+    def stats(self) -> Dict:
+        """İsabet/ıskalama istatistiklerini döndür"""
+        try:
+            conn = self._connect()
+            self._flush(conn)
+            counters = dict(conn.execute('SELECT name, value FROM counters').fetchall())
+            entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        except sqlite3.Error as e:
+            print(f"Önbellek istatistik hatası: {e}", file=sys.stderr)
+            counters, entries, total = {}, 0, 0
+
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        lookups = hits + misses
+
+        return {
+            "enabled": self.enabled,
+            "path": self.db_path,
+            "entries": entries,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get('evictions', 0),
+            "expired": counters.get('expired', 0),
+            "invalidations": counters.get('invalidations', 0),
+            "ttl": self.ttl,
+            "data_version": self.data_version,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        """Bağlantıyı kapat"""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Performans Ölçümü
+TesseractOttomanOCR.process_image'ı test-pictures görüntüleri ve doğru metni
+bilinen sentetik sayfalar üzerinde çalıştırır. Aşama süreleri, tesseract çağrı
+sayısı, bellek tepe değeri, sayfa/dakika ve karakter hata oranı (CER) JSON
+olarak kaydedilir; önceki bir sonuçla (--baseline) karşılaştırılabilir.
+--presets ile her mod Otsu ('default') ve yerel ikilileştirme ön ayarlarıyla
+ayrı ayrı ölçülür; ön işleme süresi ve CER farkı yan yana görülür.
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+AI_TRAINING_DIR = SCRIPT_DIR.parent
+REPO_DIR = AI_TRAINING_DIR.parent
+sys.path.insert(0, str(AI_TRAINING_DIR))
+
+from synthetic_text import find_arabic_fonts, load_ottoman_lines, render_page  # noqa: E402
+from tesseract_ottoman_ocr import PREPROCESS_PRESETS, PROCESSING_MODES, TesseractOttomanOCR  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Aşama adı -> ölçülecek TesseractOttomanOCR metotları
+STAGE_METHODS = {
+    'preprocessing': ['preprocess_image', '_preprocess_array', 'open_tile_reader'],
+    'region_detection': ['detect_text_regions', 'segment_lines'],
+    'ocr': ['extract_text_with_tesseract', 'extract_lines_with_data'],
+    'translation': ['translate_ottoman_to_turkish'],
+}
+
+
+class StageTimer:
+    """Örnek metotlarını sarmalayıp aşama başına süre toplar
+
+    İç içe çağrılar (ör. preprocess_image -> _preprocess_array) aynı aşamada
+    yalnızca en dıştaki çağrı kadar sayılır.
+    """
+
+    def __init__(self):
+        self.totals = {stage: 0.0 for stage in STAGE_METHODS}
+        self._depth = {stage: 0 for stage in STAGE_METHODS}
+
+    def wrap(self, target, stage: str, name: str):
+        method = getattr(target, name, None)
+        if method is None:
+            return
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self._depth[stage] += 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth[stage] -= 1
+                if self._depth[stage] == 0:
+                    self.totals[stage] += time.perf_counter() - start
+
+        setattr(target, name, timed)
+
+    def instrument(self, ocr: TesseractOttomanOCR, translator=None):
+        for stage, names in STAGE_METHODS.items():
+            for name in names:
+                self.wrap(ocr, stage, name)
+        if translator is not None:
+            self.wrap(translator, 'translation', 'translate_batch')
+
+    def reset(self):
+        for stage in self.totals:
+            self.totals[stage] = 0.0
+
+
+def character_error_rate(hypothesis: str, reference: str) -> float:
+    """Levenshtein uzaklığı / referans uzunluğu (boşluklar tekilleştirilerek)"""
+    hypothesis = ' '.join(hypothesis.split())
+    reference = ' '.join(reference.split())
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(reference) + 1))
+    for i, h_char in enumerate(hypothesis, 1):
+        current = [i] + [0] * len(reference)
+        for j, r_char in enumerate(reference, 1):
+            current[j] = min(
+                previous[j] + 1,                        # silme
+                current[j - 1] + 1,                     # ekleme
+                previous[j - 1] + (h_char != r_char)    # değiştirme
+            )
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def build_pages(args: argparse.Namespace) -> List[Dict]:
+    """Ölçülecek sayfaları hazırla: gerçek test görüntüleri ve sentetik sayfalar"""
+    pages = []
+
+    for path in sorted(glob.glob(os.path.join(args.pictures, '*.png'))):
+        # Yanında <ad>.gt.txt varsa doğru metin olarak kullan
+        ground_truth_path = os.path.splitext(path)[0] + '.gt.txt'
+        ground_truth = None
+        if os.path.exists(ground_truth_path):
+            with open(ground_truth_path, 'r', encoding='utf-8') as f:
+                ground_truth = f.read()
+        pages.append({'name': os.path.basename(path), 'source': path, 'ground_truth': ground_truth,
+                      'kind': 'test_picture'})
+
+    if args.synthetic_pages <= 0:
+        return pages
+
+    font = args.font or next(iter(find_arabic_fonts()), None)
+    if font is None:
+        print("⚠️ Arap harfli font bulunamadı, sentetik sayfalar atlanıyor (--font ile belirtin)", file=sys.stderr)
+        return pages
+
+    lines = load_ottoman_lines([str(REPO_DIR / 'oe_tr.txt'), str(AI_TRAINING_DIR / 'merged_mapping.txt')])
+    if not lines:
+        print("⚠️ Sentetik sayfalar için metin bulunamadı", file=sys.stderr)
+        return pages
+
+    import cv2
+
+    page_index = 0
+    for scale in args.scales:
+        for noise in args.noise_levels:
+            for _ in range(args.synthetic_pages):
+                start = (page_index * args.lines_per_page) % len(lines)
+                page_lines = (lines + lines)[start:start + args.lines_per_page]
+                image, ground_truth = render_page(page_lines, font, scale=scale, noise=noise, seed=page_index)
+                ok, encoded = cv2.imencode('.png', image)
+                pages.append({
+                    'name': f'synthetic_{page_index:03d}_s{scale}_n{noise}',
+                    'source': encoded.tobytes() if ok else image,
+                    'ground_truth': ground_truth,
+                    'kind': 'synthetic',
+                    'scale': scale,
+                    'noise': noise
+                })
+                page_index += 1
+
+    return pages
+
+
+def run_mode(mode: str, pages: List[Dict], args: argparse.Namespace, preset: str = 'default') -> Dict:
+    """Tek bir işlem modunu (ve ön işleme ön ayarını) tüm sayfalarda ölç"""
+    ocr = TesseractOttomanOCR()
+    ocr.preprocess_preset = preset
+    translator = None
+    process: Callable = functools.partial(ocr.process_image, use_cache=False, mode=mode)
+
+    if args.with_translation:
+        from ocr_translation_pipeline import OCRTranslationPipeline
+        pipeline = OCRTranslationPipeline(ocr=ocr)
+        translator = pipeline.translator
+        process = functools.partial(pipeline.process, use_cache=False, mode=mode)
+
+    timer = StageTimer()
+    timer.instrument(ocr, translator)
+
+    page_results = []
+    wall_start = time.perf_counter()
+
+    for page in pages:
+        timer.reset()
+        calls_before = ocr.tesseract_calls
+        if args.trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        result = process(page['source'])
+        elapsed = time.perf_counter() - start
+
+        peak_mb = None
+        if args.trace_memory:
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+        cer = None
+        if page['ground_truth'] is not None and result.get('success'):
+            cer = character_error_rate(result.get('extracted_text', ''), page['ground_truth'])
+
+        page_results.append({
+            'name': page['name'],
+            'kind': page['kind'],
+            'success': bool(result.get('success')),
+            'time': elapsed,
+            'stages': dict(timer.totals),
+            'tesseract_calls': ocr.tesseract_calls - calls_before,
+            'peak_traced_mb': peak_mb,
+            'cer': cer,
+            'text_regions_count': result.get('text_regions_count', 0)
+        })
+
+    wall_time = time.perf_counter() - wall_start
+    cers = [page['cer'] for page in page_results if page['cer'] is not None]
+    peaks = [page['peak_traced_mb'] for page in page_results if page['peak_traced_mb'] is not None]
+
+    return {
+        'summary': {
+            'pages': len(page_results),
+            'failures': sum(1 for page in page_results if not page['success']),
+            'total_time': wall_time,
+            'pages_per_minute': 60.0 * len(page_results) / wall_time if wall_time > 0 else 0.0,
+            'stages': {stage: sum(page['stages'][stage] for page in page_results) for stage in STAGE_METHODS},
+            'tesseract_calls': sum(page['tesseract_calls'] for page in page_results),
+            'mean_cer': sum(cers) / len(cers) if cers else None,
+            'peak_traced_mb': max(peaks) if peaks else None
+        },
+        'pages': page_results
+    }
+
+
+def compare_with_baseline(report: Dict, baseline_path: str):
+    """Özet metrikleri önceki bir ölçümle karşılaştırıp yazdır"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print("\n📊 Baseline karşılaştırması", file=sys.stderr)
+    metrics = ['total_time', 'pages_per_minute', 'tesseract_calls', 'mean_cer', 'peak_traced_mb']
+    for mode, current in report['modes'].items():
+        previous = baseline.get('modes', {}).get(mode)
+        if previous is None:
+            continue
+        print(f"   [{mode}]", file=sys.stderr)
+        for metric in metrics:
+            old, new = previous['summary'].get(metric), current['summary'].get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"   - {metric}: {old:.4g} -> {new:.4g} ({change:+.1f}%)", file=sys.stderr)
+
+
+def parse_floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(',') if item]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Osmanlıca OCR performans ölçümü")
+    parser.add_argument('--pictures', default=str(REPO_DIR / 'test-pictures'), help="Test görüntüleri klasörü")
+    parser.add_argument('--modes', default='regions', help=f"Virgülle ayrılmış modlar ({', '.join(PROCESSING_MODES)})")
+    parser.add_argument('--presets', default='default',
+                        help=f"Virgülle ayrılmış ön işleme ön ayarları ({', '.join(PREPROCESS_PRESETS)})")
+    parser.add_argument('--synthetic-pages', type=int, default=3, help="Her ölçek/gürültü için sentetik sayfa sayısı")
+    parser.add_argument('--lines-per-page', type=int, default=6, help="Sentetik sayfa başına satır")
+    parser.add_argument('--scales', type=parse_floats, default=[1.0, 2.0], help="Çözünürlük ölçekleri, ör. 0.5,1,2")
+    parser.add_argument('--noise-levels', type=parse_floats, default=[0.0, 0.1, 0.3], help="Gürültü seviyeleri")
+    parser.add_argument('--font', help="Sentetik sayfalar için font dosyası")
+    parser.add_argument('--with-translation', action='store_true', help="AdvancedOttomanTranslator ile çeviriyi de ölç")
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help="tracemalloc ile bellek ölçümünü kapat (süreleri daha az etkiler)")
+    parser.add_argument('--output', default='ocr_benchmark.json', help="JSON sonuç dosyası")
+    parser.add_argument('--baseline', help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(',') if mode]
+    for mode in modes:
+        if mode not in PROCESSING_MODES:
+            parser.error(f"Bilinmeyen mod: {mode}")
+    presets = [preset for preset in args.presets.split(',') if preset]
+    for preset in presets:
+        if preset not in PREPROCESS_PRESETS:
+            parser.error(f"Bilinmeyen ön ayar: {preset}")
+
+    pages = build_pages(args)
+    if not pages:
+        print("❌ Ölçülecek sayfa bulunamadı", file=sys.stderr)
+        sys.exit(1)
+
+    report = {
+        'created_at': time.time(),
+        'config': {
+            'modes': modes,
+            'presets': presets,
+            'pages': len(pages),
+            'scales': args.scales,
+            'noise_levels': args.noise_levels,
+            'with_translation': args.with_translation
+        },
+        'modes': {}
+    }
+
+    for mode in modes:
+        for preset in presets:
+            # Yalnızca varsayılan ön ayar ölçülüyorsa anahtarlar eski raporlarla aynı kalır
+            name = mode if preset == 'default' else f"{mode}@{preset}"
+            print(f"🚀 {name} ölçülüyor ({len(pages)} sayfa)...", file=sys.stderr)
+            report['modes'][name] = run_mode(mode, pages, args, preset)
+            summary = report['modes'][name]['summary']
+            print(f"   ✅ {summary['pages_per_minute']:.1f} sayfa/dk, {summary['tesseract_calls']} tesseract çağrısı, "
+                  f"ön işleme {summary['stages']['preprocessing'] * 1000:.0f} ms", file=sys.stderr)
+
+    if resource is not None:
+        # Linux'ta KB, macOS'ta bayt cinsindendir
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report['max_rss_mb'] = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 Sonuçlar kaydedildi: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        compare_with_baseline(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
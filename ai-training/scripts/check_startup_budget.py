@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Soğuk Başlangıç Bütçesi Kontrolü
+Giriş betiklerini (tesseract_ottoman_ocr, advanced_ottoman_translator,
+ocr_translation_pipeline) yeni yorumlayıcılarda -X importtime ile birkaç kez
+içe aktarır; medyan süre startup.COLD_START_BUDGET_MS bütçesini aşarsa
+sıfırdan farklı kodla çıkar. CI'da ya da bağımlılık eklerken çalıştırılır.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from startup import COLD_START_BUDGET_MS, check_budgets, measure_import  # noqa: E402
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Python giriş betiklerinin soğuk başlangıç bütçesini kontrol et")
+    parser.add_argument('modules', nargs='*', help=f"Kontrol edilecek modüller (varsayılan: {', '.join(COLD_START_BUDGET_MS)})")
+    parser.add_argument('--runs', type=int, default=5, help="Modül başına ölçüm sayısı (medyan alınır)")
+    parser.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args()
+
+    # İlk ölçüm .pyc dosyalarını oluşturur; bütçeye derleme süresi girmesin
+    for module in args.modules or COLD_START_BUDGET_MS:
+        measure_import(module)
+
+    results = check_budgets(args.modules or None, args.runs)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for result in results:
+            mark = '✅' if result['ok'] else '❌'
+            print(f"{mark} {result['module']}: {result['median_ms']} ms (bütçe {result['budget_ms']} ms)")
+
+    sys.exit(0 if all(result['ok'] for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentetik Satır Görüntüsü Üretici
+oe_tr ve merged_mapping çiftlerindeki Osmanlıca satırları yerel Arap harfli
+fontlarla çizer, bulanıklık / gürültü / eğiklik / mürekkep dağılması ile
+çeşitlendirir ve süreç havuzunda parça (shard) parça üretir. Her parça sabit
+yükseklikte satır görüntüleri içeren bir .npz ile etiketleri içeren bir .jsonl
+dosyasından oluşur; index.json dataset_shards biçimindedir.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+AI_TRAINING_DIR = SCRIPT_DIR.parent
+REPO_DIR = AI_TRAINING_DIR.parent
+sys.path.insert(0, str(AI_TRAINING_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from corpus_io import read_pairs  # noqa: E402
+from dataset_shards import INDEX_FILE, INDEX_VERSION, SPLITS, assign_split, encode_index  # noqa: E402
+from pair_store import encode_pairs_jsonl  # noqa: E402
+from process_oe_tr_data import OETRDataProcessor  # noqa: E402
+from synthetic_text import augment_line, find_arabic_fonts, render_line  # noqa: E402
+
+DEFAULT_OUTPUT_DIR = AI_TRAINING_DIR / 'data' / 'synthetic_lines'
+
+# Tüm satırlar bu yüksekliğe ölçeklenir (en-boy oranı korunur)
+LINE_HEIGHT = 48
+
+# Çok uzun satırlar bu genişlikte kırpılır (parça içinde dolgu israfını sınırlar)
+MAX_LINE_WIDTH = 1024
+
+FONT_SIZES = (24, 28, 32, 40)
+
+
+def load_line_pairs(limit: Optional[int] = None) -> List[Dict]:
+    """OETRDataProcessor kaynakları (oe_tr.txt/.xlsx) ve merged_mapping.txt çiftleri"""
+    processor = OETRDataProcessor()
+    processor.data_dir = REPO_DIR
+    processor.output_dir = AI_TRAINING_DIR / 'data' / 'training'
+    pair_lists = [processor.load_pairs()]
+
+    mapping_file = AI_TRAINING_DIR / 'merged_mapping.txt'
+    if mapping_file.exists():
+        pairs, _ = read_pairs(str(mapping_file))
+        pair_lists.append([{'ottoman': ottoman, 'turkish': turkish, 'source': mapping_file.name, 'line': line}
+                           for ottoman, turkish, line in pairs])
+
+    merged = processor.merge_pairs(pair_lists)
+    return merged[:limit] if limit else merged
+
+
+def plan_samples(pairs: List[Dict], count: int, seed: int, val_fraction: float) -> Dict[str, List[Tuple]]:
+    """Örnek kimliklerini satırlara ve kümelere dağıt
+
+    Satırlar tohumlu karıştırılır ve gerekirse tekrar tekrar kullanılır (her
+    tekrar farklı font ve bozulmayla çizilir). Küme, dataset_shards gibi
+    Osmanlıca metnin özetinden belirlenir.
+    """
+    order = list(range(len(pairs)))
+    random.Random(seed).shuffle(order)
+
+    plan = {split: [] for split in SPLITS}
+    for sample_id in range(count):
+        pair = pairs[order[sample_id % len(order)]]
+        split = assign_split(pair['ottoman'], val_fraction)
+        plan[split].append((sample_id, pair['ottoman'], pair['turkish']))
+    return plan
+
+
+def _fit_height(image: np.ndarray, height: int, max_width: int) -> np.ndarray:
+    import cv2
+
+    h, w = image.shape
+    new_w = max(int(round(w * height / h)), 1)
+    interpolation = cv2.INTER_AREA if h > height else cv2.INTER_LINEAR
+    resized = cv2.resize(image, (new_w, height), interpolation=interpolation)
+    return resized[:, :max_width]
+
+
+def render_shard(job: Dict) -> Dict:
+    """Bir parçanın tüm örneklerini çiz ve dosyalarını yaz (süreç havuzunda çalışır)"""
+    output_dir = Path(job['output_dir'])
+    images = []
+    labels = []
+
+    for sample_id, ottoman, turkish in job['samples']:
+        # Her örnek kendi tohumuyla üretilir: sonuç işçi sayısından bağımsızdır
+        rng = np.random.default_rng([job['seed'], sample_id])
+        font = job['fonts'][int(rng.integers(len(job['fonts'])))]
+        font_size = int(rng.choice(job['font_sizes']))
+
+        line = render_line(ottoman, font, font_size, margin=int(rng.integers(4, 12)))
+        line, params = augment_line(line, rng, job['strength'])
+        line = _fit_height(line, job['height'], job['max_width'])
+
+        images.append(line)
+        labels.append({
+            'id': sample_id,
+            'index': len(labels),
+            'text': ottoman,
+            'turkish': turkish,
+            'width': line.shape[1],
+            'font': os.path.basename(font),
+            'font_size': font_size,
+            'augment': params
+        })
+
+    # Satırlar sağdan sola okunur; kısa satırlar sol taraftan beyazla doldurulur
+    width = max(image.shape[1] for image in images)
+    batch = np.full((len(images), job['height'], width), 255, dtype=np.uint8)
+    for i, image in enumerate(images):
+        batch[i, :, width - image.shape[1]:] = image
+
+    stem = f"{job['split']}/shard-{job['shard']:05d}"
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, images=batch, widths=np.array([image.shape[1] for image in images], dtype=np.uint16))
+    label_bytes = encode_pairs_jsonl(labels)
+
+    (output_dir / job['split']).mkdir(parents=True, exist_ok=True)
+    with open(output_dir / f"{stem}.npz", 'wb') as f:
+        f.write(buffer.getvalue())
+    with open(output_dir / f"{stem}.jsonl", 'wb') as f:
+        f.write(label_bytes)
+
+    return {
+        'path': f"{stem}.jsonl",
+        'images': f"{stem}.npz",
+        'offset': job['offset'],
+        'records': len(labels),
+        'bytes': len(label_bytes) + buffer.tell(),
+        'sha256': hashlib.sha256(label_bytes).hexdigest()
+    }
+
+
+def generate(pairs: List[Dict], output_dir: Path, count: int, fonts: List[str], shard_size: int = 1000,
+             seed: int = 42, val_fraction: float = 0.05, workers: Optional[int] = None,
+             height: int = LINE_HEIGHT, max_width: int = MAX_LINE_WIDTH, strength: float = 1.0,
+             font_sizes=FONT_SIZES) -> Dict:
+    """Örnekleri parçalar halinde üret ve index.json'ı yaz"""
+    plan = plan_samples(pairs, count, seed, val_fraction)
+
+    jobs = []
+    for split, samples in plan.items():
+        for shard, offset in enumerate(range(0, len(samples), shard_size)):
+            jobs.append({
+                'split': split, 'shard': shard, 'offset': offset,
+                'samples': samples[offset:offset + shard_size],
+                'output_dir': str(output_dir), 'fonts': fonts, 'font_sizes': list(font_sizes),
+                'seed': seed, 'height': height, 'max_width': max_width, 'strength': strength
+            })
+
+    index = {
+        'version': INDEX_VERSION,
+        'format': 'npz+jsonl',
+        'seed': seed,
+        'shard_size': shard_size,
+        'val_fraction': val_fraction,
+        'total_records': count,
+        'line_height': height,
+        'splits': {split: {'records': len(samples), 'shards': []} for split, samples in plan.items()}
+    }
+
+    start = time.perf_counter()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for job, shard in zip(jobs, executor.map(render_shard, jobs)):
+            index['splits'][job['split']]['shards'].append(shard)
+            done += shard['records']
+            elapsed = time.perf_counter() - start
+            print(f"   {done}/{count} örnek ({done / elapsed * 3600:,.0f} örnek/saat)", file=sys.stderr)
+
+    with open(output_dir / INDEX_FILE, 'wb') as f:
+        f.write(encode_index(index))
+    return index
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Osmanlıca OCR eğitimi için sentetik satır görüntüleri üret")
+    parser.add_argument('--samples', type=int, default=10000, help="Üretilecek örnek sayısı")
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR), help="Parçaların yazılacağı klasör")
+    parser.add_argument('--shard-size', type=int, default=1000, help="Parça başına örnek")
+    parser.add_argument('--workers', type=int, help="Süreç sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument('--seed', type=int, default=42, help="Karıştırma ve bozulma tohumu")
+    parser.add_argument('--val-fraction', type=float, default=0.05, help="Doğrulama kümesi oranı")
+    parser.add_argument('--height', type=int, default=LINE_HEIGHT, help="Satır görüntüsü yüksekliği")
+    parser.add_argument('--max-width', type=int, default=MAX_LINE_WIDTH, help="En fazla satır genişliği")
+    parser.add_argument('--augment-strength', type=float, default=1.0, help="Bozulma şiddeti (0 = temiz)")
+    parser.add_argument('--fonts', help="Virgülle ayrılmış font dosyaları (varsayılan: sistemdeki Arap harfli fontlar)")
+    parser.add_argument('--limit-lines', type=int, help="Kullanılacak en fazla metin satırı")
+    args = parser.parse_args(argv)
+
+    fonts = [font for font in (args.fonts or '').split(',') if font] or find_arabic_fonts()
+    if not fonts:
+        print("❌ Arap harfli font bulunamadı (--fonts ile belirtin)", file=sys.stderr)
+        sys.exit(1)
+
+    pairs = load_line_pairs(args.limit_lines)
+    if not pairs:
+        print("❌ Metin satırı bulunamadı", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"🚀 {len(pairs)} satırdan {args.samples} örnek üretiliyor ({len(fonts)} font)...", file=sys.stderr)
+
+    index = generate(pairs, output_dir, args.samples, fonts, args.shard_size, args.seed, args.val_fraction,
+                     args.workers, args.height, args.max_width, args.augment_strength)
+    for split, info in index['splits'].items():
+        print(f"✅ {split}: {info['records']} örnek, {len(info['shards'])} parça", file=sys.stderr)
+    print(json.dumps({'output_dir': str(output_dir), 'total_records': index['total_records']}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
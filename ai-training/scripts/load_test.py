@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yük Testi
+Web route'larının Python betiklerini çağırma biçimini eşzamanlı isteklerle
+yeniden üretir ve aynı iş yükünü farklı dağıtım biçimlerinde ölçer:
+
+    spawn  her istek için yeni süreç (route.ts gibi): çeviri metni
+           ai-training/temp altına geçici dosya olarak yazılır, görüntü stdin'den
+           (ya da --ocr-input file ile geçici dosyadan) verilir; 60 sn zaman
+           aşımı ve stdout JSON ayrıştırması route'larla aynıdır
+    stdio  --service-cmd ile başlatılan uzun ömürlü bir sürece stdin/stdout
+           üzerinden JSON satırları
+    tcp    --address host:port adresindeki servise aynı JSON satırları
+
+Servis protokolü (satır başına bir JSON nesnesi, yanıtlar sırasız gelebilir):
+
+    {"id": 7, "op": "translate", "text": "..."}
+    {"id": 8, "op": "ocr", "image_path": "...", "mode": "regions"}
+    -> {"id": 7, "success": true, ...betiğin stdout JSON'u ile aynı alanlar}
+
+Rapor: istek/sn, gecikme yüzdelikleri, hatalar, zaman aşımları, CPU
+doygunluğu (/proc/stat örneklemesi) ve geride kalan geçici dosyalar.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+AI_TRAINING_DIR = SCRIPT_DIR.parent
+REPO_DIR = AI_TRAINING_DIR.parent
+sys.path.insert(0, str(AI_TRAINING_DIR))
+
+# Route'ların kullandığı geçici klasör ve zaman aşımı
+TEMP_DIR = AI_TRAINING_DIR / 'temp'
+DEFAULT_TIMEOUT = 60.0
+
+SCRIPTS = {
+    'translate': AI_TRAINING_DIR / 'advanced_ottoman_translator.py',
+    'ocr': AI_TRAINING_DIR / 'tesseract_ottoman_ocr.py',
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Bu orandan yoğun CPU örnekleri "doygun" sayılır
+SATURATION_THRESHOLD = 0.95
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'translate=3,ocr=1' -> {'translate': 0.75, 'ocr': 0.25}"""
+    weights = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        kind, _, weight = item.partition('=')
+        kind = kind.strip()
+        if kind not in SCRIPTS:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen istek türü: {kind} ({', '.join(SCRIPTS)})")
+        weights[kind] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("İstek karışımı boş")
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def load_texts(limit: int = 2000, seed: int = 42) -> List[str]:
+    """merged_mapping.txt kelimelerinden 3-12 kelimelik çeviri girdileri üret"""
+    from corpus_io import read_pairs
+
+    mapping_file = AI_TRAINING_DIR / 'merged_mapping.txt'
+    words = [ottoman for ottoman, _, _ in read_pairs(str(mapping_file))[0]] if mapping_file.exists() else []
+    if not words:
+        return ['كتاب مكتب', 'دولت عليه عثمانيه']
+
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(3, 12))) for _ in range(limit)]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Sıralı olmayan listeden en yakın sıra yöntemiyle yüzdelik"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class CPUSampler:
+    """Sistem geneli CPU doluluğunu arka planda /proc/stat'tan örnekler
+
+    /proc/stat olmayan sistemlerde 1 dakikalık yük ortalaması / çekirdek sayısı
+    kullanılır.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _read_times() -> Optional[Tuple[int, int]]:
+        try:
+            with open('/proc/stat', 'r') as f:
+                fields = [int(value) for value in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        # idle + iowait boşta geçen süredir
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        return sum(fields), idle
+
+    def _run(self):
+        previous = self._read_times()
+        while not self._stop.wait(self.interval):
+            if previous is None:
+                if hasattr(os, 'getloadavg'):
+                    self.samples.append(min(os.getloadavg()[0] / (os.cpu_count() or 1), 1.0))
+                continue
+            current = self._read_times()
+            total, idle = current[0] - previous[0], current[1] - previous[1]
+            if total > 0:
+                self.samples.append(1.0 - idle / total)
+            previous = current
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self) -> Dict:
+        if not self.samples:
+            return {'cores': os.cpu_count(), 'samples': 0}
+        return {
+            'cores': os.cpu_count(),
+            'samples': len(self.samples),
+            'mean_busy': sum(self.samples) / len(self.samples),
+            'max_busy': max(self.samples),
+            'saturated_fraction': sum(1 for s in self.samples if s >= SATURATION_THRESHOLD) / len(self.samples)
+        }
+
+
+class SpawnTarget:
+    """Her istek için betiği yeni süreçte çalıştırır (route.ts'teki exec/spawn gibi)"""
+
+    name = 'spawn'
+
+    def __init__(self, python: str = sys.executable, timeout: float = DEFAULT_TIMEOUT,
+                 ocr_input: str = 'stdin', ocr_mode: str = 'regions', cleanup: str = 'route',
+                 extra_args: Optional[List[str]] = None):
+        self.python = python
+        self.timeout = timeout
+        self.ocr_input = ocr_input
+        self.ocr_mode = ocr_mode
+        self.cleanup = cleanup
+        self.extra_args = extra_args or []
+        self.env = {**os.environ, 'PYTHONIOENCODING': 'utf-8'}
+
+    def _temp_file(self, request_id: int, suffix: str, data: bytes) -> str:
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        # route.ts Date.now() kullanır; eşzamanlı isteklerde çakışmasın diye kimlik eklenir
+        path = TEMP_DIR / f"loadtest_{int(time.time() * 1000)}_{request_id}{suffix}"
+        with open(path, 'wb') as f:
+            f.write(data)
+        return str(path)
+
+    def call(self, request_id: int, kind: str, payload) -> Dict:
+        temp_path = None
+        stdin_data = None
+        if kind == 'translate':
+            temp_path = self._temp_file(request_id, '.txt', payload.encode('utf-8'))
+            args = [temp_path]
+        elif self.ocr_input == 'stdin':
+            with open(payload, 'rb') as f:
+                stdin_data = f.read()
+            args = ['--stdin', '--mode', self.ocr_mode]
+        else:
+            with open(payload, 'rb') as f:
+                temp_path = self._temp_file(request_id, Path(payload).suffix, f.read())
+            args = [temp_path, '--mode', self.ocr_mode]
+
+        process = subprocess.Popen(
+            [self.python, str(SCRIPTS[kind]), *args, *self.extra_args],
+            cwd=str(AI_TRAINING_DIR), env=self.env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            stdout, stderr = process.communicate(stdin_data, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            # Node'un exec zaman aşımı gibi süreç öldürülür; route'lar bu yolda
+            # geçici dosyayı silmediği için 'route' temizliğinde dosya kalır
+            process.kill()
+            process.communicate()
+            if self.cleanup == 'always' and temp_path:
+                os.unlink(temp_path)
+            raise TimeoutError(f"{kind} {self.timeout:g} sn içinde bitmedi")
+
+        if temp_path and (self.cleanup == 'always' or process.returncode == 0):
+            os.unlink(temp_path)
+        if process.returncode != 0:
+            raise RuntimeError(f"çıkış kodu {process.returncode}: {stderr.decode('utf-8', 'replace')[-200:]}")
+        return json.loads(stdout.decode('utf-8').strip())
+
+    def close(self):
+        pass
+
+
+class StdioTarget:
+    """Uzun ömürlü bir sürece stdin/stdout JSON satırlarıyla istek gönderir
+
+    Tek boru üzerinden eşzamanlı istekler kimlikle eşleştirilir; yanıtları
+    ayrı bir iş parçacığı okur.
+    """
+
+    name = 'stdio'
+
+    def __init__(self, command: str, timeout: float = DEFAULT_TIMEOUT, ocr_mode: str = 'regions'):
+        import shlex
+
+        self.timeout = timeout
+        self.ocr_mode = ocr_mode
+        self.process = subprocess.Popen(
+            shlex.split(command), cwd=str(AI_TRAINING_DIR),
+            env={**os.environ, 'PYTHONIOENCODING': 'utf-8'},
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8', bufsize=1
+        )
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def _read_responses(self):
+        for line in self.process.stdout:
+            if not line.strip():
+                continue
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Servisten geçersiz satır: {line[:200]!r}", file=sys.stderr)
+                continue
+            with self._lock:
+                future = self._pending.pop(response.get('id'), None)
+            if future is not None:
+                future.set_result(response)
+
+        # Servis kapandı: bekleyen istekler hata alır
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError("servis süreci sonlandı"))
+
+    def call(self, request_id: int, kind: str, payload) -> Dict:
+        future: Future = Future()
+        with self._lock:
+            self._pending[request_id] = future
+            self.process.stdin.write(json.dumps(service_request(request_id, kind, payload, self.ocr_mode),
+                                                ensure_ascii=False) + '\n')
+            self.process.stdin.flush()
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(f"{kind} {self.timeout:g} sn içinde yanıtlanmadı")
+
+    def close(self):
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class TCPTarget:
+    """host:port adresindeki servise JSON satırları gönderir (iş parçacığı başına bir bağlantı)"""
+
+    name = 'tcp'
+
+    def __init__(self, address: str, timeout: float = DEFAULT_TIMEOUT, ocr_mode: str = 'regions'):
+        host, _, port = address.rpartition(':')
+        self.address = (host or '127.0.0.1', int(port))
+        self.timeout = timeout
+        self.ocr_mode = ocr_mode
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            connection = (sock, sock.makefile('r', encoding='utf-8'))
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def call(self, request_id: int, kind: str, payload) -> Dict:
+        sock, reader = self._connection()
+        request = json.dumps(service_request(request_id, kind, payload, self.ocr_mode), ensure_ascii=False)
+        try:
+            sock.sendall((request + '\n').encode('utf-8'))
+            line = reader.readline()
+        except socket.timeout:
+            # Yanıtı sonradan gelecek bağlantı kullanılamaz; yenisi açılır
+            self._local.connection = None
+            sock.close()
+            raise TimeoutError(f"{kind} {self.timeout:g} sn içinde yanıtlanmadı")
+        if not line:
+            self._local.connection = None
+            raise RuntimeError("servis bağlantıyı kapattı")
+        return json.loads(line)
+
+    def close(self):
+        for sock, reader in self._connections:
+            reader.close()
+            sock.close()
+
+
+def service_request(request_id: int, kind: str, payload, ocr_mode: str) -> Dict:
+    if kind == 'translate':
+        return {'id': request_id, 'op': 'translate', 'text': payload}
+    return {'id': request_id, 'op': 'ocr', 'image_path': os.path.abspath(payload), 'mode': ocr_mode}
+
+
+def build_workload(mix: Dict[str, float], count: int, texts: List[str], images: List[str],
+                   seed: int) -> List[Tuple[str, object]]:
+    """Karışıma göre (tür, girdi) istek listesi; aynı tohum aynı iş yükünü verir"""
+    rng = random.Random(seed)
+    kinds, weights = list(mix), list(mix.values())
+    workload = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        workload.append((kind, rng.choice(texts) if kind == 'translate' else rng.choice(images)))
+    return workload
+
+
+def latency_summary(latencies: List[float]) -> Dict:
+    milliseconds = [latency * 1000 for latency in latencies]
+    summary = {f'p{q}': percentile(milliseconds, q) for q in PERCENTILES}
+    summary['mean'] = sum(milliseconds) / len(milliseconds) if milliseconds else None
+    summary['max'] = max(milliseconds) if milliseconds else None
+    return summary
+
+
+def run_load(target, workload: List[Tuple[str, object]], concurrency: int) -> Dict:
+    """İş yükünü verilen eşzamanlılıkla çalıştır ve türe göre sonuçları topla"""
+    results = []
+    results_lock = threading.Lock()
+
+    def execute(request_id: int, kind: str, payload):
+        start = time.perf_counter()
+        status, error = 'ok', None
+        try:
+            response = target.call(request_id, kind, payload)
+            if not response.get('success'):
+                status, error = 'error', response.get('error', 'success=false')
+        except TimeoutError as e:
+            status, error = 'timeout', str(e)
+        except Exception as e:
+            status, error = 'error', f"{type(e).__name__}: {e}"
+        with results_lock:
+            results.append({'kind': kind, 'status': status, 'latency': time.perf_counter() - start,
+                            'error': error})
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for request_id, (kind, payload) in enumerate(workload):
+            executor.submit(execute, request_id, kind, payload)
+    wall_time = time.perf_counter() - wall_start
+
+    def summarize(items: List[Dict]) -> Dict:
+        errors = [item['error'] for item in items if item['status'] == 'error']
+        return {
+            'requests': len(items),
+            'ok': sum(1 for item in items if item['status'] == 'ok'),
+            'errors': len(errors),
+            'timeouts': sum(1 for item in items if item['status'] == 'timeout'),
+            'latency_ms': latency_summary([item['latency'] for item in items if item['status'] == 'ok']),
+            'sample_errors': sorted(set(errors))[:5]
+        }
+
+    overall = summarize(results)
+    overall['wall_time'] = wall_time
+    overall['throughput_rps'] = overall['ok'] / wall_time if wall_time > 0 else 0.0
+    return {
+        'overall': overall,
+        'by_kind': {kind: summarize([item for item in results if item['kind'] == kind])
+                    for kind in sorted({item['kind'] for item in results})}
+    }
+
+
+def child_cpu_seconds() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def print_summary(report: Dict):
+    overall = report['results']['overall']
+    print(f"\n📊 {report['config']['target']} | eşzamanlılık {report['config']['concurrency']} | "
+          f"{overall['requests']} istek / {overall['wall_time']:.1f} sn", file=sys.stderr)
+    print(f"   ✅ {overall['throughput_rps']:.2f} istek/sn, {overall['errors']} hata, "
+          f"{overall['timeouts']} zaman aşımı", file=sys.stderr)
+    for kind, summary in report['results']['by_kind'].items():
+        latency = summary['latency_ms']
+        if latency['p50'] is None:
+            print(f"   [{kind}] başarılı istek yok", file=sys.stderr)
+            continue
+        print(f"   [{kind}] p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, "
+              f"p99 {latency['p99']:.0f} ms, max {latency['max']:.0f} ms", file=sys.stderr)
+        for error in summary['sample_errors']:
+            print(f"      ❌ {error}", file=sys.stderr)
+    cpu = report['cpu']
+    if cpu.get('samples'):
+        print(f"   🖥️ CPU ort. %{cpu['mean_busy'] * 100:.0f}, tepe %{cpu['max_busy'] * 100:.0f}, "
+              f"doygun örnek %{cpu['saturated_fraction'] * 100:.0f} ({cpu['cores']} çekirdek)", file=sys.stderr)
+    leaked = report['temp_files']['leaked']
+    mark = '⚠️' if leaked else '✅'
+    print(f"   {mark} geride kalan geçici dosya: {len(leaked)}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Çeviri ve OCR betikleri için yük testi")
+    parser.add_argument('--target', choices=('spawn', 'stdio', 'tcp'), default='spawn',
+                        help="spawn: istek başına süreç (route'lar gibi), stdio/tcp: uzun ömürlü servis")
+    parser.add_argument('--service-cmd', help="stdio hedefi için servis komutu")
+    parser.add_argument('--address', help="tcp hedefi için host:port")
+    parser.add_argument('--requests', type=int, default=50, help="Toplam istek sayısı")
+    parser.add_argument('--concurrency', type=int, default=4, help="Eşzamanlı istek sayısı")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('translate=1'),
+                        help="İstek karışımı, ör. translate=3,ocr=1")
+    parser.add_argument('--images', default=str(REPO_DIR / 'test-pictures' / '*.png'),
+                        help="OCR istekleri için görüntü deseni")
+    parser.add_argument('--ocr-mode', default='regions', help="OCR işlem modu")
+    parser.add_argument('--ocr-input', choices=('stdin', 'file'), default='stdin',
+                        help="spawn hedefinde görüntüyü stdin'den ya da geçici dosyadan ver")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="İstek başına zaman aşımı (sn)")
+    parser.add_argument('--cleanup', choices=('route', 'always'), default='route',
+                        help="route: geçici dosyayı route'lar gibi yalnızca başarıda sil, always: her durumda sil")
+    parser.add_argument('--no-cache', action='store_true', help="spawn hedefinde betiklere --no-cache geçir")
+    parser.add_argument('--python', default=sys.executable, help="spawn hedefinin Python yorumlayıcısı")
+    parser.add_argument('--seed', type=int, default=42, help="İş yükü tohumu")
+    parser.add_argument('--output', help="JSON raporun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    images = sorted(glob.glob(args.images)) if 'ocr' in args.mix else []
+    if 'ocr' in args.mix and not images:
+        parser.error(f"OCR istekleri için görüntü bulunamadı: {args.images}")
+    texts = load_texts(seed=args.seed) if 'translate' in args.mix else []
+    workload = build_workload(args.mix, args.requests, texts, images, args.seed)
+
+    if args.target == 'spawn':
+        target = SpawnTarget(args.python, args.timeout, args.ocr_input, args.ocr_mode, args.cleanup,
+                             ['--no-cache'] if args.no_cache else [])
+    elif args.target == 'stdio':
+        if not args.service_cmd:
+            parser.error("stdio hedefi için --service-cmd gerekli")
+        target = StdioTarget(args.service_cmd, args.timeout, args.ocr_mode)
+    else:
+        if not args.address:
+            parser.error("tcp hedefi için --address gerekli")
+        target = TCPTarget(args.address, args.timeout, args.ocr_mode)
+
+    temp_before = set(os.listdir(TEMP_DIR)) if TEMP_DIR.exists() else set()
+    cpu_before = child_cpu_seconds()
+    print(f"🚀 {args.target}: {args.requests} istek, eşzamanlılık {args.concurrency}, "
+          f"karışım {', '.join(f'{kind}={share:.0%}' for kind, share in args.mix.items())}", file=sys.stderr)
+
+    try:
+        with CPUSampler() as sampler:
+            results = run_load(target, workload, args.concurrency)
+    finally:
+        target.close()
+
+    temp_after = set(os.listdir(TEMP_DIR)) if TEMP_DIR.exists() else set()
+    cpu_after = child_cpu_seconds()
+    cpu = sampler.summary()
+    if cpu_before is not None:
+        # stdio hedefinde servis süreci kapandıktan sonra sayılır
+        cpu['child_cpu_seconds'] = cpu_after - cpu_before
+
+    report = {
+        'created_at': time.time(),
+        'config': {
+            'target': args.target,
+            'service': args.service_cmd or args.address,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'mix': args.mix,
+            'timeout': args.timeout,
+            'ocr_mode': args.ocr_mode,
+            'ocr_input': args.ocr_input,
+            'cleanup': args.cleanup,
+            'seed': args.seed
+        },
+        'results': results,
+        'cpu': cpu,
+        'temp_files': {
+            'dir': str(TEMP_DIR),
+            'before': len(temp_before),
+            'after': len(temp_after),
+            'leaked': sorted(temp_after - temp_before)
+        }
+    }
+
+    print_summary(report)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"💾 Rapor kaydedildi: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,60 @@ oe_tr.txt ve oe_tr.xlsx dosyalarını görsel eğitim sistemine entegre eder
 """
 
 import pandas as pd
+import numpy as np
+import hashlib
 import json
 import os
+import sys
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from corpus_io import format_stats, read_pairs
+from beam_decoder import WordNgramModel
+from corpus_stats import build_pair_statistics
+from dataset_shards import (DEFAULT_SEED, DEFAULT_SHARD_SIZE, DEFAULT_VAL_FRACTION,
+                            INDEX_FILE, encode_index, encode_shards)
+from pair_store import PairStore, encode_pair_store, encode_pairs_jsonl
+
+# Bu boyutun üzerindeki Excel dosyaları salt okunur akış modunda işlenir
+XLSX_STREAMING_THRESHOLD = 50 * 1024 * 1024
+
+# Excel'de Osmanlıca ve Türkçe sütun başlıkları
+XLSX_COLUMNS = ('OE', 'TR')
+
+# Çeviri çiftleri çıktı biçimleri:
+#   json    - tek parça translation_pairs.json (geriye dönük uyumlu)
+#   compact - mmap ile rastgele erişilen sütunlu translation_pairs.bin
+#   jsonl   - akışla okunabilen translation_pairs.jsonl
+OUTPUT_FORMATS = ('json', 'compact', 'jsonl', 'shards')
+
+# Çift olarak ayrıştırılmayan ama çıktıları etkileyen girdiler (kelime dil modeli)
+MERGED_MAPPING_FILE = Path(__file__).resolve().parent.parent / 'merged_mapping.txt'
+
+# build_manifest.json biçim sürümü; değişirse tam yeniden derleme yapılır
+MANIFEST_VERSION = 1
+
 class OETRDataProcessor:
     """Osmanlıca-Türkçe veri setlerini işleyen sınıf"""
     
     def __init__(self):
         self.data_dir = Path("..")  # Ana dizin
         self.output_dir = Path("data/training")
+        self.output_formats = ('json',)
+
+        # 'shards' biçimi için parça ayarları
+        self.shard_size = DEFAULT_SHARD_SIZE
+        self.shard_seed = DEFAULT_SEED
+        self.val_fraction = DEFAULT_VAL_FRACTION
+
+        # Artımlı derleme: değişmeyen kaynaklar yeniden ayrıştırılmaz,
+        # içeriği değişmeyen çıktılar yeniden yazılmaz
+        self.incremental = True
+        self._manifest = None
+        self._written_outputs = {}
         self.character_mappings = self._load_character_mappings()
         
     def _load_character_mappings(self) -> Dict[str, str]:
@@ -31,126 +73,229 @@ class OETRDataProcessor:
             'ز': 'z', 'و': 'v', 'ى': 'i', 'ﻻ': 'la', 'ﷲ': 'allah',
         }
     
-    def process_txt_file(self, file_path: str) -> List[Dict]:
-        """TXT dosyasını işle"""
+    def process_txt_file(self, file_path: str) -> Optional[List[Dict]]:
+        """TXT dosyasını işle (ayrıştırılamazsa None)"""
         print(f"📖 TXT dosyası işleniyor: {file_path}")
         
-        word_pairs = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line and '\t' in line:
-                        parts = line.split('\t')
-                        if len(parts) >= 2:
-                            ottoman = parts[0].strip()
-                            turkish = parts[1].strip()
-                            
-                            if ottoman and turkish:
-                                word_pairs.append({
-                                    'ottoman': ottoman,
-                                    'turkish': turkish,
-                                    'source': 'txt',
-                                    'line': line_num
-                                })
+            # Kodlama tespiti, büyük parçalarla okuma ve paralel ayrıştırma
+            pairs, stats = read_pairs(file_path)
+            word_pairs = [
+                {'ottoman': ottoman, 'turkish': turkish, 'source': 'txt', 'line': line_num}
+                for ottoman, turkish, line_num in pairs
+            ]
             
+            print(f"📋 {format_stats(stats)}")
             print(f"✅ TXT dosyası işlendi: {len(word_pairs)} kelime çifti")
             return word_pairs
             
         except Exception as e:
             print(f"❌ TXT dosyası işlenemedi: {e}")
-            return []
+            return None
     
-    def process_xlsx_file(self, file_path: str) -> List[Dict]:
-        """XLSX dosyasını işle"""
+    def process_xlsx_file(self, file_path: str, streaming: Optional[bool] = None) -> Optional[List[Dict]]:
+        """XLSX dosyasını işle (ayrıştırılamazsa None)
+
+        streaming: True ise çalışma kitabı salt okunur modda satır satır okunur
+                   (belleğe sığmayan dosyalar için); None ise dosya boyutuna göre seçilir
+        """
         print(f"📊 XLSX dosyası işleniyor: {file_path}")
         
-        word_pairs = []
         try:
-            df = pd.read_excel(file_path)
-            print(f"📈 Excel dosyası yüklendi: {len(df)} satır")
-            print(f"📋 Sütunlar: {list(df.columns)}")
-            
-            for index, row in df.iterrows():
-                ottoman = str(row.get('OE', '')).strip()
-                turkish = str(row.get('TR', '')).strip()
-                
-                if ottoman and turkish and ottoman != 'nan' and turkish != 'nan':
-                    word_pairs.append({
-                        'ottoman': ottoman,
-                        'turkish': turkish,
-                        'source': 'xlsx',
-                        'line': index + 1
-                    })
+            if streaming is None:
+                streaming = os.path.getsize(file_path) > XLSX_STREAMING_THRESHOLD
+
+            if streaming:
+                print("🌊 Salt okunur akış modu kullanılıyor")
+                word_pairs = list(self.iter_xlsx_pairs(file_path))
+            else:
+                word_pairs = self._read_xlsx_pairs(file_path)
             
             print(f"✅ XLSX dosyası işlendi: {len(word_pairs)} kelime çifti")
             return word_pairs
             
         except Exception as e:
             print(f"❌ XLSX dosyası işlenemedi: {e}")
+            return None
+
+    def _read_xlsx_pairs(self, file_path: str) -> List[Dict]:
+        """Yalnızca OE/TR sütunlarını okuyup vektörel olarak temizle ve filtrele"""
+        df = pd.read_excel(
+            file_path,
+            usecols=lambda column: str(column).strip() in XLSX_COLUMNS,
+            dtype=str
+        )
+        df.columns = [str(column).strip() for column in df.columns]
+        print(f"📈 Excel dosyası yüklendi: {len(df)} satır")
+        print(f"📋 Sütunlar: {list(df.columns)}")
+
+        if not all(column in df.columns for column in XLSX_COLUMNS):
             return []
+
+        ottoman = df['OE'].str.strip()
+        turkish = df['TR'].str.strip()
+        valid = (
+            ottoman.notna() & turkish.notna()
+            & ottoman.ne('') & turkish.ne('')
+            & ottoman.ne('nan') & turkish.ne('nan')
+        ).to_numpy()
+
+        lines = np.flatnonzero(valid) + 1
+        return [
+            {'ottoman': o, 'turkish': t, 'source': 'xlsx', 'line': int(line)}
+            for o, t, line in zip(ottoman.to_numpy()[valid], turkish.to_numpy()[valid], lines)
+        ]
+
+    def iter_xlsx_pairs(self, file_path: str) -> Iterator[Dict]:
+        """Çalışma kitabını salt okunur modda satır satır okuyarak çiftleri üret"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+            if not all(column in header for column in XLSX_COLUMNS):
+                return
+            ottoman_index, turkish_index = (header.index(column) for column in XLSX_COLUMNS)
+
+            for line, row in enumerate(rows, 1):
+                if len(row) <= max(ottoman_index, turkish_index):
+                    continue
+                ottoman, turkish = row[ottoman_index], row[turkish_index]
+                if ottoman is None or turkish is None:
+                    continue
+                ottoman, turkish = str(ottoman).strip(), str(turkish).strip()
+                if ottoman and turkish and ottoman != 'nan' and turkish != 'nan':
+                    yield {'ottoman': ottoman, 'turkish': turkish, 'source': 'xlsx', 'line': line}
+        finally:
+            workbook.close()
     
     def analyze_characters(self, word_pairs: List[Dict]) -> Dict:
-        """Karakter analizi yap"""
-        character_frequency = {}
+        """Karakter analizi yap
+
+        Frekanslar tüm derlem üzerinde vektörel olarak sayılır (corpus_stats);
+        örnekler yalnızca eşleştirme tablosundaki karakterler için toplanır.
+        """
+        ottoman_stats, turkish_stats = build_pair_statistics(word_pairs)
+        character_frequency = {
+            char: count for char, count in ottoman_stats.character_frequencies().items()
+            if char in self.character_mappings
+        }
         character_examples = {}
         
+        # Her karakter için max 10 örnek; tüm karakterler dolunca dur
+        pending = set(character_frequency)
         for pair in word_pairs:
+            if not pending:
+                break
             ottoman_text = pair['ottoman']
             
-            for char in ottoman_text:
-                if char in self.character_mappings:
-                    character_frequency[char] = character_frequency.get(char, 0) + 1
-                    
-                    if char not in character_examples:
-                        character_examples[char] = []
-                    
-                    if len(character_examples[char]) < 10:  # Her karakter için max 10 örnek
-                        character_examples[char].append({
-                            'ottoman': ottoman_text,
-                            'turkish': pair['turkish']
-                        })
+            # Metin sırasıyla gezilir: küme sırası PYTHONHASHSEED'e bağlı olduğundan
+            # örnek listeleri (ve çıktı dosyası) çalıştırmadan çalıştırmaya değişirdi
+            for char in dict.fromkeys(ottoman_text):
+                if char not in pending:
+                    continue
+                examples = character_examples.setdefault(char, [])
+                examples.append({
+                    'ottoman': ottoman_text,
+                    'turkish': pair['turkish']
+                })
+                if len(examples) >= 10:
+                    pending.discard(char)
         
         return {
             'frequency': character_frequency,
-            'examples': character_examples
+            'examples': character_examples,
+            'ottoman_stats': ottoman_stats,
+            'turkish_stats': turkish_stats
         }
     
     def create_training_data(self, word_pairs: List[Dict], character_analysis: Dict):
         """Eğitim verileri oluştur"""
         
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
         # Ana çeviri çiftleri dosyası
-        translation_file = self.output_dir / "translation_pairs.json"
-        translation_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(translation_file, 'w', encoding='utf-8') as f:
-            json.dump({
+        if 'json' in self.output_formats:
+            translation_file = self.output_dir / "translation_pairs.json"
+            
+            if self._write_json(translation_file, {
                 'type': 'translation_pairs',
                 'data': word_pairs,
                 'count': len(word_pairs),
-                'sources': list(set([pair['source'] for pair in word_pairs]))
-            }, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Çeviri çiftleri kaydedildi: {translation_file}")
+                'sources': sorted(set([pair['source'] for pair in word_pairs]))
+            }):
+                print(f"✅ Çeviri çiftleri kaydedildi: {translation_file}")
+
+        # Sütunlu ikili depo (mmap, indeksle erişim)
+        if 'compact' in self.output_formats:
+            compact_file = self.output_dir / "translation_pairs.bin"
+            if self._write_output(compact_file, encode_pair_store(word_pairs)):
+                print(f"✅ Sütunlu çeviri çiftleri kaydedildi: {compact_file}")
+
+        # Satır başına bir çift (akışla okuma)
+        if 'jsonl' in self.output_formats:
+            jsonl_file = self.output_dir / "translation_pairs.jsonl"
+            if self._write_output(jsonl_file, encode_pairs_jsonl(word_pairs)):
+                print(f"✅ JSONL çeviri çiftleri kaydedildi: {jsonl_file}")
+
+        # Karıştırılmış eğitim/doğrulama parçaları
+        if 'shards' in self.output_formats:
+            self.create_shards(word_pairs)
+
         print(f"📊 Toplam {len(word_pairs)} çeviri çifti")
         
         # Karakter analizi dosyası
         char_file = self.output_dir / "character_analysis.json"
         
-        with open(char_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'type': 'character_analysis',
-                'frequency': character_analysis['frequency'],
-                'examples': character_analysis['examples'],
-                'total_characters': len(character_analysis['frequency'])
-            }, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Karakter analizi kaydedildi: {char_file}")
+        if self._write_json(char_file, {
+            'type': 'character_analysis',
+            'frequency': character_analysis['frequency'],
+            'examples': character_analysis['examples'],
+            'total_characters': len(character_analysis['frequency'])
+        }):
+            print(f"✅ Karakter analizi kaydedildi: {char_file}")
         print(f"📊 Toplam {len(character_analysis['frequency'])} benzersiz karakter")
+
+        # Tüm derlem için n-gram istatistikleri (aday sıralama için)
+        for side in ('ottoman', 'turkish'):
+            stats_file = self.output_dir / f"corpus_stats_{side}.npz"
+            if self._write_output(stats_file, character_analysis[f'{side}_stats'].to_bytes()):
+                print(f"✅ N-gram istatistikleri kaydedildi: {stats_file}")
+
+        # Işın araması için Türkçe kelime trigram modeli (oe_tr + merged_mapping)
+        word_lm_file = self.output_dir / "word_lm_turkish.npz"
+        if self._write_output(word_lm_file, self.build_word_model(word_pairs).to_bytes()):
+            print(f"✅ Kelime dil modeli kaydedildi: {word_lm_file}")
         
         # Her karakter için örnek dosyaları oluştur
         self.create_character_examples(character_analysis['examples'])
     
+    def build_word_model(self, word_pairs: List[Dict]) -> WordNgramModel:
+        """Çiftlerin ve merged_mapping.txt'nin Türkçe tarafından kelime trigram modeli"""
+        texts = [pair['turkish'] for pair in word_pairs]
+        if MERGED_MAPPING_FILE.exists():
+            pairs, _ = read_pairs(str(MERGED_MAPPING_FILE))
+            texts.extend(turkish for _, turkish, _ in pairs)
+        return WordNgramModel.from_texts(texts)
+
+    def create_shards(self, word_pairs: List[Dict]):
+        """Çiftleri sabit boyutlu, karıştırılmış JSONL parçalarına böl (shards/)"""
+        shards_dir = self.output_dir / "shards"
+        files, index = encode_shards(word_pairs, self.shard_size, self.shard_seed, self.val_fraction)
+
+        rewritten = sum(self._write_output(shards_dir / path, data) for path, data in files.items())
+        self._write_output(shards_dir / INDEX_FILE, encode_index(index))
+
+        # Parça sayısı azaldıysa eski parçaları sil
+        for stale in shards_dir.glob('*/shard-*.jsonl'):
+            if stale.relative_to(shards_dir).as_posix() not in files:
+                stale.unlink()
+
+        for split, info in index['splits'].items():
+            print(f"✅ {split}: {info['records']} kayıt, {len(info['shards'])} parça")
+        print(f"🧩 {rewritten}/{len(files)} parça yazıldı: {shards_dir}")
+
     def create_character_examples(self, character_examples: Dict):
         """Her karakter için örnek dosyaları oluştur"""
         
@@ -165,17 +310,160 @@ class OETRDataProcessor:
                 # Karakter için metin verisi dosyası
                 text_file = char_dir / "text_data.json"
                 
-                with open(text_file, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'character': char_name,
-                        'ottoman_char': char,
-                        'turkish_char': self.character_mappings.get(char, ''),
-                        'examples': examples,
-                        'count': len(examples)
-                    }, f, ensure_ascii=False, indent=2)
-                
-                print(f"✅ {char_name} için metin verisi oluşturuldu ({len(examples)} örnek)")
+                if self._write_json(text_file, {
+                    'character': char_name,
+                    'ottoman_char': char,
+                    'turkish_char': self.character_mappings.get(char, ''),
+                    'examples': examples,
+                    'count': len(examples)
+                }):
+                    print(f"✅ {char_name} için metin verisi oluşturuldu ({len(examples)} örnek)")
     
+    def _write_json(self, path: Path, data: Dict) -> bool:
+        """JSON çıktısını yaz (içerik değişmediyse dokunma)"""
+        return self._write_output(path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def _write_output(self, path: Path, data: bytes) -> bool:
+        """Çıktıyı içerik özeti manifestteki ile farklıysa yaz; yazıldıysa True"""
+        digest = hashlib.sha256(data).hexdigest()
+        relative = path.relative_to(self.output_dir).as_posix()
+        previous = (self._manifest or {}).get('outputs', {}).get(relative)
+
+        unchanged = (
+            self.incremental and previous is not None
+            and previous['sha256'] == digest
+            and path.exists() and path.stat().st_size == len(data)
+        )
+        if not unchanged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+        stat = path.stat()
+        self._written_outputs[relative] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return not unchanged
+
+    def _load_manifest(self) -> Dict:
+        """Önceki derlemenin manifestini yükle (yoksa ya da sürümü eskiyse boş)"""
+        manifest_file = self.output_dir / "build_manifest.json"
+        empty = {'version': MANIFEST_VERSION, 'sources': {}, 'inputs': {}, 'outputs': {}, 'settings': {}}
+        if not self.incremental or not manifest_file.exists():
+            return empty
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        return manifest if manifest.get('version') == MANIFEST_VERSION else empty
+
+    def _save_manifest(self):
+        """Manifesti kaydet"""
+        manifest_file = self.output_dir / "build_manifest.json"
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+
+    def _source_fingerprint(self, path: Path) -> Dict:
+        """Kaynak dosyanın özetini çıkar; boyut ve mtime değişmediyse eski özeti kullan"""
+        stat = path.stat()
+        previous = self._manifest['sources'].get(str(path)) or self._manifest.get('inputs', {}).get(str(path))
+        if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            digest = previous['sha256']
+        else:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(block)
+            digest = sha.hexdigest()
+        return {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _load_source(self, path: Path, kind: str, fingerprint: Dict) -> Optional[List[Dict]]:
+        """Kaynağı ayrıştır; içeriği değişmediyse ayrıştırılmış önbellekten yükle
+
+        Ayrıştırma başarısızsa None döner; önbellek yazılmaz, böylece kaynak
+        manifestte yer almaz ve sonraki çalıştırmada yeniden denenir.
+        """
+        # Önbellek dosyasının adı kaynağın özetini taşır; varsa içerik aynıdır
+        cache_file = self.output_dir / ".cache" / f"{kind}-{fingerprint['sha256'][:16]}.bin"
+
+        if self.incremental and cache_file.exists():
+            with PairStore(str(cache_file)) as store:
+                pairs = list(store)
+            print(f"♻️ {path.name} değişmedi, önbellekten yüklendi: {len(pairs)} kelime çifti")
+        else:
+            pairs = self.process_txt_file(str(path)) if kind == 'txt' else self.process_xlsx_file(str(path))
+            if pairs is None:
+                return None
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                f.write(encode_pair_store(pairs))
+
+        fingerprint['pairs'] = len(pairs)
+        fingerprint['cache'] = cache_file.relative_to(self.output_dir).as_posix()
+        return pairs
+
+    def _collect_sources(self) -> List[Tuple[Path, str, Dict]]:
+        """Mevcut kaynakları (TXT ve XLSX) özetleriyle birlikte listele"""
+        sources = []
+        for source_file, kind in ((self.data_dir / "oe_tr.txt", 'txt'), (self.data_dir / "oe_tr.xlsx", 'xlsx')):
+            if source_file.exists():
+                sources.append((source_file, kind, self._source_fingerprint(source_file)))
+            else:
+                print(f"⚠️ {kind.upper()} dosyası bulunamadı: {source_file}")
+        return sources
+
+    def _collect_inputs(self) -> Dict[str, Dict]:
+        """Çift kaynakları dışındaki girdilerin özetleri (yalnızca var olanlar)"""
+        return {str(path): self._source_fingerprint(path) for path in (MERGED_MAPPING_FILE,) if path.exists()}
+
+    def load_pairs(self) -> List[Dict]:
+        """Tüm kaynakların birleştirilmiş, tekrarsız çiftlerini yükle
+
+        Ayrıştırılmış önbellek varsa kullanılır; çıktı ve manifest yazılmaz.
+        Sentetik görüntü üretimi gibi çiftlere ihtiyaç duyan betikler içindir.
+        """
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        pair_lists = [self._load_source(path, kind, fingerprint) for path, kind, fingerprint in self._collect_sources()]
+        return self.merge_pairs([pairs for pairs in pair_lists if pairs is not None])
+
+    def _outputs_intact(self) -> bool:
+        """Manifestteki tüm çıktılar diskte değişmeden duruyor mu?"""
+        outputs = self._manifest.get('outputs', {})
+        if not outputs:
+            return False
+        for relative, record in outputs.items():
+            path = self.output_dir / relative
+            if not path.exists():
+                return False
+            stat = path.stat()
+            if stat.st_size != record['size'] or stat.st_mtime_ns != record['mtime_ns']:
+                return False
+        return True
+
+    def merge_pairs(self, pair_lists: List[List[Dict]]) -> List[Dict]:
+        """Kaynakları birleştir; özet tabanlı olarak tekrarlanan çiftleri çıkar
+
+        Karşılaştırma Unicode NFC ve boşluk normalizasyonundan sonra yapılır;
+        ilk görülen çift (ve kaynağı) korunur.
+        """
+        merged = []
+        seen = set()
+        duplicates = 0
+        for pairs in pair_lists:
+            for pair in pairs:
+                ottoman = ' '.join(unicodedata.normalize('NFC', pair['ottoman']).split())
+                turkish = ' '.join(unicodedata.normalize('NFC', pair['turkish']).split())
+                key = hashlib.blake2b(f"{ottoman}\t{turkish}".encode('utf-8'), digest_size=16).digest()
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                merged.append(pair)
+
+        print(f"🔗 Kaynaklar birleştirildi: {len(merged)} benzersiz çift, {duplicates} tekrar çıkarıldı")
+        return merged
+
     def get_character_name(self, char: str) -> str:
         """Karakter için klasör adını belirle"""
         char_mappings = {
@@ -234,23 +522,37 @@ class OETRDataProcessor:
         print("🚀 Osmanlıca-Türkçe Veri İşleme Başlatılıyor...")
         print("=" * 60)
         
-        all_word_pairs = []
-        
-        # TXT dosyasını işle
-        txt_file = self.data_dir / "oe_tr.txt"
-        if txt_file.exists():
-            txt_pairs = self.process_txt_file(str(txt_file))
-            all_word_pairs.extend(txt_pairs)
-        else:
-            print(f"⚠️ TXT dosyası bulunamadı: {txt_file}")
-        
-        # XLSX dosyasını işle
-        xlsx_file = self.data_dir / "oe_tr.xlsx"
-        if xlsx_file.exists():
-            xlsx_pairs = self.process_xlsx_file(str(xlsx_file))
-            all_word_pairs.extend(xlsx_pairs)
-        else:
-            print(f"⚠️ XLSX dosyası bulunamadı: {xlsx_file}")
+        self._manifest = self._load_manifest()
+        self._written_outputs = {}
+        settings = {'output_formats': sorted(self.output_formats)}
+        if 'shards' in self.output_formats:
+            settings['shards'] = {'size': self.shard_size, 'seed': self.shard_seed, 'val_fraction': self.val_fraction}
+
+        sources = self._collect_sources()
+        inputs = self._collect_inputs()
+        previous_sources = self._manifest['sources']
+        previous_inputs = self._manifest.get('inputs', {})
+        unchanged = (
+            self.incremental
+            and self._manifest['settings'] == settings
+            and set(previous_inputs) == set(inputs)
+            and all(previous_inputs[path]['sha256'] == fingerprint['sha256'] for path, fingerprint in inputs.items())
+            and set(previous_sources) == {str(path) for path, _, _ in sources}
+            and all(previous_sources[str(path)]['sha256'] == fingerprint['sha256']
+                    for path, _, fingerprint in sources)
+            and self._outputs_intact()
+        )
+        if unchanged:
+            print("✅ Kaynaklar değişmedi, tüm çıktılar güncel.")
+            return
+
+        pair_lists = [self._load_source(path, kind, fingerprint) for path, kind, fingerprint in sources]
+        # Ayrıştırılamayan kaynaklar manifeste girmez: sonraki çalıştırma onları yeniden dener
+        failed = [path for (path, _, _), pairs in zip(sources, pair_lists) if pairs is None]
+        for path in failed:
+            print(f"⚠️ {path.name} ayrıştırılamadı, manifeste kaydedilmeyecek")
+        sources = [source for source, pairs in zip(sources, pair_lists) if pairs is not None]
+        all_word_pairs = self.merge_pairs([pairs for pairs in pair_lists if pairs is not None])
         
         if not all_word_pairs:
             print("❌ Hiç kelime çifti bulunamadı!")
@@ -264,6 +566,28 @@ class OETRDataProcessor:
         print("\n📝 Eğitim verileri oluşturuluyor...")
         self.create_training_data(all_word_pairs, character_analysis)
         
+        # Manifesti güncelle: yalnızca bu derlemede üretilen çıktılar kalır
+        rewritten = sum(
+            1 for relative, record in self._written_outputs.items()
+            if self._manifest['outputs'].get(relative, {}).get('sha256') != record['sha256']
+        )
+        self._manifest = {
+            'version': MANIFEST_VERSION,
+            'sources': {str(path): fingerprint for path, _, fingerprint in sources},
+            'inputs': inputs,
+            'outputs': self._written_outputs,
+            'settings': settings
+        }
+        self._save_manifest()
+        print(f"🧾 {rewritten} çıktı yeniden yazıldı, {len(self._written_outputs) - rewritten} çıktı değişmedi")
+
+        # Kullanılmayan ayrıştırma önbelleklerini sil
+        cache_dir = self.output_dir / ".cache"
+        referenced = {fingerprint['cache'] for _, _, fingerprint in sources}
+        for cache_file in cache_dir.glob('*.bin'):
+            if cache_file.relative_to(self.output_dir).as_posix() not in referenced:
+                cache_file.unlink()
+        
         # İstatistikler
         self.generate_statistics(all_word_pairs, character_analysis)
         
@@ -272,7 +596,30 @@ class OETRDataProcessor:
 
 def main():
     """Ana fonksiyon"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Osmanlıca-Türkçe veri setlerini işle")
+    parser.add_argument('--format', default='json',
+                        help=f"Virgülle ayrılmış çıktı biçimleri ({', '.join(OUTPUT_FORMATS)})")
+    parser.add_argument('--full', action='store_true',
+                        help="Manifesti yok say, tüm kaynakları yeniden işle ve tüm çıktıları yaz")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="Parça başına kayıt (shards)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Parça karıştırma tohumu (shards)")
+    parser.add_argument('--val-fraction', type=float, default=DEFAULT_VAL_FRACTION,
+                        help="Doğrulama kümesi oranı (shards)")
+    args = parser.parse_args()
+
+    formats = tuple(item for item in args.format.split(',') if item)
+    for output_format in formats:
+        if output_format not in OUTPUT_FORMATS:
+            parser.error(f"Bilinmeyen çıktı biçimi: {output_format}")
+
     processor = OETRDataProcessor()
+    processor.output_formats = formats
+    processor.incremental = not args.full
+    processor.shard_size = args.shard_size
+    processor.shard_seed = args.seed
+    processor.val_fraction = args.val_fraction
     processor.run_processing()
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentetik Osmanlıca Metin Görüntüleri
+oe_tr ve merged_mapping metinlerini yerel Arap harfli fontlarla çizer.
+Doğru metni bilinen sayfalar OCR ölçümü ve eğitimi için kullanılır.
+"""
+
+import functools
+import glob
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus_io import read_pairs
+
+# Arap harflerini içeren yaygın fontlar (öncelik sırasıyla)
+FONT_CANDIDATES = [
+    'Amiri', 'Scheherazade', 'NotoNaskhArabic', 'NotoSansArabic', 'Lateef',
+    'trado', 'arial', 'tahoma', 'times', 'DejaVuSans',
+]
+
+FONT_DIRECTORIES = [
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+    r'C:\Windows\Fonts',
+]
+
+
+def find_arabic_fonts() -> List[str]:
+    """Sistemdeki Arap harfli font dosyalarını öncelik sırasıyla bul"""
+    files = []
+    for directory in FONT_DIRECTORIES:
+        if os.path.isdir(directory):
+            files.extend(glob.glob(os.path.join(directory, '**', '*.tt[fc]'), recursive=True))
+            files.extend(glob.glob(os.path.join(directory, '**', '*.otf'), recursive=True))
+
+    fonts = []
+    for candidate in FONT_CANDIDATES:
+        for path in sorted(files):
+            name = os.path.splitext(os.path.basename(path))[0].replace(' ', '').replace('-', '')
+            # Kalın/italik varyantlar yerine düz kesimi tercih et
+            if name.lower() == candidate.lower() or name.lower() == candidate.lower() + 'regular':
+                if path not in fonts:
+                    fonts.append(path)
+    return fonts
+
+
+def load_ottoman_lines(paths: List[str], limit: Optional[int] = None) -> List[str]:
+    """Sekmeyle ayrılmış eşleştirme dosyalarından Osmanlıca tarafı oku"""
+    lines = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+
+        pairs, _ = read_pairs(path)
+        for ottoman, _, _ in pairs:
+            lines.append(ottoman)
+            if limit and len(lines) >= limit:
+                return lines
+    return lines
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(font_path: str, font_size: int):
+    """Pillow fontunu yükle; raqm varsa Arapça şekillendirme ve RTL açılır
+
+    Font dosyasını her satırda yeniden açmamak için (yol, boyut) başına önbelleklenir.
+    """
+    try:
+        from PIL import ImageFont, features
+    except ImportError as e:
+        raise ImportError("Sentetik görüntüler için Pillow gerekli: pip install pillow") from e
+
+    if features.check('raqm'):
+        return ImageFont.truetype(font_path, font_size, layout_engine=ImageFont.Layout.RAQM), True
+    return ImageFont.truetype(font_path, font_size), False
+
+
+def render_line(text: str, font_path: str, font_size: int = 32, margin: int = 8) -> np.ndarray:
+    """Tek satırı beyaz zemin üzerine siyah olarak çiz (gri tonlamalı uint8)
+
+    raqm yoksa harfler bağlanmadan ve görsel sırada (ters çevrilerek) çizilir.
+    """
+    from PIL import Image, ImageDraw
+
+    font, shaped = _load_font(font_path, font_size)
+    kwargs = {'direction': 'rtl'} if shaped else {}
+    drawn = text if shaped else text[::-1]
+
+    left, top, right, bottom = font.getbbox(drawn, **kwargs)
+    width = max(right - left, 1) + 2 * margin
+    height = max(bottom - top, 1) + 2 * margin
+
+    image = Image.new('L', (width, height), 255)
+    ImageDraw.Draw(image).text((margin - left, margin - top), drawn, font=font, fill=0, **kwargs)
+    return np.asarray(image)
+
+
+def add_noise(image: np.ndarray, level: float, rng: np.random.Generator) -> np.ndarray:
+    """Gauss gürültüsü ve tuz-biber lekeleri ekle (level: 0 = temiz, 1 = çok gürültülü)"""
+    if level <= 0:
+        return image
+
+    noisy = image.astype(np.float32) + rng.normal(0.0, 64.0 * level, image.shape)
+    speckles = rng.random(image.shape) < 0.02 * level
+    noisy[speckles] = rng.choice([0.0, 255.0], size=int(speckles.sum()))
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def blur(image: np.ndarray, sigma: float) -> np.ndarray:
+    """Gauss bulanıklığı (odak kaçıklığı, düşük çözünürlüklü tarama)"""
+    if sigma <= 0:
+        return image
+    import cv2
+    return cv2.GaussianBlur(image, (0, 0), sigma)
+
+
+def skew(image: np.ndarray, angle: float, shear: float = 0.0) -> np.ndarray:
+    """Satırı derece cinsinden döndür ve yatay olarak eğ; taşan kısım beyazla doldurulur"""
+    if angle == 0 and shear == 0:
+        return image
+    import cv2
+
+    h, w = image.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    matrix[0, 1] += shear
+    matrix[0, 2] -= shear * h / 2
+
+    # Döndürülen satırın tamamı sığsın diye tuvali büyüt
+    corners = np.array([[0, 0, 1], [w, 0, 1], [0, h, 1], [w, h, 1]], dtype=np.float64) @ matrix.T
+    new_w = int(np.ceil(corners[:, 0].max() - corners[:, 0].min()))
+    new_h = int(np.ceil(corners[:, 1].max() - corners[:, 1].min()))
+    matrix[0, 2] -= corners[:, 0].min()
+    matrix[1, 2] -= corners[:, 1].min()
+    return cv2.warpAffine(image, matrix, (max(new_w, 1), max(new_h, 1)),
+                          flags=cv2.INTER_LINEAR, borderValue=255)
+
+
+def ink_bleed(image: np.ndarray, amount: int, rng: np.random.Generator) -> np.ndarray:
+    """Mürekkep dağılması: koyu alanları genişlet ve kenarları lekeli yumuşat"""
+    if amount <= 0:
+        return image
+    import cv2
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * amount + 1, 2 * amount + 1))
+    spread = cv2.erode(image, kernel)  # beyaz zeminde erode = mürekkebi büyüt
+    # Dağılma düzensiz olsun: yalnızca rastgele bir maskede uygula
+    mask = cv2.GaussianBlur((rng.random(image.shape) < 0.5).astype(np.float32), (0, 0), amount + 1) > 0.5
+    return np.where(mask, spread, image)
+
+
+def augment_line(image: np.ndarray, rng: np.random.Generator, strength: float = 1.0) -> Tuple[np.ndarray, Dict]:
+    """Satıra rastgele bulanıklık, eğiklik, mürekkep dağılması ve gürültü uygula
+
+    strength 0 ise görüntü değişmez; (görüntü, uygulanan parametreler) döner.
+    """
+    params = {
+        'angle': float(rng.normal(0.0, 1.5 * strength)) if rng.random() < 0.5 * strength else 0.0,
+        'shear': float(rng.normal(0.0, 0.15 * strength)) if rng.random() < 0.3 * strength else 0.0,
+        'ink_bleed': int(rng.integers(1, 3)) if rng.random() < 0.3 * strength else 0,
+        'blur': float(rng.uniform(0.3, 1.2 * strength)) if rng.random() < 0.5 * strength else 0.0,
+        'noise': float(rng.uniform(0.0, 0.3 * strength)) if rng.random() < 0.6 * strength else 0.0,
+    }
+
+    image = skew(image, params['angle'], params['shear'])
+    image = ink_bleed(image, params['ink_bleed'], rng)
+    image = blur(image, params['blur'])
+    image = add_noise(image, params['noise'], rng)
+    return image, params
+
+
+def render_page(lines: List[str], font_path: str, scale: float = 1.0, noise: float = 0.0,
+                seed: int = 0, page_width: int = 1200) -> Tuple[np.ndarray, str]:
+    """Satırları sağa hizalı bir sayfaya diz; (görüntü, doğru metin) döndür"""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    font_size = max(int(32 * scale), 8)
+    width = int(page_width * scale)
+    margin = int(40 * scale)
+
+    rendered = []
+    for line in lines:
+        strip = render_line(line, font_path, font_size)
+        if strip.shape[1] > width - 2 * margin:
+            factor = (width - 2 * margin) / strip.shape[1]
+            new_size = (width - 2 * margin, max(int(strip.shape[0] * factor), 1))
+            strip = np.asarray(Image.fromarray(strip).resize(new_size))
+        rendered.append(strip)
+
+    line_gap = int(font_size * 0.6)
+    height = 2 * margin + sum(strip.shape[0] for strip in rendered) + line_gap * max(len(rendered) - 1, 0)
+    page = np.full((max(height, 1), width), 255, dtype=np.uint8)
+
+    y = margin
+    for strip in rendered:
+        h, w = strip.shape
+        page[y:y + h, width - margin - w:width - margin] = strip
+        y += h + line_gap
+
+    return add_noise(page, noise, rng), '\n'.join(lines)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Soğuk Başlangıç Yardımcıları
+API her istekte yeni bir Python süreci başlattığı için içe aktarma süresi her
+çağrıda ödenir. Ağır bağımlılıklar (cv2, numpy, pytesseract) LazyModule ile ilk
+kullanıma kadar ertelenir; giriş betiklerinin içe aktarma süresi -X importtime
+ile ölçülür ve COLD_START_BUDGET_MS bütçesiyle karşılaştırılır
+(scripts/check_startup_budget.py).
+"""
+
+import importlib
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Giriş betiği -> ağır bağımlılıklar yüklenmeden içe aktarma bütçesi (ms)
+COLD_START_BUDGET_MS = {
+    'tesseract_ottoman_ocr': 60,
+    'advanced_ottoman_translator': 40,
+    'ocr_translation_pipeline': 80,
+}
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Yüklenmiş tembel modüller: ad -> yükleme süresi (saniye)
+_loaded: Dict[str, float] = {}
+
+
+class LazyModule:
+    """Modülü ilk öznitelik erişiminde içe aktaran vekil
+
+    Modül yoksa ImportError içe aktarmada değil, ilk kullanımda oluşur.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            _loaded[self._name] = time.perf_counter() - start
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute: str, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self) -> str:
+        state = 'yüklendi' if self.__dict__['_module'] is not None else 'yüklenmedi'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str):
+    """Modül zaten yüklüyse onu, değilse tembel vekilini döndür"""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def loaded_lazy_modules() -> Dict[str, float]:
+    """Bu süreçte yüklenen tembel modüller ve yükleme süreleri (ms)"""
+    return {name: seconds * 1000 for name, seconds in _loaded.items()}
+
+
+def measure_import(module: str, python: Optional[str] = None) -> Dict:
+    """Modülü yeni bir yorumlayıcıda -X importtime ile içe aktarıp süreleri ölç
+
+    Dönen 'total_ms' yorumlayıcı açılışı hariç, modülün kümülatif içe aktarma
+    süresidir; 'imports' en pahalı doğrudan bağımlılıkları listeler.
+    """
+    import subprocess
+
+    completed = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=_MODULE_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} içe aktarılamadı: {completed.stderr.strip().splitlines()[-1:]}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  self | cumulative |   paket" (girinti = iç içelik)
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append({'module': name.strip(), 'self_ms': int(self_us) / 1000,
+                        'cumulative_ms': int(cumulative_us) / 1000, 'depth': depth})
+
+    position = next((i for i, entry in enumerate(entries) if entry['module'] == module), None)
+    target = entries[position] if position is not None else None
+
+    # Bağımlılıklar modülden önce yazılır: hedefin hemen üstündeki daha derin
+    # satırlar onun alt ağacıdır, doğrudan bağımlılıklar bir alt seviyededir
+    direct = []
+    if target is not None:
+        for entry in reversed(entries[:position]):
+            if entry['depth'] <= target['depth']:
+                break
+            if entry['depth'] == target['depth'] + 1:
+                direct.append(entry)
+    return {
+        'module': module,
+        'total_ms': target['cumulative_ms'] if target else 0.0,
+        'budget_ms': COLD_START_BUDGET_MS.get(module),
+        'imports': sorted(direct, key=lambda entry: entry['cumulative_ms'], reverse=True)
+    }
+
+
+def startup_report(module: str, stages: Optional[Dict[str, float]] = None, top: int = 10) -> Dict:
+    """Giriş betiği için başlangıç raporu
+
+    stages: süreç içinde ölçülen aşama süreleri (ms), ör. {'init': ..., 'first_call': ...}
+    """
+    measured = measure_import(module)
+    return {
+        'module': module,
+        'import_ms': round(measured['total_ms'], 2),
+        'budget_ms': measured['budget_ms'],
+        'within_budget': measured['budget_ms'] is None or measured['total_ms'] <= measured['budget_ms'],
+        'top_imports': [
+            {'module': entry['module'], 'cumulative_ms': round(entry['cumulative_ms'], 2)}
+            for entry in measured['imports'][:top]
+        ],
+        'lazy_loaded_ms': {name: round(ms, 2) for name, ms in loaded_lazy_modules().items()},
+        'stages_ms': {name: round(ms, 2) for name, ms in (stages or {}).items()}
+    }
+
+
+def print_startup_report(report: Dict, stream=None):
+    """Raporu okunur biçimde (varsayılan stderr) yazdır"""
+    stream = stream or sys.stderr
+    budget = f" / bütçe {report['budget_ms']} ms" if report['budget_ms'] is not None else ''
+    mark = '✅' if report['within_budget'] else '⚠️'
+    print(f"{mark} {report['module']} içe aktarma: {report['import_ms']} ms{budget}", file=stream)
+    for entry in report['top_imports']:
+        print(f"   - {entry['module']}: {entry['cumulative_ms']} ms", file=stream)
+    for name, ms in report['lazy_loaded_ms'].items():
+        print(f"   ⏳ ertelenen {name}: {ms} ms (ilk kullanımda)", file=stream)
+    for name, ms in report['stages_ms'].items():
+        print(f"   ⏱️ {name}: {ms} ms", file=stream)
+
+
+def check_budgets(modules: Optional[List[str]] = None, runs: int = 5) -> List[Dict]:
+    """Her modülü birkaç kez ölç, medyanı bütçeyle karşılaştır"""
+    results = []
+    for module in modules or list(COLD_START_BUDGET_MS):
+        samples = sorted(measure_import(module)['total_ms'] for _ in range(runs))
+        median = samples[len(samples) // 2]
+        budget = COLD_START_BUDGET_MS.get(module)
+        results.append({'module': module, 'median_ms': round(median, 2), 'budget_ms': budget,
+                        'ok': budget is None or median <= budget})
+    return results
@@ -5,19 +5,53 @@ Tesseract OCR ile Osmanlıca Metin Tespit Sistemi
 Bu script Tesseract OCR kullanarak Osmanlıca metinleri tespit eder ve Türkçeye çevirir.
 """
 
-import cv2
-import numpy as np
-import pytesseract
+from __future__ import annotations
+
 import json
 import os
 import sys
 import re
-from typing import Dict, List, Tuple, Optional
+import argparse
+from typing import Callable, Dict, Iterator, List, Tuple, Optional, Union
 import time
 
+import page_hash
+import profiling
+from binarization import DEFAULT_WINDOW, adaptive_threshold
+from result_cache import ResultCache
+from startup import lazy_import
+
+# Ağır bağımlılıklar ilk kullanımda yüklenir (soğuk başlangıç bütçesi: startup.py)
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pytesseract = lazy_import('pytesseract')
+
+# OCR sonuç önbelleğinin varsayılan konumu (MIRAS_OCR_CACHE_DIR ile değiştirilebilir)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Görüntü kaynağı: dosya yolu, kodlanmış baytlar (PNG/JPEG...) veya NumPy dizisi
+ImageSource = Union[str, bytes, bytearray, memoryview, 'np.ndarray']
+
+# process_image çalışma modları
+PROCESSING_MODES = ('regions', 'tiled', 'cascade', 'lines')
+
+# Ön işleme ön ayarları: 'default' genel Otsu eşiği, diğerleri yerel uyarlamalı eşik
+PREPROCESS_PRESETS = ('default', 'sauvola', 'niblack')
+
+# Tembel karo okuma: (y0, y1, x0, x1) -> gri tonlamalı karo
+TileReader = Callable[[int, int, int, int], 'np.ndarray']
+
 class TesseractOttomanOCR:
-    def __init__(self):
-        """Tesseract OCR sistemi başlatıcı"""
+    def __init__(self, cache: Optional[ResultCache] = None, page_index: Optional[page_hash.PageIndex] = None):
+        """Tesseract OCR sistemi başlatıcı
+
+        cache: Verilirse aynı görüntü ve ayarlar için sonuçlar yeniden kullanılır
+        page_index: Verilirse algısal özeti daha önce işlenmiş bir sayfaya yakın
+                    olan görüntüler tam OCR'dan geçmeden eşleştirilir
+        """
+        self.cache = cache
+        self.page_index = page_index
+
         # Windows için Tesseract yolunu ayarla
         if os.name == 'nt':  # Windows
             tesseract_paths = [
@@ -35,6 +69,26 @@ class TesseractOttomanOCR:
         
         # Tesseract ayarları - Osmanlıca için optimize edilmiş
         self.tesseract_config = '--oem 3 --psm 6 -c tessedit_char_whitelist=ابتثجحخدذرزسشصضطظعغفقكلمنهويپچژگآأإؤئىةﻻﷲ0123456789.,;:!?()[]{}"\'- '
+        self.tesseract_lang = 'eng'  # İngilizce dil paketi kullan (Osmanlıca için)
+
+        # Ön işleme adımlarını tanımlayan ön ayar adı (önbellek anahtarına girer)
+        self.preprocess_preset = 'default'
+
+        # Yerel ikilileştirme (sauvola/niblack) pencere kenarı ve katsayısı (None: yöntem varsayılanı)
+        self.binarization_window = DEFAULT_WINDOW
+        self.binarization_k = None
+
+        # Büyük taramalar için karo ayarları (tiled modu)
+        self.tile_size = 2048
+        self.tile_overlap = 256
+
+        # Kademeli (cascade) mod ayarları: ilk ucuz geçişte uzun kenarın
+        # küçültüleceği boyut ve pahalı aşamaların tetikleneceği güven eşiği
+        self.cascade_max_side = 1600
+        self.confidence_threshold = 0.6
+
+        # Bu örneğin yaptığı tesseract çağrısı sayısı
+        self.tesseract_calls = 0
         
         # Osmanlıca karakter mapping'i
         self.ottoman_to_turkish = {
@@ -81,37 +135,167 @@ class TesseractOttomanOCR:
             'niçin': 'niçin', 'kaç': 'kaç', 'hangi': 'hangi', 'hangi': 'hangi'
         }
 
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def load_image(self, source: ImageSource) -> Optional[np.ndarray]:
+        """Görüntüyü dosya yolundan, bellekteki baytlardan veya diziden yükle
+
+        Baytlar ve tek boyutlu uint8 diziler kodlanmış dosya içeriği kabul edilip
+        cv2.imdecode ile çözülür; iki/üç boyutlu diziler zaten çözülmüş görüntüdür.
+        """
+        if isinstance(source, str):
+            return cv2.imread(source)
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            buffer = np.frombuffer(source, dtype=np.uint8)
+            return cv2.imdecode(buffer, cv2.IMREAD_COLOR) if buffer.size else None
+
+        if isinstance(source, np.ndarray):
+            if source.ndim == 1:
+                return cv2.imdecode(source.astype(np.uint8, copy=False), cv2.IMREAD_COLOR)
+            return source
+
+        raise TypeError(f"Desteklenmeyen görüntü kaynağı: {type(source).__name__}")
+
+    def preprocess_image(self, source: ImageSource) -> np.ndarray:
         """Görüntüyü OCR için ön işleme"""
         try:
             # Görüntüyü yükle
-            image = cv2.imread(image_path)
+            image = self.load_image(source)
             if image is None:
-                raise ValueError(f"Görüntü yüklenemedi: {image_path}")
+                label = source if isinstance(source, str) else "bellekteki görüntü"
+                raise ValueError(f"Görüntü yüklenemedi: {label}")
             
-            # Gri tonlamaya çevir
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Gürültü azaltma
-            denoised = cv2.medianBlur(gray, 3)
-            
-            # Kontrast artırma
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(denoised)
-            
-            # İkili (binary) görüntü oluştur
-            _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # Morfolojik işlemler
-            kernel = np.ones((1,1), np.uint8)
-            cleaned = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-            
-            return cleaned
+            return self._preprocess_array(image)
             
         except Exception as e:
             print(f"Görüntü ön işleme hatası: {e}", file=sys.stderr)
             return None
 
+    def _preprocess_array(self, image: np.ndarray) -> np.ndarray:
+        """Çözülmüş görüntü dizisine ön işleme adımlarını uygula
+
+        Ara adımlar aynı tampon üzerinde yapılır; böylece aynı anda en fazla
+        iki tam boyutlu kopya bellekte tutulur.
+        """
+        # Gri tonlamaya çevir
+        if image.ndim == 2:
+            gray = image
+        elif image.shape[2] == 4:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+        else:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # Gürültü azaltma
+        work = cv2.medianBlur(gray, 3)
+        del gray
+        
+        # Kontrast artırma
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        clahe.apply(work, dst=work)
+        
+        # İkili (binary) görüntü oluştur
+        if self.preprocess_preset == 'default':
+            cv2.threshold(work, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=work)
+        else:
+            # Lekeli/düzensiz aydınlatılmış sayfalarda piksel başına yerel eşik
+            work = adaptive_threshold(work, self.preprocess_preset, self.binarization_window, self.binarization_k)
+        
+        # Morfolojik işlemler
+        kernel = np.ones((1,1), np.uint8)
+        cv2.morphologyEx(work, cv2.MORPH_CLOSE, kernel, dst=work)
+        
+        return work
+
+    def open_tile_reader(self, source: ImageSource) -> Tuple[int, int, TileReader]:
+        """Karoları tembel okuyabilen bir okuyucu döndür: (yükseklik, genişlik, okuyucu)
+
+        .npy ve ikili PGM/PPM dosyaları bellek eşlemeli (mmap) okunur, yalnızca
+        istenen karo diske dokunur. Sıkıştırılmış biçimler (PNG, JPEG...) bir kez
+        gri tonlamalı çözülür; renkli kopyaya göre üçte bir bellek kullanır.
+        """
+        array = None
+
+        if isinstance(source, str):
+            extension = os.path.splitext(source)[1].lower()
+            if extension == '.npy':
+                array = np.load(source, mmap_mode='r')
+            elif extension in ('.pgm', '.ppm', '.pnm'):
+                array = self._memmap_pnm(source)
+            if array is None:
+                array = cv2.imread(source, cv2.IMREAD_GRAYSCALE)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            array = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        elif isinstance(source, np.ndarray):
+            if source.ndim == 1:
+                array = cv2.imdecode(source.astype(np.uint8, copy=False), cv2.IMREAD_GRAYSCALE)
+            else:
+                array = source
+        else:
+            raise TypeError(f"Desteklenmeyen görüntü kaynağı: {type(source).__name__}")
+
+        if array is None:
+            raise ValueError("Görüntü karolar için açılamadı")
+
+        def read_tile(y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+            tile = np.ascontiguousarray(array[y0:y1, x0:x1])
+            if tile.ndim == 3:
+                code = cv2.COLOR_BGRA2GRAY if tile.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+                if isinstance(source, str) and os.path.splitext(source)[1].lower() in ('.ppm', '.pnm'):
+                    code = cv2.COLOR_RGB2GRAY  # PPM kanalları RGB sırasındadır
+                tile = cv2.cvtColor(tile, code)
+            return tile
+
+        return array.shape[0], array.shape[1], read_tile
+
+    def _memmap_pnm(self, path: str) -> Optional[np.ndarray]:
+        """8 bit ikili PGM (P5) / PPM (P6) dosyasını bellek eşlemeli aç"""
+        with open(path, 'rb') as f:
+            header = f.read(512)
+
+        tokens = []
+        position = 0
+        while len(tokens) < 4 and position < len(header):
+            # Boşlukları ve yorum satırlarını atla
+            while position < len(header) and header[position:position + 1].isspace():
+                position += 1
+            if header[position:position + 1] == b'#':
+                while position < len(header) and header[position:position + 1] not in (b'\n', b'\r'):
+                    position += 1
+                continue
+            start = position
+            while position < len(header) and not header[position:position + 1].isspace():
+                position += 1
+            tokens.append(header[start:position])
+
+        if len(tokens) < 4 or tokens[0] not in (b'P5', b'P6') or int(tokens[3]) > 255:
+            return None
+
+        width, height = int(tokens[1]), int(tokens[2])
+        shape = (height, width) if tokens[0] == b'P5' else (height, width, 3)
+        # Maxval'dan sonra tek bir boşluk karakteri gelir
+        return np.memmap(path, dtype=np.uint8, mode='r', offset=position + 1, shape=shape)
+
+    def iter_tiles(self, height: int, width: int) -> Iterator[Tuple[int, int, int, int, Tuple[int, int, int, int]]]:
+        """Örtüşen karoların sınırlarını üret
+
+        Her karo için (y0, y1, x0, x1, çekirdek) döner. Çekirdek, örtüşme bölgesinin
+        ortasından bölünmüş, karonun sahip olduğu alandır; çekirdekler görüntüyü
+        örtüşmesiz ve eksiksiz kaplar.
+        """
+        step = max(self.tile_size - self.tile_overlap, 1)
+        half = self.tile_overlap // 2
+
+        for y0 in range(0, max(height - self.tile_overlap, 1), step):
+            y1 = min(y0 + self.tile_size, height)
+            for x0 in range(0, max(width - self.tile_overlap, 1), step):
+                x1 = min(x0 + self.tile_size, width)
+                core = (
+                    y0 + half if y0 > 0 else 0,
+                    y1 - half if y1 < height else height,
+                    x0 + half if x0 > 0 else 0,
+                    x1 - half if x1 < width else width,
+                )
+                yield y0, y1, x0, x1, core
+
     def detect_text_regions(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Metin bölgelerini tespit et"""
         try:
@@ -141,8 +325,72 @@ class TesseractOttomanOCR:
             print(f"Metin bölgesi tespit hatası: {e}", file=sys.stderr)
             return []
 
-    def extract_text_with_tesseract(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None) -> Tuple[str, float]:
-        """Tesseract ile metin çıkar"""
+    def segment_lines(self, binary: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Yatay ve dikey izdüşüm profilleriyle satır şeritlerini bul
+
+        Satırlar, mürekkep içeren ardışık piksel satırlarıdır; nokta ve harekeler
+        için küçük boşluklar birleştirilir. Her satırın yatay sınırları dikey
+        profilden bulunur ve geniş boşluklarda (sütun aralıkları) bölünür.
+        Şeritler okuma sırasıyla döner: yukarıdan aşağıya, satır içinde sağdan sola.
+        """
+        height, width = binary.shape[:2]
+
+        # Otsu sonrası arka plan genellikle beyazdır; değilse kutupları çevir
+        ink = binary < 128 if binary.mean() >= 128 else binary >= 128
+
+        row_profile = np.count_nonzero(ink, axis=1)
+        active = row_profile > max(1, width // 500)
+        edges = np.diff(np.concatenate(([0], active.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if starts.size == 0:
+            return []
+
+        # Satır yüksekliğinin üçte birinden kısa boşlukları birleştir
+        typical_height = float(np.median(ends - starts))
+        min_gap = max(2, int(typical_height / 3))
+        breaks = np.flatnonzero(starts[1:] - ends[:-1] >= min_gap)
+        starts = starts[np.concatenate(([0], breaks + 1))]
+        ends = ends[np.concatenate((breaks, [ends.size - 1]))]
+
+        # Tek başına kalan nokta/gürültü şeritlerini at
+        heights = ends - starts
+        keep = heights >= max(3, int(np.median(heights) / 4))
+        starts, ends = starts[keep], ends[keep]
+        if starts.size == 0:
+            return []
+
+        # Her şeridin sütun profili tek reduceat çağrısıyla: [s0, e0, s1, e1, ...]
+        bounds = np.column_stack((starts, ends)).ravel()
+        if bounds[-1] >= height:
+            bounds = bounds[:-1]
+        column_profiles = np.logical_or.reduceat(ink, bounds, axis=0)[::2]
+
+        strips = []
+        for y0, y1, columns in zip(starts, ends, column_profiles):
+            xs = np.flatnonzero(columns)
+            if xs.size == 0:
+                continue
+
+            # Sütun aralığı sayılacak kadar geniş boşluklarda böl
+            line_height = int(y1 - y0)
+            column_gap = max(3 * line_height, width // 20)
+            splits = np.flatnonzero(np.diff(xs) > column_gap)
+            piece_starts = xs[np.concatenate(([0], splits + 1))]
+            piece_ends = xs[np.concatenate((splits, [xs.size - 1]))] + 1
+
+            # Sağdan sola okuma sırası
+            for x0, x1 in zip(piece_starts[::-1], piece_ends[::-1]):
+                strips.append((int(x0), int(y0), int(x1 - x0), line_height))
+
+        return strips
+
+    def extract_text_with_tesseract(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None,
+                                    psm: Optional[int] = None) -> Tuple[str, float]:
+        """Tesseract ile metin çıkar
+
+        psm: Verilirse varsayılan sayfa bölütleme modunun yerine kullanılır
+        """
         try:
             if region:
                 x, y, w, h = region
@@ -151,10 +399,11 @@ class TesseractOttomanOCR:
                 roi = image
             
             # Tesseract OCR uygula
+            self.tesseract_calls += 1
             text = pytesseract.image_to_string(
                 roi, 
-                config=self.tesseract_config,
-                lang='eng'  # İngilizce dil paketi kullan (Osmanlıca için)
+                config=self._config_for_psm(psm) if psm else self.tesseract_config,
+                lang=self.tesseract_lang
             )
             
             # Güven skorunu hesapla (basit heuristik)
@@ -166,6 +415,76 @@ class TesseractOttomanOCR:
             print(f"Tesseract OCR hatası: {e}", file=sys.stderr)
             return "", 0.0
 
+    def _config_for_psm(self, psm: int) -> str:
+        """Varsayılan ayarları koruyup sayfa bölütleme modunu (PSM) değiştir"""
+        return re.sub(r'--psm \d+', f'--psm {psm}', self.tesseract_config)
+
+    def extract_lines_with_data(self, image: np.ndarray, psm: int = 6) -> List[Dict]:
+        """image_to_data ile satırları gerçek tesseract güven skorlarıyla çıkar
+
+        Her satır için {"bbox": [x, y, w, h], "text": ..., "confidence": 0-1} döner.
+        Güven, satırdaki kelimelerin tesseract güvenlerinin ortalamasıdır.
+        """
+        try:
+            self.tesseract_calls += 1
+            data = pytesseract.image_to_data(
+                image,
+                config=self._config_for_psm(psm),
+                lang=self.tesseract_lang,
+                output_type=pytesseract.Output.DICT
+            )
+        except Exception as e:
+            print(f"Tesseract OCR hatası: {e}", file=sys.stderr)
+            return []
+
+        lines = {}
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            word = word.strip()
+            if not word or confidence < 0:
+                continue
+
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+            line = lines.get(key)
+            if line is None:
+                lines[key] = {"box": [x, y, x + w, y + h], "words": [word], "confs": [confidence]}
+            else:
+                box = line["box"]
+                box[0], box[1] = min(box[0], x), min(box[1], y)
+                box[2], box[3] = max(box[2], x + w), max(box[3], y + h)
+                line["words"].append(word)
+                line["confs"].append(confidence)
+
+        return [
+            {
+                "bbox": [box[0], box[1], box[2] - box[0], box[3] - box[1]],
+                "text": ' '.join(line["words"]),
+                "confidence": sum(line["confs"]) / len(line["confs"]) / 100.0
+            }
+            for line in lines.values()
+            for box in [line["box"]]
+        ]
+
+    def _ocr_crop(self, image: np.ndarray, bbox: List[int], psm: int, scale: float = 1.0) -> Tuple[str, float]:
+        """Bölgeyi küçük bir kenar payıyla kırp, gerekirse büyüt ve tek metin olarak oku"""
+        x, y, w, h = bbox
+        pad = 4
+        y0, y1 = max(y - pad, 0), min(y + h + pad, image.shape[0])
+        x0, x1 = max(x - pad, 0), min(x + w + pad, image.shape[1])
+        crop = image[y0:y1, x0:x1]
+        if crop.size == 0:
+            return "", 0.0
+        if scale != 1.0:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+        lines = self.extract_lines_with_data(crop, psm=psm)
+        if not lines:
+            return "", 0.0
+        text = ' '.join(line["text"] for line in lines)
+        confidence = sum(line["confidence"] for line in lines) / len(lines)
+        return text, confidence
+
     def calculate_confidence(self, text: str) -> float:
         """Metin güven skorunu hesapla"""
         if not text:
@@ -212,12 +531,7 @@ class TesseractOttomanOCR:
         cleaned_text = self.clean_ottoman_text(text)
         
         # Karakter bazında çeviri
-        translated = ""
-        for char in cleaned_text:
-            if char in self.ottoman_to_turkish:
-                translated += self.ottoman_to_turkish[char]
-            else:
-                translated += char
+        translated = ''.join(self.ottoman_to_turkish.get(char, char) for char in cleaned_text)
         
         # Kelime bazında çeviri
         words = translated.split()
@@ -232,13 +546,115 @@ class TesseractOttomanOCR:
         
         return ' '.join(final_words)
 
-    def process_image(self, image_path: str) -> Dict:
-        """Ana işlem fonksiyonu"""
+    def cache_key(self, image_bytes: bytes) -> str:
+        """Görüntü içeriği ve OCR ayarlarından önbellek anahtarı üret"""
+        return ResultCache.make_key(
+            bytes(image_bytes),
+            self.tesseract_config,
+            self.tesseract_lang,
+            self._preprocess_signature()
+        )
+
+    def _preprocess_signature(self) -> str:
+        """Ön ayar ve ikilileştirme parametreleri (önbellek anahtarı için)"""
+        if self.preprocess_preset == 'default':
+            return self.preprocess_preset
+        return f"{self.preprocess_preset}:{self.binarization_window}:{self.binarization_k}"
+
+    def _source_bytes(self, source: ImageSource) -> bytes:
+        """Önbellek anahtarı için kaynağın ham baytlarını döndür"""
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if source.ndim == 1:
+            return source.tobytes()
+        # Çözülmüş dizide şekil de içeriğin parçasıdır
+        return f"{source.shape}|{source.dtype}".encode('ascii') + np.ascontiguousarray(source).tobytes()
+
+    @profiling.profiled('ocr_process_image')
+    def process_image(self, source: ImageSource, use_cache: bool = True, mode: str = 'regions',
+                      page_label: Optional[str] = None) -> Dict:
+        """Ana işlem fonksiyonu
+
+        source: Dosya yolu, kodlanmış görüntü baytları veya NumPy dizisi
+        use_cache: False ise önbellek ne okunur ne de yazılır
+        mode: 'regions' tüm görüntüyü tek seferde, 'tiled' örtüşen karolarla işler
+        page_label: Sayfa dizininde bu sayfanın adı (yakın kopya sonuçlarında görünür)
+        """
         start_time = time.time()
-        
+
+        if mode not in PROCESSING_MODES:
+            return {
+                "success": False,
+                "error": f"Bilinmeyen işlem modu: {mode}",
+                "timestamp": time.time()
+            }
+
+        if self.page_index is not None:
+            if page_label is None and isinstance(source, str):
+                page_label = os.path.basename(source)
+            return self.page_index.process(
+                source, lambda: self._process_image_cached(source, start_time, use_cache, mode),
+                label=page_label, signature=self.settings_signature(mode)
+            )
+        return self._process_image_cached(source, start_time, use_cache, mode)
+
+    def _process_image_cached(self, source: ImageSource, start_time: float, use_cache: bool, mode: str) -> Dict:
+        """Önbellekte varsa sonucu döndür, yoksa işleyip önbelleğe yaz"""
+        if self.cache is None or not use_cache:
+            return self._process_image_uncached(source, start_time, mode)
+
+        try:
+            image_bytes = self._source_bytes(source)
+        except OSError:
+            return self._process_image_uncached(source, start_time, mode)
+        key = ResultCache.make_key(self.cache_key(image_bytes), mode, self._mode_signature(mode))
+
+        # Dosya zaten okundu; ikinci kez diskten okumak yerine baytları çöz.
+        # Karo modunda ise mmap ile okunabilen dosyaların yolu korunur.
+        if isinstance(source, str) and mode != 'tiled':
+            source = image_bytes
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached["cache_hit"] = True
+            cached["processing_time"] = time.time() - start_time
+            cached["timestamp"] = time.time()
+            return cached
+
+        result = self._process_image_uncached(source, start_time, mode)
+        if result.get("success"):
+            self.cache.set(key, result)
+        result["cache_hit"] = False
+        return result
+
+    def settings_signature(self, mode: str) -> str:
+        """Sonucu etkileyen tüm ayarlar (sayfa dizininde yalnızca aynı imzalı sayfalar eşleşir)"""
+        return '|'.join((mode, self._mode_signature(mode), self._preprocess_signature(),
+                         self.tesseract_lang, self.tesseract_config))
+
+    def _mode_signature(self, mode: str) -> str:
+        """Sonucu etkileyen mod ayarlarını önbellek anahtarı için metne dök"""
+        if mode == 'tiled':
+            return f"{self.tile_size}:{self.tile_overlap}"
+        if mode == 'cascade':
+            return f"{self.cascade_max_side}:{self.confidence_threshold}"
+        return ""
+
+    def _process_image_uncached(self, source: ImageSource, start_time: float, mode: str = 'regions') -> Dict:
+        """Önbelleğe bakmadan tüm ön işleme ve OCR zincirini çalıştır"""
+        if mode == 'tiled':
+            return self._process_image_tiled(source, start_time)
+        if mode == 'cascade':
+            return self._process_image_cascade(source, start_time)
+        if mode == 'lines':
+            return self._process_image_lines(source, start_time)
+
         try:
             # Görüntüyü ön işle
-            processed_image = self.preprocess_image(image_path)
+            processed_image = self.preprocess_image(source)
             if processed_image is None:
                 return {
                     "success": False,
@@ -252,21 +668,24 @@ class TesseractOttomanOCR:
             # OCR işlemi
             if text_regions:
                 # Bölge bazında OCR
-                all_texts = []
+                segments = []
                 total_confidence = 0.0
                 
                 for region in text_regions:
                     text, confidence = self.extract_text_with_tesseract(processed_image, region)
                     if text:
-                        all_texts.append(text)
+                        segments.append({"bbox": list(region), "text": text, "confidence": confidence})
                         total_confidence += confidence
                 
                 # Tüm metinleri birleştir
-                extracted_text = ' '.join(all_texts)
+                extracted_text = ' '.join(segment["text"] for segment in segments)
                 avg_confidence = total_confidence / len(text_regions) if text_regions else 0.0
             else:
                 # Tüm görüntüde OCR
                 extracted_text, avg_confidence = self.extract_text_with_tesseract(processed_image)
+                height, width = processed_image.shape[:2]
+                segments = [{"bbox": [0, 0, width, height], "text": extracted_text, "confidence": avg_confidence}] \
+                    if extracted_text else []
             
             # Metni temizle
             cleaned_text = self.clean_ottoman_text(extracted_text)
@@ -283,6 +702,7 @@ class TesseractOttomanOCR:
                 "confidence": avg_confidence,
                 "processing_time": processing_time,
                 "text_regions_count": len(text_regions),
+                "segments": segments,
                 "method": "tesseract_ottoman_ocr",
                 "timestamp": time.time()
             }
@@ -294,16 +714,336 @@ class TesseractOttomanOCR:
                 "timestamp": time.time()
             }
 
+    def _process_image_tiled(self, source: ImageSource, start_time: float) -> Dict:
+        """Büyük taramaları örtüşen karolarla, sınırlı bellekle işle
+
+        Her karo ayrı ayrı ön işlenir ve bölgeleri bulunur. Bir bölge yalnızca
+        merkezi karonun çekirdeğine düşüyorsa o karoya aittir; böylece örtüşme
+        alanındaki metin iki kez okunmaz.
+        """
+        try:
+            height, width, read_tile = self.open_tile_reader(source)
+
+            segments = []
+            tiles_count = 0
+
+            for y0, y1, x0, x1, core in self.iter_tiles(height, width):
+                tiles_count += 1
+                tile = self._preprocess_array(read_tile(y0, y1, x0, x1))
+                core_y0, core_y1, core_x0, core_x1 = core
+
+                for x, y, w, h in self.detect_text_regions(tile):
+                    center_x = x0 + x + w / 2
+                    center_y = y0 + y + h / 2
+                    if not (core_x0 <= center_x < core_x1 and core_y0 <= center_y < core_y1):
+                        continue
+
+                    text, confidence = self.extract_text_with_tesseract(tile, (x, y, w, h))
+                    if text:
+                        segments.append({
+                            "bbox": [x0 + x, y0 + y, w, h],
+                            "text": text,
+                            "confidence": confidence
+                        })
+                del tile
+
+            # Okuma sırası: yukarıdan aşağıya, satır içinde sağdan sola
+            segments.sort(key=lambda segment: (segment["bbox"][1], -segment["bbox"][0]))
+
+            extracted_text = ' '.join(segment["text"] for segment in segments)
+            avg_confidence = (sum(segment["confidence"] for segment in segments) / len(segments)
+                              if segments else 0.0)
+
+            cleaned_text = self.clean_ottoman_text(extracted_text)
+            translated_text = self.translate_ottoman_to_turkish(cleaned_text)
+
+            return {
+                "success": True,
+                "extracted_text": cleaned_text,
+                "translated_text": translated_text,
+                "confidence": avg_confidence,
+                "processing_time": time.time() - start_time,
+                "text_regions_count": len(segments),
+                "tiles_count": tiles_count,
+                "image_size": [width, height],
+                "segments": segments,
+                "method": "tesseract_ottoman_ocr_tiled",
+                "timestamp": time.time()
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": time.time()
+            }
+
+    def _process_image_cascade(self, source: ImageSource, start_time: float) -> Dict:
+        """Güvene dayalı kademeli OCR: ucuz geçiş yeterliyse erken çık
+
+        1. fast_page: küçültülmüş tam sayfada tek PSM ile OCR
+        2. regions: güveni eşiğin altındaki satırları tam çözünürlükte yeniden oku
+        3. alt_psm: hâlâ düşük olanları tek satır PSM modlarıyla dene
+        4. upscaled: kalanları büyütülmüş kırpıntılar üzerinde oku
+        Her aşama yalnızca önceki aşamadan sonra eşiğin altında kalan satırlarla çalışır.
+        """
+        try:
+            processed_image = self.preprocess_image(source)
+            if processed_image is None:
+                return {
+                    "success": False,
+                    "error": "Görüntü ön işlenemedi",
+                    "timestamp": time.time()
+                }
+
+            calls_before = self.tesseract_calls
+            threshold = self.confidence_threshold
+            stages = []
+
+            # 1. Aşama: küçültülmüş tam sayfa
+            stage_start = time.time()
+            height, width = processed_image.shape[:2]
+            scale = min(1.0, self.cascade_max_side / max(height, width))
+            page = processed_image
+            if scale < 1.0:
+                page = cv2.resize(processed_image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+            segments = []
+            for line in self.extract_lines_with_data(page, psm=6):
+                line["bbox"] = [int(round(v / scale)) for v in line["bbox"]]
+                segments.append(line)
+            del page
+
+            # Satır bulunamadıysa kontur bölgeleri sonraki aşamalara aday olur
+            if not segments:
+                segments = [
+                    {"bbox": list(region), "text": "", "confidence": 0.0}
+                    for region in self.detect_text_regions(processed_image)
+                ]
+            stages.append({
+                "stage": "fast_page",
+                "regions": len(segments),
+                "time": time.time() - stage_start
+            })
+
+            # 2-4. Aşamalar: yalnızca eşiğin altındaki bölgelerde pahalı stratejiler
+            strategies = [
+                ("regions", [(6, 1.0)]),
+                ("alt_psm", [(7, 1.0), (13, 1.0)]),
+                ("upscaled", [(7, 2.0)]),
+            ]
+            for stage_name, attempts in strategies:
+                pending = [segment for segment in segments if segment["confidence"] < threshold]
+                if not pending:
+                    break
+
+                stage_start = time.time()
+                for segment in pending:
+                    for psm, crop_scale in attempts:
+                        text, confidence = self._ocr_crop(processed_image, segment["bbox"], psm, crop_scale)
+                        if text and confidence > segment["confidence"]:
+                            segment["text"] = text
+                            segment["confidence"] = confidence
+                            segment["stage"] = stage_name
+                        if segment["confidence"] >= threshold:
+                            break
+                stages.append({
+                    "stage": stage_name,
+                    "regions": len(pending),
+                    "time": time.time() - stage_start
+                })
+
+            segments = [segment for segment in segments if segment["text"]]
+            segments.sort(key=lambda segment: (segment["bbox"][1], -segment["bbox"][0]))
+
+            extracted_text = ' '.join(segment["text"] for segment in segments)
+            avg_confidence = (sum(segment["confidence"] for segment in segments) / len(segments)
+                              if segments else 0.0)
+
+            cleaned_text = self.clean_ottoman_text(extracted_text)
+            translated_text = self.translate_ottoman_to_turkish(cleaned_text)
+
+            return {
+                "success": True,
+                "extracted_text": cleaned_text,
+                "translated_text": translated_text,
+                "confidence": avg_confidence,
+                "processing_time": time.time() - start_time,
+                "text_regions_count": len(segments),
+                "stages_run": stages,
+                "segments": [
+                    {"bbox": segment["bbox"], "text": segment["text"], "confidence": segment["confidence"]}
+                    for segment in segments
+                ],
+                "low_confidence_regions": sum(1 for segment in segments if segment["confidence"] < threshold),
+                "tesseract_calls": self.tesseract_calls - calls_before,
+                "method": "tesseract_ottoman_ocr_cascade",
+                "timestamp": time.time()
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": time.time()
+            }
+
+    def _process_image_lines(self, source: ImageSource, start_time: float) -> Dict:
+        """Satır şeritlerini tek satır PSM modu ile okuyup okuma sırasıyla birleştir"""
+        try:
+            processed_image = self.preprocess_image(source)
+            if processed_image is None:
+                return {
+                    "success": False,
+                    "error": "Görüntü ön işlenemedi",
+                    "timestamp": time.time()
+                }
+
+            calls_before = self.tesseract_calls
+            strips = self.segment_lines(processed_image)
+            height, width = processed_image.shape[:2]
+
+            segments = []
+            for x, y, w, h in strips:
+                # Nokta ve harekeler şeridin biraz dışına taşabilir
+                pad = max(2, h // 4)
+                y0, y1 = max(y - pad, 0), min(y + h + pad, height)
+                x0, x1 = max(x - pad, 0), min(x + w + pad, width)
+                text, confidence = self.extract_text_with_tesseract(
+                    processed_image, (x0, y0, x1 - x0, y1 - y0), psm=7
+                )
+                if text:
+                    segments.append({"bbox": [x, y, w, h], "text": text, "confidence": confidence})
+
+            extracted_text = '\n'.join(segment["text"] for segment in segments)
+            avg_confidence = (sum(segment["confidence"] for segment in segments) / len(segments)
+                              if segments else 0.0)
+
+            cleaned_text = self.clean_ottoman_text(extracted_text)
+            translated_text = self.translate_ottoman_to_turkish(cleaned_text)
+
+            return {
+                "success": True,
+                "extracted_text": cleaned_text,
+                "translated_text": translated_text,
+                "confidence": avg_confidence,
+                "processing_time": time.time() - start_time,
+                "text_regions_count": len(strips),
+                "segments": segments,
+                "tesseract_calls": self.tesseract_calls - calls_before,
+                "method": "tesseract_ottoman_ocr_lines",
+                "timestamp": time.time()
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": time.time()
+            }
+
+def build_cache(args: argparse.Namespace) -> ResultCache:
+    """Komut satırı seçeneklerine göre OCR önbelleğini oluştur"""
+    cache_dir = args.cache_dir or os.environ.get('MIRAS_OCR_CACHE_DIR', DEFAULT_CACHE_DIR)
+    enabled = not args.no_cache and os.environ.get('MIRAS_OCR_CACHE', '1') != '0'
+    return ResultCache(
+        os.path.join(cache_dir, 'ocr_results.sqlite3'),
+        max_bytes=args.cache_max_mb * 1024 * 1024,
+        enabled=enabled
+    )
+
+def build_page_index(args: argparse.Namespace) -> Optional[page_hash.PageIndex]:
+    """--dedupe seçeneklerine göre kalıcı sayfa dizinini oluştur (kapalıysa None)"""
+    if args.dedupe == 'off':
+        return None
+    cache_dir = args.cache_dir or os.environ.get('MIRAS_OCR_CACHE_DIR', DEFAULT_CACHE_DIR)
+    return page_hash.PageIndex(
+        max_distance=args.dedupe_distance,
+        action=args.dedupe,
+        db_path=args.dedupe_index or os.path.join(cache_dir, 'page_index.sqlite3'),
+        max_pages=args.dedupe_max_pages,
+        ttl=args.dedupe_ttl
+    )
+
 def main():
     """Ana fonksiyon"""
-    if len(sys.argv) != 2:
+    parser = argparse.ArgumentParser(description="Tesseract ile Osmanlıca OCR")
+    parser.add_argument('image_path', nargs='?', help="İşlenecek görüntü dosyası ('-' ise stdin'den okunur)")
+    parser.add_argument('--stdin', action='store_true', help="Görüntü baytlarını stdin'den oku")
+    parser.add_argument('--mode', choices=PROCESSING_MODES, default='regions',
+                        help="İşlem modu: 'tiled' büyük taramaları karolarla, 'cascade' güvene dayalı kademelerle, 'lines' satır şeritleriyle işler")
+    parser.add_argument('--tile-size', type=int, default=2048, help="Karo kenar uzunluğu (piksel)")
+    parser.add_argument('--tile-overlap', type=int, default=256, help="Karolar arası örtüşme (piksel)")
+    parser.add_argument('--confidence-threshold', type=float, default=0.6,
+                        help="Kademeli modda pahalı aşamaları tetikleyen güven eşiği (0-1)")
+    parser.add_argument('--preprocess', choices=PREPROCESS_PRESETS, default='default',
+                        help="İkilileştirme: 'default' genel Otsu, 'sauvola'/'niblack' lekeli sayfalar için yerel eşik")
+    parser.add_argument('--binarize-window', type=int, default=DEFAULT_WINDOW,
+                        help="Yerel ikilileştirme pencere kenarı (piksel)")
+    parser.add_argument('--binarize-k', type=float, help="Yerel ikilileştirme katsayısı (varsayılan: sauvola 0.3, niblack -0.2)")
+    parser.add_argument('--no-cache', action='store_true', help="Sonuç önbelleğini atla")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: ai-training/cache)")
+    parser.add_argument('--cache-max-mb', type=int, default=256, help="Önbellek boyut sınırı (MB)")
+    parser.add_argument('--clear-cache', action='store_true', help="Önbelleği temizle")
+    parser.add_argument('--cache-stats', action='store_true', help="Önbellek istatistiklerini yazdır")
+    parser.add_argument('--import-profile', action='store_true',
+                        help="İçe aktarma süreleri ve ertelenen modüllerle başlangıç raporu yazdır")
+    page_hash.add_cli_arguments(parser)
+    profiling.add_cli_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure_from_args(args)
+
+    if args.import_profile and not args.image_path and not args.stdin:
+        from startup import startup_report
+        print(json.dumps(startup_report('tesseract_ottoman_ocr'), ensure_ascii=False, indent=2))
+        if not args.clear_cache and not args.cache_stats:
+            return
+
+    cache = build_cache(args)
+
+    if args.clear_cache or args.cache_stats:
+        if args.clear_cache:
+            cache.clear()
+        # Görüntü de işlenecekse stdout yalnızca OCR sonucunu içermeli
+        stream = sys.stderr if args.image_path or args.stdin else sys.stdout
+        print(json.dumps({"success": True, "cache": cache.stats()}, ensure_ascii=False, indent=2), file=stream)
+        if not args.image_path and not args.stdin:
+            return
+
+    # OCR sistemi başlat
+    init_start = time.perf_counter()
+    ocr_system = TesseractOttomanOCR(cache=cache, page_index=build_page_index(args))
+    ocr_system.tile_size = args.tile_size
+    ocr_system.tile_overlap = args.tile_overlap
+    ocr_system.confidence_threshold = args.confidence_threshold
+    ocr_system.preprocess_preset = args.preprocess
+    ocr_system.binarization_window = args.binarize_window
+    ocr_system.binarization_k = args.binarize_k
+
+    # Görüntüyü geçici dosya yerine doğrudan stdin'den al
+    if args.stdin or args.image_path == '-':
+        image_bytes = sys.stdin.buffer.read()
+        if not image_bytes:
+            print(json.dumps({
+                "success": False,
+                "error": "stdin üzerinden görüntü verisi alınamadı"
+            }))
+            sys.exit(1)
+        call_start = time.perf_counter()
+        result = ocr_system.process_image(image_bytes, mode=args.mode, page_label=args.page_label)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if args.import_profile:
+            _report_startup(init_start, call_start)
+        return
+
+    if not args.image_path:
         print(json.dumps({
             "success": False,
-            "error": "Kullanım: python tesseract_ottoman_ocr.py <image_path>"
+            "error": "Kullanım: python tesseract_ottoman_ocr.py <image_path | ->"
         }))
         sys.exit(1)
     
-    image_path = sys.argv[1]
+    image_path = args.image_path
     
     if not os.path.exists(image_path):
         print(json.dumps({
@@ -312,14 +1052,24 @@ def main():
         }))
         sys.exit(1)
     
-    # OCR sistemi başlat
-    ocr_system = TesseractOttomanOCR()
-    
     # İşlemi gerçekleştir
-    result = ocr_system.process_image(image_path)
+    call_start = time.perf_counter()
+    result = ocr_system.process_image(image_path, mode=args.mode, page_label=args.page_label)
     
     # JSON formatında çıktı
     print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.import_profile:
+        _report_startup(init_start, call_start)
+
+
+def _report_startup(init_start: float, call_start: float):
+    """Başlangıç raporunu stderr'e yaz (stdout yalnızca OCR sonucunu içerir)"""
+    from startup import print_startup_report, startup_report
+
+    print_startup_report(startup_report('tesseract_ottoman_ocr', {
+        'init': (call_start - init_start) * 1000,
+        'first_call': (time.perf_counter() - call_start) * 1000
+    }))
 
 if __name__ == "__main__":
     main()
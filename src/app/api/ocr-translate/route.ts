@@ -1,9 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { join } from "path";
-import { exec } from "child_process";
-import { promisify } from "util";
-
-const execAsync = promisify(exec);
+import { spawn } from "child_process";
 
 // AI training proje yolu
 const AI_TRAINING_PATH = join(process.cwd(), 'ai-training');
@@ -75,46 +72,66 @@ export async function POST(request: NextRequest) {
   }
 }
 
+// Python script'ini çalıştır ve girdiyi stdin üzerinden gönder (geçici dosya yok)
+function runPythonWithInput(scriptPath: string, args: string[], input: Buffer, timeoutMs: number): Promise<{ stdout: string; stderr: string }> {
+  return new Promise((resolve, reject) => {
+    const child = spawn('python', [scriptPath, ...args], {
+      cwd: AI_TRAINING_PATH,
+      env: { ...process.env, PYTHONIOENCODING: 'utf-8' }
+    });
+
+    let stdout = '';
+    let stderr = '';
+    const timer = setTimeout(() => {
+      child.kill();
+      reject(new Error(`OCR script zaman aşımına uğradı (${timeoutMs} ms)`));
+    }, timeoutMs);
+
+    child.stdout.setEncoding('utf8');
+    child.stderr.setEncoding('utf8');
+    child.stdout.on('data', (chunk) => { stdout += chunk; });
+    child.stderr.on('data', (chunk) => { stderr += chunk; });
+    child.on('error', (error) => {
+      clearTimeout(timer);
+      reject(error);
+    });
+    child.on('close', (code) => {
+      clearTimeout(timer);
+      if (code === 0) {
+        resolve({ stdout, stderr });
+      } else {
+        reject(new Error(`OCR script ${code} koduyla sonlandı: ${stderr || stdout}`));
+      }
+    });
+
+    child.stdin.on('error', () => {
+      // Süreç girdiyi okumadan kapanırsa 'close' olayı hatayı raporlar
+    });
+    child.stdin.end(input);
+  });
+}
+
 // Tesseract OCR ile Osmanlıca metin tespit sistemi
 async function performOCR(imageFile: File): Promise<{ text: string; confidence: number; translatedText?: string | null; ocrMethod?: string; translationMethod?: string; layerInfo?: any; method?: string }> {
   try {
-    // Resmi geçici dosyaya kaydet
-    const fs = await import('fs');
-    const tempDir = join(AI_TRAINING_PATH, 'temp');
-    const tempImagePath = join(tempDir, `ocr_image_${Date.now()}.jpg`);
-    
-    // Temp klasörü oluştur
-    try {
-      fs.mkdirSync(tempDir, { recursive: true });
-    } catch (error) {
-      // Klasör zaten varsa hata yok say
-    }
-    
-    // Resmi dosyaya yaz
+    // Resmi bellekte tut, diske yazmadan stdin üzerinden gönder
     const arrayBuffer = await imageFile.arrayBuffer();
     const buffer = Buffer.from(arrayBuffer);
-    fs.writeFileSync(tempImagePath, buffer);
 
     // Tesseract OCR sistemi kullan
     const ocrScriptPath = join(AI_TRAINING_PATH, 'tesseract_ottoman_ocr.py');
     
-    const { stdout, stderr } = await execAsync(`python "${ocrScriptPath}" "${tempImagePath}"`, {
-      cwd: AI_TRAINING_PATH,
-      timeout: 60000, // 1 dakika timeout
-      env: { ...process.env, PYTHONIOENCODING: 'utf-8' }
-    });
+    const { stdout, stderr } = await runPythonWithInput(
+      ocrScriptPath,
+      ['--stdin'],
+      buffer,
+      60000 // 1 dakika timeout
+    );
 
     if (stderr) {
       console.warn('OCR script stderr:', stderr);
     }
 
-    // Geçici dosyayı temizle
-    try {
-      fs.unlinkSync(tempImagePath);
-    } catch (cleanupError) {
-      console.warn('Geçici resim dosyası temizlenemedi:', cleanupError);
-    }
-
     // Script çıktısını işle
     try {
       const result = JSON.parse(stdout.trim());